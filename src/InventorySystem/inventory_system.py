@@ -3,10 +3,16 @@
 Author: Riley Kirkpatrick
 """
 
+import datetime
+import inventory_system_allocation
+import pickle
+import sqlite3
 import uuid
-from sqlalchemy import create_engine, Boolean, Column, Float, Integer, PickleType, String
+from sqlalchemy import and_, bindparam, create_engine, event, or_, select, text, tuple_, Boolean, Column, Date, Float, \
+                       ForeignKey, Index, Integer, LargeBinary, String
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import relationship, scoped_session, sessionmaker
 
 # ----------======================---------- <-<>-<>-<>-<>-<>-<>-<>-<>-<>-> ----------======================----------
 # ----------======================---------- Database Functions and Classes ----------======================----------
@@ -21,40 +27,143 @@ InventoryBase = declarative_base()
 
 class Product(InventoryBase):
     __tablename__ = 'product'
-    id = Column(String(36), nullable=False, primary_key=True)
-    name = Column(String(50), nullable=False, primary_key=True)
+    # Only products that are in stock are in the partial index, so GetProductsInStock reads just those rows; the
+    # indexes are sorted by ID after the columns they look products up by, so each page of a lookup is read in order
+    __table_args__ = (Index('ix_product_in_stock', 'id', sqlite_where=text('amount > 0')),
+                      Index('ix_product_manufacturer', 'manufacturer', 'id'))
+    # IDs are the 16 bytes of a UUID
+    id = Column(LargeBinary(16), nullable=False, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True, index=True)
     description = Column(String(250))
     manufacturer = Column(String(50))
     wholesale_cost = Column(Float)
     sale_cost = Column(Float)
     amount = Column(Integer)
+    # Goes up by one every time the product is changed by UpdateProducts or its stock is changed by an order, so
+    # UpdateProducts can update a product only if the caller has seen its latest version and stock
+    version = Column(Integer, nullable=False, default=1, server_default=text('1'))
 
 class Order(InventoryBase):
     __tablename__ = 'order'
-    id = Column(String(36), primary_key=True, nullable=False)
+    # Orders looked up by one status flag are paged from the index of that flag and by both from ix_order_status
+    __table_args__ = (Index('ix_order_status', 'is_paid', 'is_shipped', 'id'), Index('ix_order_paid', 'is_paid', 'id'),
+                      Index('ix_order_shipped', 'is_shipped', 'id'), Index('ix_order_date', 'date', 'id'))
+    id = Column(LargeBinary(16), primary_key=True, nullable=False)
     destination = Column(String(50), nullable=False)
-    date = Column(PickleType, nullable=False)
+    date = Column(Date, nullable=False)
     is_paid = Column(Boolean)
     is_shipped = Column(Boolean)
-    products = Column(PickleType, nullable=False)
+    # The lines of an order are loaded for all queried orders with one extra SELECT ... IN query
+    products = relationship('OrderLine', lazy='selectin', cascade='all, delete-orphan', passive_deletes=True)
 
-
-def create_inventory_system_db(database_path):
+class OrderLine(InventoryBase):
+    """A product in an order; an order has one row for each of its products keyed by (order_id, product_id)
+    """
+    __tablename__ = 'order_line'
+    order_id = Column(LargeBinary(16), ForeignKey('order.id', ondelete='CASCADE'), primary_key=True, nullable=False)
+    id = Column('product_id', LargeBinary(16), ForeignKey('product.id'), primary_key=True, nullable=False, index=True)
+    name = Column('product_name', String(50), nullable=False)
+    amount = Column(Integer, nullable=False)
+
+
+# The SQLite pragmas applied to every connection for each storage profile, from the most to the least durable:
+#  - durable: every commit is synced to disk before it returns
+#  - balanced: the WAL is only synced at checkpoints, so a power loss can undo the latest commits but cannot corrupt
+#    the database; reads use a larger page cache and memory-mapped I/O
+#  - throughput: nothing is synced, so an OS crash or power loss can corrupt the database
+# A negative cache_size is in KiB rather than pages and mmap_size is in bytes
+STORAGE_PROFILES = {
+  'durable': {'journal_mode': 'WAL', 'synchronous': 'FULL', 'mmap_size': 0, 'cache_size': -2000,
+              'temp_store': 'DEFAULT'},
+  'balanced': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'mmap_size': 256 * 2**20, 'cache_size': -64 * 2**10,
+               'temp_store': 'MEMORY'},
+  'throughput': {'journal_mode': 'WAL', 'synchronous': 'OFF', 'mmap_size': 2**30, 'cache_size': -256 * 2**10,
+                 'temp_store': 'MEMORY'},
+}
+DEFAULT_STORAGE_PROFILE = 'durable'
+
+# The number of rows that iterate_db loads from the database at a time
+QUERY_CHUNK_SIZE = 1000
+# The number of rows that are inserted and committed at a time by a bulk insert
+INSERT_CHUNK_SIZE = 10000
+# How many times orders are allocated again from the current stock when the stock changes while they are placed
+PLACE_ORDERS_ATTEMPTS = 3
+# How many times products are read again when one of them changes while they are updated
+UPDATE_PRODUCTS_ATTEMPTS = 3
+
+def set_pragmas(pragmas):
+  """Returns a connect event listener that sets the passed pragmas on a new SQLite connection and turns on foreign
+  key enforcement (SQLite leaves it off by default)
+  """
+  def connect(connection, connection_record):
+    cursor = connection.cursor()
+    # The journal mode is set first since it changes how the other settings behave
+    for pragma in sorted(pragmas, key=lambda pragma: pragma != 'journal_mode'):
+      cursor.execute('PRAGMA %s=%s' % (pragma, pragmas[pragma]))
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+  return connect
+
+def begin_transactions(begin):
+  """Returns the event listeners that make SQLAlchemy begin the transactions of an engine with the passed statement;
+  pysqlite only begins a transaction before a statement that writes, so reads are not isolated and savepoints do not
+  work as they should unless SQLAlchemy begins the transactions itself
+  """
+  def connect(connection, connection_record):
+    connection.isolation_level = None
+  def begin_transaction(connection):
+    connection.exec_driver_sql(begin)
+  return connect, begin_transaction
+
+def get_engine(database_path, storage_profile=DEFAULT_STORAGE_PROFILE, read_only=False, connections=None,
+               writer=False):
+  """Create an engine for the database at database_path that applies the pragmas of the storage profile to every
+  connection; if a number of connections is passed the engine never opens more than that many at a time. The
+  connections of a read only engine cannot write to the database and each of its transactions reads the database as
+  it was when the transaction began, and the transactions of a writer engine take the database's write lock when they
+  begin, so a writer waits for other writers instead of failing because they wrote after it read.
+  """
+  pool_size = {} if connections is None else {'pool_size': connections, 'max_overflow': 0}
+  engine = create_engine('sqlite:///' + database_path, **pool_size)
+  pragmas = STORAGE_PROFILES[storage_profile]
+  if read_only:
+    # With the write-ahead log, readers see the last commit and neither wait for the writer nor make it wait
+    pragmas = dict(pragmas, query_only='ON')
+  event.listen(engine, 'connect', set_pragmas(pragmas))
+  if read_only or writer:
+    connect, begin_transaction = begin_transactions('BEGIN IMMEDIATE' if writer else 'BEGIN')
+    event.listen(engine, 'connect', connect)
+    event.listen(engine, 'begin', begin_transaction)
+  return engine
+
+def create_inventory_system_db(database_path, storage_profile=DEFAULT_STORAGE_PROFILE):
   """Creates an inventory system database in the file at database_path
   """
   # Create an engine that stores data in the database path
-  engine = create_engine('sqlite:///' + database_path)
+  engine = get_engine(database_path, storage_profile)
   # Create all tables in the engine
   InventoryBase.metadata.create_all(engine)
+  engine.dispose()
+  # A new database already has the current schema, so no migrations need to be run on it
+  connection = sqlite3.connect(database_path)
+  connection.execute('PRAGMA user_version=%d' % len(MIGRATIONS))
+  connection.close()
 
-def get_dbsession(database_path):
+def get_dbsession(database_path, storage_profile=DEFAULT_STORAGE_PROFILE, writer=False):
   """ Create a DBSession instance
   """
-  engine = create_engine('sqlite:///' + database_path)
-  InventoryBase.metadata.bind = engine
+  engine = get_engine(database_path, storage_profile, writer=writer)
   DBSession = sessionmaker(bind=engine)
   return DBSession()
 
+def get_scoped_dbsession(database_path, storage_profile=DEFAULT_STORAGE_PROFILE, read_only=False, connections=None):
+  """Create a scoped DBSession that is used like a DBSession instance but gives each thread its own session; calling
+  remove() on it closes the session of the current thread and releases every object loaded by that session. The
+  sessions share a pool of connections, which are read only if read_only is True.
+  """
+  engine = get_engine(database_path, storage_profile, read_only, connections)
+  return scoped_session(sessionmaker(bind=engine))
+
 def query_db(database, query, filter=None):
   """Query a database with or without a filter and return all values of the query
   """
@@ -62,12 +171,198 @@ def query_db(database, query, filter=None):
     return database.query(query).all()
   return database.query(query).filter(filter).all()
 
+def iterate_db(database, query, filter=None, order_by=None, chunk_size=QUERY_CHUNK_SIZE, limit=None):
+  """Query a database with or without a filter and return an iterator over the values of the query that loads
+  chunk_size rows at a time, so only one chunk of rows is held in memory at once; at most limit rows are returned if
+  a limit is passed, and order_by may be a column or a tuple of columns
+  """
+  query = database.query(query)
+  if not filter is None:
+    query = query.filter(filter)
+  if isinstance(order_by, tuple):
+    query = query.order_by(*order_by)
+  elif not order_by is None:
+    query = query.order_by(order_by)
+  if not limit is None:
+    query = query.limit(limit)
+  return query.yield_per(chunk_size)
+
+def iterate_rows_db(database, table, filter=None, order_by=None, chunk_size=QUERY_CHUNK_SIZE, limit=None):
+  """Query a table of the database with or without a filter and return an iterator over the rows of the query as
+  named tuples (instead of ORM objects) that loads chunk_size rows at a time; at most limit rows are returned if a
+  limit is passed
+  """
+  query = select(table)
+  if not filter is None:
+    query = query.where(filter)
+  if not order_by is None:
+    query = query.order_by(order_by)
+  if not limit is None:
+    query = query.limit(limit)
+  return database.execute(query.execution_options(yield_per=chunk_size))
+
+def page_filter(key, filter, page_token):
+  """Returns the filter of a page of rows sorted by the key column that starts after the row whose key is page_token,
+  or the first page if page_token is empty; pages are found through an index instead of skipping the rows of the
+  pages before them, so every page takes as long to read
+  """
+  if len(page_token) == 0:
+    return filter
+  if filter is None:
+    return key > page_token
+  return and_(filter, key > page_token)
+
+def split_page(rows, page_size, page_token=lambda row: row.id):
+  """Returns a list of the first page_size of the passed rows (up to page_size + 1 rows) and the page token of the
+  next page, which is page_token of the last row of the page (its ID by default), or empty bytes if there are no rows
+  after the page
+  """
+  rows = list(rows)
+  if len(rows) > page_size:
+    return rows[:page_size], page_token(rows[page_size - 1])
+  return rows, b''
+
+def iterate_chunks(values, chunk_size=QUERY_CHUNK_SIZE):
+  """Returns an iterator over lists of chunk_size values at a time from an iterator, the last of which may be shorter
+  """
+  chunk = []
+  for value in values:
+    chunk.append(value)
+    if len(chunk) == chunk_size:
+      yield chunk
+      chunk = []
+  if len(chunk) > 0:
+    yield chunk
+
 def add_db(database, values):
   """Add values to the database and flush the database
   """
   database.add_all(values)
   database.flush()
 
+def insert_products_db(database, products):
+  """Insert product rows given a list of dicts of the values of each product with a single executemany statement,
+  skipping products with the same name as a product in the database or earlier in the list, and return the set of
+  IDs of the products that were inserted
+  """
+  if len(products) == 0:
+    return set()
+  database.execute(sqlite_insert(Product.__table__).on_conflict_do_nothing(index_elements=['name']), products)
+  ids = [product['id'] for product in products]
+  return set(database.execute(select(Product.id).where(Product.id.in_(ids))).scalars())
+
+def get_product_rows_db(database, products):
+  """Load the ID, name, amount, and version of every product in the database with the same ID or name as one of the passed
+  products, with one query per QUERY_CHUNK_SIZE IDs and names, and return dicts of the rows by ID and by name
+  """
+  ids = list({product.id for product in products if product.id})
+  names = list({product.name for product in products if product.name})
+  products_by_id, products_by_name = {}, {}
+  for start in range(0, max(len(ids), len(names)), QUERY_CHUNK_SIZE):
+    query = select(Product.id, Product.name, Product.amount, Product.version).where(or_(
+              Product.id.in_(ids[start:start + QUERY_CHUNK_SIZE]), Product.name.in_(names[start:start + QUERY_CHUNK_SIZE])))
+    for row in database.execute(query):
+      products_by_id[row.id] = row
+      products_by_name[row.name] = row
+  return products_by_id, products_by_name
+
+def get_stock_db(database, ids):
+  """Load the stock of the products with the passed IDs with one query per QUERY_CHUNK_SIZE IDs and return a dict of
+  product IDs mapped to the amount in stock
+  """
+  ids = list(ids)
+  stock = {}
+  for start in range(0, len(ids), QUERY_CHUNK_SIZE):
+    query = select(Product.id, Product.amount).where(Product.id.in_(ids[start:start + QUERY_CHUNK_SIZE]))
+    stock.update((row.id, row.amount or 0) for row in database.execute(query))
+  return stock
+
+def reserve_stock_db(database, changes):
+  """Change the stock of products given a dict of product IDs mapped to the amount added to the stock of each product
+  (negative to remove stock) with a single executemany statement, and add one to the version of each product that is
+  changed. Each product is only changed if its stock does not go below zero, which the database checks in the same
+  statement that changes it, so the stock cannot be oversold by another change made after it was read. Returns True
+  if every product was changed; otherwise the caller must roll back the products that were changed.
+  """
+  changes = [{'match': id, 'change': change} for id, change in changes.items() if change != 0]
+  if len(changes) == 0:
+    return True
+  product = Product.__table__
+  result = database.execute(product.update().where(and_(product.c.id == bindparam('match'),
+                                                        product.c.amount + bindparam('change') >= 0)).
+                                             values(amount=product.c.amount + bindparam('change'),
+                                                    version=product.c.version + 1), changes)
+  return result.rowcount == len(changes)
+
+def insert_orders_db(database, orders, order_lines):
+  """Insert order rows and order_line rows given lists of dicts of the values of each row with one executemany
+  statement for each table
+  """
+  if len(orders) > 0:
+    database.execute(Order.__table__.insert(), orders)
+  if len(order_lines) > 0:
+    database.execute(OrderLine.__table__.insert(), order_lines)
+
+def merge_stock_changes(changes):
+  """Adds up the passed dicts of product IDs mapped to stock changes into one dict
+  """
+  stock_changes = {}
+  for product_changes in changes:
+    for id, change in product_changes.items():
+      stock_changes[id] = stock_changes.get(id, 0) + change
+  return stock_changes
+
+def place_orders_db(database, orders):
+  """Reserve the stock for and insert orders given a list of (order row, order line rows, stock changes) tuples, where
+  the stock changes are a dict of product IDs mapped to the amount removed from stock (a negative number). The
+  orders are placed inside a savepoint and nothing is written if the stock of any product cannot be reserved.
+  Returns True if the orders were placed and False otherwise.
+  """
+  savepoint = database.begin_nested()
+  if not reserve_stock_db(database, merge_stock_changes(changes for _, _, changes in orders)):
+    savepoint.rollback()
+    return False
+  insert_orders_db(database, [order for order, _, _ in orders], [line for _, lines, _ in orders for line in lines])
+  savepoint.commit()
+  return True
+
+def get_order_lines_db(database, ids):
+  """Load the lines of the orders with the passed IDs with two queries per QUERY_CHUNK_SIZE IDs and return a dict of
+  the ID of each order that was found mapped to a dict of the product ID of each of its lines mapped to a tuple
+  (product name, amount)
+  """
+  ids = list(set(ids))
+  orders = {}
+  for start in range(0, len(ids), QUERY_CHUNK_SIZE):
+    chunk = ids[start:start + QUERY_CHUNK_SIZE]
+    for row in database.execute(select(Order.id).where(Order.id.in_(chunk))):
+      orders[row.id] = {}
+    line = OrderLine.__table__
+    for row in database.execute(select(line).where(line.c.order_id.in_(chunk))):
+      orders[row.order_id][row.product_id] = (row.product_name, row.amount)
+  return orders
+
+def update_order_lines_db(database, old_lines, new_lines):
+  """Change the lines of orders given dicts of order IDs mapped to the old and new lines of each order, in the form
+  returned by get_order_lines_db; only the lines that changed are written, with one executemany statement for the
+  lines that are removed and one for the lines that are added or have a new amount
+  """
+  removed_lines, changed_lines = [], []
+  for order_id, lines in new_lines.items():
+    for product_id in old_lines[order_id].keys() - lines.keys():
+      removed_lines.append({'match_order': order_id, 'match_product': product_id})
+    for product_id, (name, amount) in lines.items():
+      if old_lines[order_id].get(product_id) != (name, amount):
+        changed_lines.append({'order_id': order_id, 'product_id': product_id, 'product_name': name, 'amount': amount})
+  line = OrderLine.__table__
+  if len(removed_lines) > 0:
+    database.execute(line.delete().where(and_(line.c.order_id == bindparam('match_order'),
+                                              line.c.product_id == bindparam('match_product'))), removed_lines)
+  if len(changed_lines) > 0:
+    insert = sqlite_insert(line)
+    database.execute(insert.on_conflict_do_update(index_elements=['order_id', 'product_id'],
+                                                  set_={'amount': insert.excluded.amount}), changed_lines)
+
 def update_db(database, query, values, filter=None):
   """Update rows in the database based on a query and possibly a filter
   """
@@ -77,33 +372,265 @@ def update_db(database, query, values, filter=None):
   else:
     database.query(query).filter(filter).update(values, synchronize_session=False)
 
-def update_product_db(database, products):
-  """Update product rows given a dict of tuple (id,name) for each product as keys to the new values,
-  i.e., {(id,name):values,...}
+def update_product_db(database, products, versions=None):
+  """Update product rows given a dict of IDs mapped to dicts of column names mapped to the new values, i.e.,
+  {id:{column:value,...},...}, and add one to the version of each product that is updated. If a dict of IDs mapped to
+  versions is passed, a product is only updated if it has that version. Products that change the same columns are
+  updated with a single executemany statement. Returns how many products were updated.
   """
-  for product in products:
-    database.query(Product).filter(Product.id == product[0] or Product.name == product[1]).\
-                                                update(products[product], synchronize_session=False)
+  product = Product.__table__
+  query = product.update().where(product.c.id == bindparam('match')).values(version=product.c.version + 1)
+  if not versions is None:
+    query = query.where(product.c.version == bindparam('match_version'))
+  groups = {}
+  for id, values in products.items():
+    if len(values) == 0:
+      continue
+    row = dict(values, match=id)
+    if not versions is None:
+      row['match_version'] = versions[id]
+    groups.setdefault(tuple(sorted(values)), []).append(row)
+  updated = 0
+  for values in groups.values():
+    # The values of the first row decide which columns are in the SET clause, which is the same for the whole group
+    updated += database.execute(query, values).rowcount
+  return updated
 
 def update_order_db(database, orders):
-  """Update order rows given a dict of IDs mapped to the new values, i.e., {id:values,...}
+  """Update order rows given a dict of IDs mapped to dicts of column names mapped to the new values, i.e.,
+  {id:{column:value,...},...}; orders that change the same columns are updated with a single executemany statement
   """
-  for order in orders:
-    database.query(Order).filter(Order.id == order).update(orders[order], synchronize_session=False)
+  groups = {}
+  for id, values in orders.items():
+    if len(values) > 0:
+      groups.setdefault(tuple(sorted(values)), []).append(dict(values, match=id))
+  for values in groups.values():
+    database.execute(Order.__table__.update().where(Order.__table__.c.id == bindparam('match')), values)
+
+def set_order_columns_db(database, ids, values):
+  """Set columns of the orders with the passed IDs given a dict of column names mapped to the new values, with one
+  UPDATE statement per QUERY_CHUNK_SIZE IDs; an order is only changed if one of the columns has another value. Returns
+  a set of the IDs of the orders that were changed.
+  """
+  order = Order.__table__
+  differs = or_(*(order.c[column].is_distinct_from(value) for column, value in values.items()))
+  ids = list(set(ids))
+  changed = set()
+  for start in range(0, len(ids), QUERY_CHUNK_SIZE):
+    query = order.update().where(order.c.id.in_(ids[start:start + QUERY_CHUNK_SIZE]), differs).values(values)
+    changed.update(row.id for row in database.execute(query.returning(order.c.id)))
+  return changed
 
 def save_db(database):
-  """Save the database
+  """Save the database; while a write is run by a group committer, only its savepoint is saved and the group's
+  transaction is committed by the group committer
   """
   # The parameter database must be an instance of DBSession
-  database.commit()
+  if 'savepoint' in database.info:
+    database.info['savepoint'].commit()
+    database.info['savepoint'] = database.begin_nested()
+  else:
+    database.commit()
+
+def rollback_db(database):
+  """Undo the changes to the database since it was last saved; while a write is run by a group committer, only the
+  changes of that write are undone
+  """
+  if 'savepoint' in database.info:
+    database.info['savepoint'].rollback()
+    database.info['savepoint'] = database.begin_nested()
+  else:
+    database.rollback()
 
 def reset_db(database):
   """Reset the database by removing all products and orders from it
   """
-  database.query(Product).delete()
+  database.query(OrderLine).delete()
   database.query(Order).delete()
+  database.query(Product).delete()
   save_db(database)
 
+def migrate_order_products(connection):
+  """Moves the pickled lists of OrderProduct objects in the products column of the order table into rows of the
+  order_line table and drops the products column
+  """
+  product_ids = {name: id for id, name in connection.execute('SELECT id, name FROM product')}
+  product_names = {id: name for name, id in product_ids.items()}
+  orders = connection.execute('SELECT id, products FROM "order"').fetchall()
+
+  connection.execute('CREATE TABLE order_new (id VARCHAR(36) NOT NULL, destination VARCHAR(50) NOT NULL, '
+                     'date BLOB NOT NULL, is_paid BOOLEAN, is_shipped BOOLEAN, PRIMARY KEY (id))')
+  connection.execute('INSERT INTO order_new (id, destination, date, is_paid, is_shipped) '
+                     'SELECT id, destination, date, is_paid, is_shipped FROM "order"')
+  connection.execute('DROP TABLE "order"')
+  connection.execute('ALTER TABLE order_new RENAME TO "order"')
+  connection.execute('CREATE TABLE order_line (order_id VARCHAR(36) NOT NULL, product_id VARCHAR(36) NOT NULL, '
+                     'product_name VARCHAR(50) NOT NULL, amount INTEGER NOT NULL, PRIMARY KEY (order_id, product_id), '
+                     'FOREIGN KEY(order_id) REFERENCES "order" (id) ON DELETE CASCADE, '
+                     'FOREIGN KEY(product_id, product_name) REFERENCES product (id, name))')
+  connection.execute('CREATE INDEX ix_order_line_product ON order_line (product_id, product_name)')
+
+  for order_id, products in orders:
+    # Older versions stored products added by name only with an empty ID, so they are looked up by name; products
+    # listed more than once in an order are merged into a single line
+    lines = {}
+    for product in pickle.loads(products):
+      id = product.id if product.id in product_names else product_ids.get(product.name)
+      if id is not None and product.amount > 0:
+        lines[id] = lines.get(id, 0) + product.amount
+    connection.executemany('INSERT INTO order_line (order_id, product_id, product_name, amount) VALUES (?, ?, ?, ?)',
+                           [(order_id, id, product_names[id], amount) for id, amount in lines.items()])
+
+def migrate_order_dates(connection):
+  """Replaces the pickled OrderDate objects in the date column of the order table with an indexed DATE column
+  """
+  orders = connection.execute('SELECT id, date FROM "order"').fetchall()
+
+  connection.execute('CREATE TABLE order_new (id VARCHAR(36) NOT NULL, destination VARCHAR(50) NOT NULL, '
+                     'date DATE NOT NULL, is_paid BOOLEAN, is_shipped BOOLEAN, PRIMARY KEY (id))')
+  connection.execute('INSERT INTO order_new (id, destination, date, is_paid, is_shipped) '
+                     'SELECT id, destination, \'\', is_paid, is_shipped FROM "order"')
+  connection.execute('DROP TABLE "order"')
+  connection.execute('ALTER TABLE order_new RENAME TO "order"')
+
+  # Older versions stored whatever date they were sent, so dates that do not exist are stored as the earliest date
+  dates = []
+  for id, date in orders:
+    date = pickle.loads(date)
+    dates.append(((to_date(date) or datetime.date.min).isoformat(), id))
+  connection.executemany('UPDATE "order" SET date = ? WHERE id = ?', dates)
+  connection.execute('CREATE INDEX ix_order_date ON "order" (date)')
+
+def migrate_secondary_indexes(connection):
+  """Adds the indexes used to look up products by manufacturer and stock and orders by status
+  """
+  connection.execute('CREATE INDEX IF NOT EXISTS ix_product_manufacturer ON product (manufacturer)')
+  connection.execute('CREATE INDEX IF NOT EXISTS ix_product_in_stock ON product (amount) WHERE amount > 0')
+  connection.execute('CREATE INDEX IF NOT EXISTS ix_order_status ON "order" (is_paid, is_shipped)')
+
+def migrate_binary_ids(connection):
+  """Stores product and order IDs as the 16 bytes of their UUIDs, makes the ID the only primary key of the product table,
+  and adds a unique index on product names; products with the same name are merged into the first one added, which
+  keeps the stock of all of them
+  """
+  used_ids = set()
+  def to_binary_id(id):
+    try:
+      binary_id = uuid.UUID(id).bytes
+    except (AttributeError, TypeError, ValueError):
+      binary_id = uuid.uuid4().bytes
+    # Product IDs were only unique together with product names, so an ID that is already used is replaced
+    while binary_id in used_ids:
+      binary_id = uuid.uuid4().bytes
+    used_ids.add(binary_id)
+    return binary_id
+
+  # Map the (id, name) primary key of every product to the binary ID of the product it is kept as
+  products, product_ids, products_by_name = [], {}, {}
+  for product in connection.execute('SELECT id, name, description, manufacturer, wholesale_cost, sale_cost, amount '
+                                    'FROM product ORDER BY rowid'):
+    id, name = product[0], product[1]
+    if name in products_by_name:
+      kept_product = products_by_name[name]
+      kept_product[6] = (kept_product[6] or 0) + (product[6] or 0)
+    else:
+      kept_product = [to_binary_id(id)] + list(product[1:])
+      products.append(kept_product)
+      products_by_name[name] = kept_product
+    product_ids[(id, name)] = kept_product[0]
+  used_ids.clear()
+  order_ids = {id: to_binary_id(id) for id, in connection.execute('SELECT id FROM "order"')}
+  # Lines of an order for products that were merged are merged as well
+  lines = {}
+  for order_id, product_id, product_name, amount in connection.execute('SELECT order_id, product_id, product_name, '
+                                                                       'amount FROM order_line'):
+    key = (order_ids[order_id], product_ids[(product_id, product_name)])
+    lines[key] = (product_name, lines[key][1] + amount if key in lines else amount)
+
+  connection.execute('CREATE TABLE product_new (id BLOB NOT NULL, name VARCHAR(50) NOT NULL, description VARCHAR(250), '
+                     'manufacturer VARCHAR(50), wholesale_cost FLOAT, sale_cost FLOAT, amount INTEGER, PRIMARY KEY (id))')
+  connection.executemany('INSERT INTO product_new (id, name, description, manufacturer, wholesale_cost, sale_cost, '
+                         'amount) VALUES (?, ?, ?, ?, ?, ?, ?)', products)
+  connection.execute('CREATE TABLE order_new (id BLOB NOT NULL, destination VARCHAR(50) NOT NULL, date DATE NOT NULL, '
+                     'is_paid BOOLEAN, is_shipped BOOLEAN, PRIMARY KEY (id))')
+  connection.execute('INSERT INTO order_new (id, destination, date, is_paid, is_shipped) '
+                     'SELECT id, destination, date, is_paid, is_shipped FROM "order"')
+  connection.executemany('UPDATE order_new SET id = ? WHERE id = ?',
+                         [(binary_id, id) for id, binary_id in order_ids.items()])
+  connection.execute('CREATE TABLE order_line_new (order_id BLOB NOT NULL, product_id BLOB NOT NULL, '
+                     'product_name VARCHAR(50) NOT NULL, amount INTEGER NOT NULL, PRIMARY KEY (order_id, product_id), '
+                     'FOREIGN KEY(order_id) REFERENCES "order" (id) ON DELETE CASCADE, '
+                     'FOREIGN KEY(product_id) REFERENCES product (id))')
+  connection.executemany('INSERT INTO order_line_new (order_id, product_id, product_name, amount) VALUES (?, ?, ?, ?)',
+                         [key + line for key, line in lines.items()])
+
+  for table in ['order_line', 'order', 'product']:
+    connection.execute('DROP TABLE "%s"' % table)
+    connection.execute('ALTER TABLE "%s_new" RENAME TO "%s"' % (table, table))
+  connection.execute('CREATE UNIQUE INDEX ix_product_name ON product (name)')
+  connection.execute('CREATE INDEX ix_product_manufacturer ON product (manufacturer)')
+  connection.execute('CREATE INDEX ix_product_in_stock ON product (amount) WHERE amount > 0')
+  connection.execute('CREATE INDEX ix_order_date ON "order" (date)')
+  connection.execute('CREATE INDEX ix_order_status ON "order" (is_paid, is_shipped)')
+  connection.execute('CREATE INDEX ix_order_line_product_id ON order_line (product_id)')
+
+def migrate_product_versions(connection):
+  """Adds the version column to the product table; every existing product starts at version 1
+  """
+  connection.execute('ALTER TABLE product ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+
+def migrate_keyset_indexes(connection):
+  """Sorts the indexes used to look up products by manufacturer and stock and orders by status by ID, so the pages of
+  those lookups are read from the indexes in order
+  """
+  connection.execute('DROP INDEX IF EXISTS ix_product_manufacturer')
+  connection.execute('DROP INDEX IF EXISTS ix_product_in_stock')
+  connection.execute('DROP INDEX IF EXISTS ix_order_status')
+  connection.execute('CREATE INDEX ix_product_manufacturer ON product (manufacturer, id)')
+  connection.execute('CREATE INDEX ix_product_in_stock ON product (id) WHERE amount > 0')
+  connection.execute('CREATE INDEX ix_order_status ON "order" (is_paid, is_shipped, id)')
+
+def migrate_order_date_index(connection):
+  """Sorts the index of order dates by ID, so the pages of orders in a date range are read from the index in order
+  """
+  connection.execute('DROP INDEX IF EXISTS ix_order_date')
+  connection.execute('CREATE INDEX ix_order_date ON "order" (date, id)')
+
+def migrate_order_flag_indexes(connection):
+  """Adds an index sorted by ID for each order status flag, so the pages of orders that are only looked up by
+  whether they are paid or whether they are shipped are read from an index in order
+  """
+  connection.execute('CREATE INDEX IF NOT EXISTS ix_order_paid ON "order" (is_paid, id)')
+  connection.execute('CREATE INDEX IF NOT EXISTS ix_order_shipped ON "order" (is_shipped, id)')
+
+# The schema migrations in the order they are applied; PRAGMA user_version holds how many have been applied to a
+# database, so new migrations must only ever be appended
+MIGRATIONS = [migrate_order_products, migrate_order_dates, migrate_secondary_indexes, migrate_binary_ids,
+              migrate_product_versions, migrate_keyset_indexes, migrate_order_date_index, migrate_order_flag_indexes]
+
+def upgrade_inventory_system_db(database_path):
+  """Applies every migration that has not been applied yet to the database at database_path in a single transaction.
+  Returns a tuple of the schema versions before and after the upgrade.
+  """
+  # Autocommit mode so that the transaction below is controlled explicitly and covers the DDL statements as well
+  connection = sqlite3.connect(database_path, isolation_level=None)
+  try:
+    # Foreign keys cannot be checked while tables are being rebuilt; this must be set outside of a transaction
+    connection.execute('PRAGMA foreign_keys=OFF')
+    connection.execute('BEGIN IMMEDIATE')
+    version = connection.execute('PRAGMA user_version').fetchone()[0]
+    try:
+      for migration in MIGRATIONS[version:]:
+        migration(connection)
+      connection.execute('PRAGMA user_version=%d' % max(version, len(MIGRATIONS)))
+      connection.execute('COMMIT')
+    except:
+      connection.execute('ROLLBACK')
+      raise
+  finally:
+    connection.close()
+  return version, max(version, len(MIGRATIONS))
+
 
 
 
@@ -116,7 +643,8 @@ def reset_db(database):
 
 
 class OrderDate():
-  """A class for creating dates for an order that will then be stored in the database as a PickleType
+  """A class for creating dates for an order; older databases stored these in the order table as a PickleType, so it
+  is also needed to read them when those databases are upgraded
   """
 
   def __init__(self, month, day, year):
@@ -125,7 +653,8 @@ class OrderDate():
     self.year = year
 
 class OrderProduct():
-  """A class for creating products for an order that will then be stored in the database as a PickleType
+  """A class for passing around the ID, name, and amount of a product in an order; older databases stored lists of
+  these in the order table as a PickleType, so it is also needed to read them when those databases are upgraded
   """
 
   def __init__(self, id, name, amount):
@@ -133,31 +662,53 @@ class OrderProduct():
     self.name = name
     self.amount = amount
 
+def to_date(date):
+  """Converts an object with a year, month, and day (such as an OrderDate or a Date message) to a datetime.date or
+  returns None if the date does not exist
+  """
+  try:
+    return datetime.date(year=date.year, month=date.month, day=date.day)
+  except (AttributeError, TypeError, ValueError):
+    return None
+
 def GetProductsByID(database, ids):
-  """Returns a Product object of a given ID or None if the product is not found.
+  """Returns an iterator over rows of the products with the given IDs.
   """
-  return query_db(database, Product, (Product.id.in_(ids)))
+  return iterate_rows_db(database, Product.__table__, (Product.id.in_(ids)))
 
 def GetProductsByName(database, names):
-  """Returns a Product object of a given name or None if the product is not found.
+  """Returns an iterator over rows of the products with the given names.
   """
-  return query_db(database, Product, (Product.name.in_(names)))
+  return iterate_rows_db(database, Product.__table__, (Product.name.in_(names)))
 
 def GetProductsByManufacturer(database, manufacturer):
-  """Returns a Product object of a given name or None if the product is not found.
+  """Returns an iterator over rows of the products from a given manufacturer.
+  """
+  return iterate_rows_db(database, Product.__table__, (Product.manufacturer==manufacturer))
+
+def GetProductsByManufacturerPage(database, manufacturer, page_size, page_token=b''):
+  """Returns a list of rows of up to page_size products from a given manufacturer sorted by ID, starting after the
+  product whose ID is page_token, and the page token of the next page, which is empty bytes on the last page.
   """
-  return query_db(database, Product, (Product.manufacturer==manufacturer))
+  rows = iterate_rows_db(database, Product.__table__, page_filter(Product.id, Product.manufacturer==manufacturer,
+                                                                  page_token), order_by=Product.id, limit=page_size + 1)
+  return split_page(rows, page_size)
 
 def AddProducts(database, products):
-  """Adds products to the database and returns their IDs or an empty list if the add fails.
+  """Adds products to the database and returns a list with the ID of each product in the order they were passed, or
+  empty bytes for a product that was not added because its name is already used. Products are inserted and
+  committed INSERT_CHUNK_SIZE at a time, so a failure only loses the products of the chunk that failed.
   """
+  ids = []
   try:
-    ids = [str(uuid.uuid4()) for i in range(len(products))]
-    products = [Product(id=ids[i], name=products[i].name, description=products[i].description,
-                        manufacturer=products[i].manufacturer, wholesale_cost=products[i].wholesale_cost,
-                        sale_cost=products[i].sale_cost, amount=products[i].amount) for i in range(len(products))]
-    add_db(database, products)
-    save_db(database)
+    for start in range(0, len(products), INSERT_CHUNK_SIZE):
+      chunk = [{'id': uuid.uuid4().bytes, 'name': product.name, 'description': product.description,
+                'manufacturer': product.manufacturer, 'wholesale_cost': product.wholesale_cost,
+                'sale_cost': product.sale_cost, 'amount': product.amount, 'version': 1}
+               for product in products[start:start + INSERT_CHUNK_SIZE]]
+      inserted_ids = insert_products_db(database, chunk)
+      save_db(database)
+      ids.extend(product['id'] if product['id'] in inserted_ids else b'' for product in chunk)
     return ids
   except KeyboardInterrupt:
     # Save the database if there is a KeyboardInterrupt
@@ -166,35 +717,71 @@ def AddProducts(database, products):
     # Allow the interrupt to propagate up 
     raise KeyboardInterrupt
   except Exception as e:
-    print('There was an issue adding products: ' + e)
-    return []
+    rollback_db(database)
+    print('There was an issue adding products: ' + str(e))
+    return ids + [b''] * (len(products) - len(ids))
 
-def UpdateProducts(database, products):
-  """Updates products based on the passed products.
+def product_values(product):
+  """Returns a dict of the columns of a product that are to be updated mapped to their values given the passed product;
+  empty strings and negative numbers leave a column unchanged
+  """
+  values = {}
+  # Update a product's description
+  if product.description != '':
+    values['description'] = product.description
+  # Update a product's manufacturer
+  if product.manufacturer != '':
+    values['manufacturer'] = product.manufacturer
+  # Update a product's wholesale_cost
+  if product.wholesale_cost >= 0:
+    values['wholesale_cost'] = product.wholesale_cost
+  # Update a product's sale_cost
+  if product.sale_cost >= 0:
+    values['sale_cost'] = product.sale_cost
+  # Update a product's amount
+  if product.amount >= 0:
+    values['amount'] = product.amount
+  return values
+
+def update_products(database, products, check_version):
+  """Updates the passed products inside a savepoint; a product is matched by its ID, or by its name if it has no ID,
+  and if check_version is True it is only updated if it has the version of the passed product. Returns the ID of
+  each product, or empty bytes for a product that was not found or has another version, or None if a product
+  changed since it was read, in which case nothing is changed.
+  """
+  products_by_id, products_by_name = get_product_rows_db(database, products)
+  ids, values, versions = [b''] * len(products), {}, {}
+  for i, product in enumerate(products):
+    row = products_by_id.get(product.id) if product.id else products_by_name.get(product.name)
+    if row is None or (check_version and row.version != product.version):
+      continue
+    ids[i] = row.id
+    # A product listed more than once gets the values of each of them, with later ones replacing earlier ones
+    values.setdefault(row.id, {}).update(product_values(product))
+    versions[row.id] = row.version
+  savepoint = database.begin_nested()
+  # A product that changed since it was read is not updated, so fewer rows are updated than were read
+  changed = sum(len(columns) > 0 for columns in values.values())
+  if update_product_db(database, values, versions if check_version else None) != changed:
+    savepoint.rollback()
+    return None
+  savepoint.commit()
+  return ids
+
+def UpdateProducts(database, products, check_version=False):
+  """Updates products based on the passed products and returns the ID of each product in the order they were
+  passed, or empty bytes for a product that was not updated because it was not found or, if check_version is True,
+  because its version is not the version of the passed product. Every product that is updated gets a new version.
+  Returns None without updating any product if the products kept changing while they were being updated.
   """
   try:
-    # Creates a dictionary with tuple keys (product.id, product.name) that map to a dict value: the dict contains the
-    # values of the product that are to be updated and calls update_product_db to update the database
-    _products = {}
-    for product in products:
-      _products[(product.id, product.name)] = {}
-      # Update a product's description
-      if product.description != '':
-        _products[(product.id, product.name)][Product.description] = product.description
-      # Update a product's manufacturer
-      if product.manufacturer != '':
-        _products[(product.id, product.name)][Product.manufacturer] = product.manufacturer
-      # Update a product's wholesale_cost
-      if product.wholesale_cost >= 0:
-        _products[(product.id, product.name)][Product.wholesale_cost] = product.wholesale_cost
-      # Update a product's sale_cost
-      if product.sale_cost >= 0:
-        _products[(product.id, product.name)][Product.sale_cost] = product.sale_cost
-      # Update a product's amount
-      if product.amount >= 0:
-        _products[(product.id, product.name)][Product.amount] = product.amount
-    update_product_db(database, _products)
+    # The products are read again if one of them changed after it was read
+    for attempt in range(UPDATE_PRODUCTS_ATTEMPTS):
+      ids = update_products(database, products, check_version)
+      if not ids is None:
+        break
     save_db(database)
+    return ids
   except KeyboardInterrupt:
     # Save the database if there is a KeyboardInterrupt
     save_db(database)
@@ -203,90 +790,256 @@ def UpdateProducts(database, products):
     raise KeyboardInterrupt
 
 def GetProductsInStock(database):
-  """Returns a list of products in stock.
+  """Returns an iterator over rows of the products in stock.
   """
-  return query_db(database, Product, Product.amount > 0)
+  return iterate_rows_db(database, Product.__table__, Product.amount > 0)
 
-def GetOrdersByID(database, ids):
-  """Gets orders by their IDs or returns None if not found.
+def GetProductsInStockPage(database, page_size, page_token=b''):
+  """Returns a list of rows of up to page_size products in stock sorted by ID, starting after the product whose ID
+  is page_token, and the page token of the next page, which is empty bytes on the last page.
   """
-  return query_db(database, Order, (Order.id.in_(ids)))
+  rows = iterate_rows_db(database, Product.__table__, page_filter(Product.id, Product.amount > 0, page_token),
+                         order_by=Product.id, limit=page_size + 1)
+  return split_page(rows, page_size)
 
-def check_product_available(database, added_products):
-    """Checks all products added to an order to make sure there is enough in stock in the database. Returns True if
-    there is enough stock and False otherwise.
-    """
-    for product in added_products:
-      product_available = query_db(database, Product, (Product.id==product.id or Product.name==product.name))
-      if len(product_available) > 0:
-        if product_available[0].amount < product.amount:
-          return False
-    return True
+def GetProducts(database):
+  """Returns an iterator over rows of every product.
+  """
+  return iterate_rows_db(database, Product.__table__)
 
-def get_order_product(database, prod_for_id, prod_for_name=None, prod_for_amount=None, query=False):
-  """Retrieves and returns a product based on the ID, name, and amount from the passed products.
-  The passed products are dbProduct objects and are converted to a OrderProduct object. If a product
-  for name or amount is not supplied, then the product for ID is used to get the name or amount.
-  If query is True, then the product for ID is used to query the database for the product which then
-  is used to create the OrderProduct object.
-  """
-
-  # Query will use prod_for_id to query the database for the ID and name if only one is supplied
-  # The amount from prod_for_id is used for the amount
-  if query:
-    product = query_db(database, Product, (Product.id==prod_for_id.id or Product.name==prod_for_id.name))
-    if len(product) > 0:
-      product = product[0]
-      return OrderProduct(id=product.id, name=product.name, amount=prod_for_id.amount)
-    return None
-  
-  # If no products for name or amount retrieval is supplied, use the product supplied for the ID
-  if prod_for_name is None:
-    prod_for_name = prod_for_id
-  if prod_for_amount is None:
-    prod_for_amount = prod_for_id
-  return OrderProduct(id=prod_for_id.id, name=prod_for_name.name, amount=prod_for_amount.amount)
+def GetProductsPage(database, page_size, page_token=b''):
+  """Returns a list of rows of up to page_size products sorted by ID, starting after the product whose ID is
+  page_token, and the page token of the next page, which is empty bytes on the last page.
+  """
+  rows = iterate_rows_db(database, Product.__table__, page_filter(Product.id, None, page_token), order_by=Product.id,
+                         limit=page_size + 1)
+  return split_page(rows, page_size)
 
-def get_products_new_order(database, requested_products):
-  """Converts a list of Product objects to type OrderProduct
+def GetOrdersByID(database, ids):
+  """Returns an iterator over the orders with the given IDs.
   """
-  products = []
+  return iterate_db(database, Order, (Order.id.in_(ids)))
+
+def resolve_order_products(requested_products, products_by_id, products_by_name):
+  """Matches the requested products of an order to product rows loaded by get_product_rows_db by ID, or by name if
+  the ID does not match, and returns a dict of product IDs mapped to OrderProduct objects; a product requested more
+  than once is merged into a single OrderProduct and products that are not found or have no amount are left out
+  """
+  products = {}
   for product in requested_products:
-    product = get_order_product(database, product, query=True)
-    if not product is None and product.amount > 0:
-      products.append(product)
+    row = products_by_id.get(product.id) or products_by_name.get(product.name)
+    if not row is None and product.amount > 0:
+      if row.id in products:
+        products[row.id].amount += product.amount
+      else:
+        products[row.id] = OrderProduct(id=row.id, name=row.name, amount=product.amount)
   return products
 
-def add_products_to_order(database, added_products):
-    """Removes the products added to an order from stock
-    """
-    for product in added_products:
-      product_in_db = query_db(database, Product, (Product.name==product.name or Product.id==product.id))
-      if len(product_in_db) > 0:
-        update_db(database, Product, {Product.amount:(product_in_db[0].amount - product.amount)},
-                  (Product.name==product.name or Product.id==product.id))
-  
-def CreateOrders(database, orders):
-  """Adds an order to the database and returns the ID or an empty string if the add fails.
+def allocate_orders(orders, policy, products_by_id, products_by_name, stock):
+  """Allocates the stock of products (a dict of product IDs mapped to the amount in stock) to the passed orders with
+  an allocation policy from inventory_system_allocation and returns a dict for each order of the IDs of the products
+  allocated to it mapped to OrderProduct objects with the allocated amounts; an order that is not allocated anything
+  has an empty dict
+  """
+  product_indexes = {id: i for i, id in enumerate(products_by_id)}
+  stock = [stock.get(id, 0) for id in products_by_id]
+  allocations = [resolve_order_products(order.products, products_by_id, products_by_name) for order in orders]
+  lines = [(i, product_indexes[id], product.amount) for i, products in enumerate(allocations)
+           for id, product in products.items()]
+  line_orders, line_products, line_amounts = zip(*lines) if len(lines) > 0 else ((), (), ())
+  allocated = iter(inventory_system_allocation.allocate(stock, line_orders, line_products, line_amounts, policy).tolist())
+  for products in allocations:
+    for id, product in list(products.items()):
+      product.amount = next(allocated)
+      if product.amount == 0:
+        del products[id]
+  return allocations
+
+def new_order_rows(id, order, products):
+  """Returns the order row, order line rows, and stock changes of a new order with the given ID and products (a dict
+  of product IDs mapped to OrderProduct objects) in the form taken by place_orders_db
+  """
+  # Orders sent without a valid date are dated the day they are created
+  order_row = {'id': id, 'destination': order.destination, 'date': to_date(order.date) or datetime.date.today(),
+               'is_paid': order.is_paid, 'is_shipped': order.is_shipped}
+  order_line_rows = [{'order_id': id, 'product_id': product_id, 'product_name': product.name, 'amount': product.amount}
+                     for product_id, product in products.items()]
+  return order_row, order_line_rows, {product_id: -product.amount for product_id, product in products.items()}
+
+def requested_amounts(orders, products_by_id, products_by_name):
+  """Returns a dict of the IDs of the product rows loaded by get_product_rows_db mapped to the total amount of each
+  product requested by the passed orders
+  """
+  return merge_stock_changes([dict.fromkeys(products_by_id, 0)] +
+                             [{id: product.amount for id, product in resolve_order_products(
+                                 order.products, products_by_id, products_by_name).items()} for order in orders])
+
+def allocate_orders_with_ledger(database, orders, policy, ledger):
+  """Allocates and places orders like AllocateOrders with the stock kept by a StockLedger instead of the database;
+  the products of the orders are locked in the ledger while they are allocated and the new orders are written to
+  the database by the ledger after their stock is reserved. Returns the IDs and allocations of the orders.
+  """
+  products_by_id, products_by_name = get_product_rows_db(database, [product for order in orders
+                                                                    for product in order.products])
+  with ledger.lock(database, requested_amounts(orders, products_by_id, products_by_name)) as stock:
+    allocations = allocate_orders(orders, policy, products_by_id, products_by_name, stock)
+    ids = [uuid.uuid4().bytes if len(products) > 0 else b'' for products in allocations]
+    placed_orders = [new_order_rows(id, order, products) for id, order, products in zip(ids, orders, allocations) if id]
+    order_rows = [order for order, _, _ in placed_orders]
+    order_line_rows = [line for _, lines, _ in placed_orders for line in lines]
+    ledger.submit(merge_stock_changes(changes for _, _, changes in placed_orders),
+                  lambda database: insert_orders_db(database, order_rows, order_line_rows))
+  return ids, allocations
+
+def AllocateOrders(database, orders, policy=inventory_system_allocation.DEFAULT_POLICY, ledger=None):
+  """Adds orders to the database with the stock allocated to them by the given allocation policy and returns a tuple
+  (ID, products) for each order in the order they were passed, where products is a dict of product IDs mapped to
+  OrderProduct objects with the amounts allocated to the order; an order that is not allocated anything is not
+  created and has empty bytes for its ID. The stock of the whole batch is allocated at once and reserved with a
+  single statement, and if the stock changed since it was read the orders are allocated again. If a StockLedger is
+  passed, the stock is reserved in the ledger and the orders are written to the database after this returns.
   """
   try:
+    if not ledger is None:
+      return list(zip(*allocate_orders_with_ledger(database, orders, policy, ledger)))
+    for attempt in range(PLACE_ORDERS_ATTEMPTS):
+      products_by_id, products_by_name = get_product_rows_db(database, [product for order in orders
+                                                                        for product in order.products])
+      stock = {id: row.amount or 0 for id, row in products_by_id.items()}
+      allocations = allocate_orders(orders, policy, products_by_id, products_by_name, stock)
+      ids = [uuid.uuid4().bytes if len(products) > 0 else b'' for products in allocations]
+      if place_orders_db(database, [new_order_rows(id, order, products)
+                                    for id, order, products in zip(ids, orders, allocations) if id]):
+        break
+    else:
+      # The stock kept changing while the orders were being placed so none of them are created
+      ids, allocations = [b''] * len(orders), [{}] * len(orders)
+    save_db(database)
+    return list(zip(ids, allocations))
+  except KeyboardInterrupt:
+    # Save the database if there is a KeyboardInterrupt
+    save_db(database)
+    database.close()
+    # Allow the interrupt to propagate up 
+    raise KeyboardInterrupt
 
-    _orders, ids = [], []
-    dates = [OrderDate(month=orders[i].date.month, day=orders[i].date.day, year=orders[i].date.year) for i in range(len(orders))]
-    
-    for i in range(len(orders)):
-      products = []
-      if check_product_available(database, orders[i].products):
-        products = get_products_new_order(database, orders[i].products)
-
-      if len(products) > 0:
-        # Update how much product is available
-        add_products_to_order(database, products)
-        id = str(uuid.uuid4())
-        ids.append(id)
-        _orders.append(Order(id=id, destination=orders[i].destination, date=dates[i], is_paid=orders[i].is_paid,
-                           is_shipped=orders[i].is_shipped, products=products))
-    add_db(database, _orders)
+def CreateOrders(database, orders, policy=inventory_system_allocation.DEFAULT_POLICY, ledger=None):
+  """Adds orders to the database with the stock allocated to them by the given allocation policy and returns the ID
+  of each order in the order they were passed, or empty bytes for an order that was not created. With the default
+  policy an order is only created if there is enough stock left for all of its products after the orders before it.
+  """
+  return [id for id, _ in AllocateOrders(database, orders, policy, ledger)]
+
+def plan_order_updates(orders, old_lines, products_by_id, products_by_name, stock):
+  """Works out the changes to the passed orders given the lines of the orders (as returned by get_order_lines_db), the
+  product rows loaded by get_product_rows_db, and a dict of product IDs mapped to the amount in stock; the stock is
+  checked in the order the orders were passed. Returns a tuple (IDs, values, new lines, stock changes) where IDs has
+  the ID of each order, or empty bytes for an order that was not found or does not have enough stock for its new
+  products, and the rest are in the forms taken by update_order_db, update_order_lines_db, and reserve_stock_db.
+  """
+  stock = dict(stock)
+  ids, values, new_lines, stock_changes = [b''] * len(orders), {}, {}, {}
+  for i, order in enumerate(orders):
+    if not order.id in old_lines:
+      continue
+    # Update the products of an order (remove, add, or update the quantity of each product)
+    if len(order.products) > 0:
+      # An order listed more than once is changed from the lines it was given earlier in the request
+      lines = new_lines.get(order.id, old_lines[order.id])
+      products = resolve_order_products(order.products, products_by_id, products_by_name)
+      # Products that are no longer in the order, or have a smaller amount, are returned to stock
+      changes = {product_id: amount for product_id, (_, amount) in lines.items()}
+      for product_id, product in products.items():
+        changes[product_id] = changes.get(product_id, 0) - product.amount
+      if any(change < 0 and stock[product_id] + change < 0 for product_id, change in changes.items()):
+        continue
+      for product_id, change in changes.items():
+        stock[product_id] = stock.get(product_id, 0) + change
+        stock_changes[product_id] = stock_changes.get(product_id, 0) + change
+      new_lines[order.id] = {product_id: (product.name, product.amount) for product_id, product in products.items()}
+
+    order_values = values.setdefault(order.id, {})
+    # Update an order's destination
+    if order.destination != '':
+      order_values['destination'] = order.destination
+    # Update an order's date
+    date = to_date(order.date)
+    if not date is None:
+      order_values['date'] = date
+    # Update an order if it was paid for
+    if order.is_paid:
+      order_values['is_paid'] = order.is_paid
+    # Update an order if it shipped
+    if order.is_shipped:
+      order_values['is_shipped'] = order.is_shipped
+    ids[i] = order.id
+
+  return ids, values, new_lines, stock_changes
+
+def update_orders(database, orders):
+  """Updates the passed orders in one pass: the orders, their lines, and their products are loaded in bulk, the stock
+  is checked in memory in the order the orders were passed, and the net stock change of every product, the new
+  values of the orders, and their changed lines are written inside a savepoint with a few executemany statements.
+  Returns the ID of each order, or empty bytes for an order that was not found or does not have enough stock for its
+  new products, or None if the stock changed since it was read, in which case nothing is changed.
+  """
+  old_lines = get_order_lines_db(database, [order.id for order in orders])
+  products_by_id, products_by_name = get_product_rows_db(database, [product for order in orders
+                                                                    for product in order.products])
+  stock = {id: row.amount or 0 for id, row in products_by_id.items()}
+  ids, values, new_lines, stock_changes = plan_order_updates(orders, old_lines, products_by_id, products_by_name, stock)
+  savepoint = database.begin_nested()
+  if not reserve_stock_db(database, stock_changes):
+    savepoint.rollback()
+    return None
+  update_order_db(database, values)
+  update_order_lines_db(database, old_lines, new_lines)
+  savepoint.commit()
+  return ids
+
+def update_orders_with_ledger(database, orders, ledger):
+  """Updates orders like update_orders with the stock kept by a StockLedger instead of the database; the orders and
+  the products whose stock changes are locked in the ledger while the updates are worked out, and the updates are
+  written to the database by the ledger after their stock is reserved. Returns the ID of each order, or empty bytes
+  for an order that was not updated.
+  """
+  order_ids = [order.id for order in orders]
+  products_by_id, products_by_name = get_product_rows_db(database, [product for order in orders
+                                                                    for product in order.products])
+  demand = requested_amounts(orders, products_by_id, products_by_name)
+  while True:
+    with ledger.lock(database, demand, order_ids) as stock:
+      # The lines of the orders are read once the writes queued for them are in the database, in a new transaction
+      # so that the writes are seen
+      ledger.flush()
+      save_db(database)
+      old_lines = get_order_lines_db(database, order_ids)
+      line_product_ids = {product_id for lines in old_lines.values() for product_id in lines}
+      if line_product_ids <= demand.keys():
+        ids, values, new_lines, stock_changes = plan_order_updates(orders, old_lines, products_by_id, products_by_name,
+                                                                   stock)
+        def write(database):
+          update_order_db(database, values)
+          update_order_lines_db(database, old_lines, new_lines)
+        ledger.submit(stock_changes, write)
+        return ids
+    # The orders have lines for products that were not locked, so the orders are locked again with those products
+    demand = {**dict.fromkeys(line_product_ids, 0), **demand}
+
+def UpdateOrders(database, orders, ledger=None):
+  """Updates orders based on the passed orders and returns the ID of each order in the order they were passed, or
+  empty bytes for an order that was not updated because it was not found or there is not enough stock for its new
+  products. If a StockLedger is passed, the stock is reserved in the ledger and the orders are written to the
+  database after this returns.
+  """
+  try:
+    if not ledger is None:
+      return update_orders_with_ledger(database, orders, ledger)
+    ids = update_orders(database, orders)
+    # The stock changed since it was read, so the orders are updated one at a time so that only the orders without
+    # enough stock fail
+    if ids is None:
+      ids = [(update_orders(database, [order]) or [b''])[0] for order in orders]
     save_db(database)
     return ids
   except KeyboardInterrupt:
@@ -296,71 +1049,18 @@ def CreateOrders(database, orders):
     # Allow the interrupt to propagate up 
     raise KeyboardInterrupt
 
-def remove_products_from_order(database, removed_products):
-    """Adds the products removed from an order back into stock
-    """
-    for product in removed_products:
-      product_in_db = query_db(database, Product, (Product.name==product.name or Product.id==product.id))
-      if len(product_in_db) > 0:
-        update_db(database, Product, {Product.amount:(product_in_db[0].amount + product.amount)},
-                  (Product.name==product.name or Product.id==product.id))
-
-def get_order_products(database, id):
-    """Retrieves all products in an order with the ID of the product as a key to the amount of the product. 
-    """
-    order = query_db(database, Order, Order.id==id)
-    if len(order) > 0:
-      return {product.id: product.amount for product in order[0].products}
-    return {}
-
-def UpdateOrders(database, orders):
-  """Updates an order based on the passed order.
+def SetOrderStatus(database, ids, is_paid=None, is_shipped=None):
+  """Sets whether the orders with the passed IDs are paid and whether they are shipped, leaving a status that is None
+  unchanged, and returns the IDs of the orders that were changed in the order they were passed; orders that are not
+  found or already have the status are left out
   """
+  values = {column: value for column, value in (('is_paid', is_paid), ('is_shipped', is_shipped)) if not value is None}
+  if len(values) == 0:
+    return []
   try:
-    # Creates a dictionary with the order IDs as the keys that map to a dict value: the dict contains the
-    # values of the order that are to be updated and calls update_order_db to update the database
-    _orders = {}
-    for order in orders:
-      _orders[order.id] = {}
-      # Update an order's destination
-      if order.destination != '':
-        _orders[order.id][Order.destination] = order.destination
-      # Update an order's date
-      year = 0 <= order.date.year <= 9999
-      month = 1 <= order.date.month <= 12
-      day = 1 <= order.date.day <= 31
-      if year and month and day:
-        _orders[order.id][Order.date] = OrderDate(month=order.date.month, day=order.date.day, year=order.date.year)
-      # Update the products of an order (remove, add, or update the quantity of each product)
-      if len(order.products) > 0:
-        old_product_amounts = get_order_products(database, order.id)
-        # Get products to add and remove
-        added_products, removed_products = [], []
-        for product in order.products:
-          try:
-            old_amount = old_product_amounts[product.id]
-            if old_amount <= product.amount:
-              added_products.append(OrderProduct(id=product.id, name=product.name, amount=(product.amount - old_amount)))
-            else:
-              removed_products.append(OrderProduct(id=product.id, name=product.name, amount=(old_amount - product.amount)))
-          except KeyError:
-            # If there is a KeyError, then the product is new to the order
-            added_products.append(OrderProduct(id=product.id, name=product.name, amount=product.amount))
-        if check_product_available(database, added_products):
-          # Update the database
-          add_products_to_order(database, added_products)
-          remove_products_from_order(database, removed_products)
-          new_products = [OrderProduct(id=product.id, name=product.name, amount=product.amount) for product in order.products]
-          _orders[order.id][Order.products] = new_products
-
-      # Update an order if it was paid for
-      if order.is_paid:
-        _orders[order.id][Order.is_paid] = order.is_paid
-      # Update an order if it shipped
-      if order.is_shipped:
-        _orders[order.id][Order.is_shipped] = order.is_shipped
-    update_order_db(database, _orders)
+    changed = set_order_columns_db(database, ids, values)
     save_db(database)
+    return [id for id in dict.fromkeys(ids) if id in changed]
   except KeyboardInterrupt:
     # Save the database if there is a KeyboardInterrupt
     save_db(database)
@@ -368,18 +1068,72 @@ def UpdateOrders(database, orders):
     # Allow the interrupt to propagate up 
     raise KeyboardInterrupt
 
-def GetOrdersByStatus(database, order_status):
-  filter = None
+def order_status_filter(order_status):
+  """Returns the filter of the orders with the given status
+  """
   if order_status.shipped and order_status.paid:
-    filter = (Order.is_shipped==True and Order.is_paid==True)
+    return and_(Order.is_shipped==True, Order.is_paid==True)
   elif order_status.shipped:
-    filter = Order.is_shipped==True
+    return Order.is_shipped==True
   elif order_status.paid:
-    filter = Order.is_paid==True
-  else:
-    filter = (Order.is_shipped==False and Order.is_paid==False)
-  orders = query_db(database, Order, filter)
-  return orders
+    return Order.is_paid==True
+  return and_(Order.is_shipped==False, Order.is_paid==False)
+
+def GetOrdersByStatus(database, order_status):
+  """Returns an iterator over the orders with the given status.
+  """
+  return iterate_db(database, Order, order_status_filter(order_status))
+
+def GetOrdersByStatusPage(database, order_status, page_size, page_token=b''):
+  """Returns a list of up to page_size orders with the given status sorted by ID, starting after the order whose ID
+  is page_token, and the page token of the next page, which is empty bytes on the last page.
+  """
+  orders = iterate_db(database, Order, page_filter(Order.id, order_status_filter(order_status), page_token),
+                      order_by=Order.id, limit=page_size + 1)
+  return split_page(orders, page_size)
+
+def GetOrdersByDateRange(database, start, end):
+  """Returns an iterator over the orders placed from the start date to the end date (inclusive) sorted by date,
+  which is empty if either date does not exist.
+  """
+  start, end = to_date(start), to_date(end)
+  if start is None or end is None:
+    return iter([])
+  return iterate_db(database, Order, Order.date.between(start, end), order_by=Order.date)
+
+def date_page_token(order):
+  """Returns the page token of the orders in a date range after an order: the ordinal of its date as 4 bytes followed
+  by its ID
+  """
+  return order.date.toordinal().to_bytes(4, 'big') + order.id
+
+def GetOrdersByDateRangePage(database, start, end, page_size, page_token=b''):
+  """Returns a list of up to page_size orders placed from the start date to the end date (inclusive) sorted by date
+  and then ID, starting after the order whose date_page_token is page_token, and the page token of the next page,
+  which is empty bytes on the last page.
+  """
+  start, end = to_date(start), to_date(end)
+  if start is None or end is None:
+    return [], b''
+  filter = Order.date.between(start, end)
+  if len(page_token) > 0:
+    date = datetime.date.fromordinal(int.from_bytes(page_token[:4], 'big'))
+    filter = and_(filter, tuple_(Order.date, Order.id) > tuple_(date, page_token[4:]))
+  orders = iterate_db(database, Order, filter, order_by=(Order.date, Order.id), limit=page_size + 1)
+  return split_page(orders, page_size, date_page_token)
+
+def GetOrders(database):
+  """Returns an iterator over every order.
+  """
+  return iterate_db(database, Order)
+
+def GetOrdersPage(database, page_size, page_token=b''):
+  """Returns a list of up to page_size orders sorted by ID, starting after the order whose ID is page_token, and the
+  page token of the next page, which is empty bytes on the last page.
+  """
+  orders = iterate_db(database, Order, page_filter(Order.id, None, page_token), order_by=Order.id,
+                      limit=page_size + 1)
+  return split_page(orders, page_size)
 
 
 
@@ -399,6 +1153,8 @@ def add_parsers_and_subparsers(parser):
 
   # Create a parser for GetProductsInStock which has no additional arguments
   subparsers.add_parser('get-products-in-stock', help='get-products-in-stock help')
+  subparsers.add_parser('get-products', help='get-products help')
+  subparsers.add_parser('get-orders', help='get-orders help')
 
 
   # Create a parser for GetProductsByID, GetProductsByName, GetProductsByManufacturer, and GetOrder
@@ -416,6 +1172,19 @@ def add_parsers_and_subparsers(parser):
   getOrderParse.add_argument('ids', nargs='+', help='The IDs of the orders being retrieved')
 
 
+  # Create a parser for SetOrderStatus with arguments for the IDs of the orders and their new status
+  setOrderStatusParse = subparsers.add_parser('set-order-status', help='set-order-status help')
+  setOrderStatusParse.add_argument('ids', nargs='+', help='The IDs of the orders being changed')
+  paidGroup = setOrderStatusParse.add_mutually_exclusive_group()
+  paidGroup.add_argument('--paid', dest='is_paid', action='store_const', const=True, help='Mark the orders as paid')
+  paidGroup.add_argument('--unpaid', dest='is_paid', action='store_const', const=False, help='Mark the orders as unpaid')
+  shippedGroup = setOrderStatusParse.add_mutually_exclusive_group()
+  shippedGroup.add_argument('--shipped', dest='is_shipped', action='store_const', const=True,
+                            help='Mark the orders as shipped')
+  shippedGroup.add_argument('--unshipped', dest='is_shipped', action='store_const', const=False,
+                            help='Mark the orders as unshipped')
+
+
   # Create a parser for GetOrdersByStatus with arguments for the status of the orders being retrieved
   getOrdersParse = subparsers.add_parser('get-orders-by-status', help='get-orders-by-status help')
   getOrdersParse.add_argument('-p', '--paid', type=bool, help='Whether the retrieved orders are paid or not, type an empty'
@@ -423,6 +1192,11 @@ def add_parsers_and_subparsers(parser):
   getOrdersParse.add_argument('-a', '--shipped', type=bool, help='Whether the retrieved orders are shipped or not, type an'
                                                                   'empty string for false and any other string for true')
 
+  # Create a parser for GetOrdersByDateRange with arguments for the first and last dates of the orders being retrieved
+  getOrdersByDateParse = subparsers.add_parser('get-orders-by-date-range', help='get-orders-by-date-range help')
+  getOrdersByDateParse.add_argument('start', help='The first date of the orders being retrieved (MM/DD/YYYY)')
+  getOrdersByDateParse.add_argument('end', help='The last date of the orders being retrieved (MM/DD/YYYY)')
+
 
   # Create a parser for AddProducts and UpdateProducts which each have arguments for products
   addProductParse = subparsers.add_parser('add-products', help='add-products help')
@@ -432,7 +1206,22 @@ def add_parsers_and_subparsers(parser):
   updateProductParse = subparsers.add_parser('update-products', help='update-products help')
   # At least one of name and ID should be passed; nothing will happen if neither is passed
   updateProductParse.add_argument('products', nargs='+', help='The products being updated (id,name,description,manufacturer,'
-                                                           'wholesale_cost,sale_cost,amount); only id or name is required')
+                                                           'wholesale_cost,sale_cost,amount,version); only id or name is required')
+  updateProductParse.add_argument('--check-version', action='store_true', help='Only update products that are still at '
+                                                                             'the version that was passed')
+
+
+  # Create parsers for StreamAddProducts and StreamCreateOrders, which import a file with a product or order per line
+  importProductsParse = subparsers.add_parser('import-products', help='import-products help')
+  importProductsParse.add_argument('file', help='A file with a product being added on each line in the same form as '
+                                                'add-products')
+
+  importOrdersParse = subparsers.add_parser('import-orders', help='import-orders help')
+  importOrdersParse.add_argument('file', help='A file with an order being created on each line in the same form as '
+                                              'create-orders')
+  importOrdersParse.add_argument('--policy', default=inventory_system_allocation.DEFAULT_POLICY,
+                                 choices=list(inventory_system_allocation.POLICIES),
+                                 help='How stock is allocated to the orders when there is not enough for all of them.')
 
 
   # Create a parser for CreateOrder and UpdateOrder which each have arguments for a order
@@ -443,6 +1232,9 @@ def add_parsers_and_subparsers(parser):
                                                            'and date should be of the form (MM/DD/YYYY).\nEx. (,2/2/1978'
                                                            ',,t,id_1;prod1;1,id_2;prod2;2)\nNote that for is_paid and is_shipped'
                                                            ' a non-empty string results in True and False otherwise.')
+  createOrderParse.add_argument('--policy', default=inventory_system_allocation.DEFAULT_POLICY,
+                                choices=list(inventory_system_allocation.POLICIES),
+                                help='How stock is allocated to the orders when there is not enough for all of them.')
 
   updateOrderParse = subparsers.add_parser('update-orders', help='update-orders help')
   updateOrderParse.add_argument('orders', nargs='+', help='The orders being updated (id,destination,date,is_paid,'
@@ -464,6 +1256,20 @@ def string_to_date(string):
     return None
   return OrderDate(month=date[0], day=date[1], year=date[2])
 
+def string_to_id(string):
+  """Converts the text form of a UUID to the 16 bytes that the inventory system uses as an ID, or to empty bytes
+  if the string is not a UUID
+  """
+  try:
+    return uuid.UUID(string.strip()).bytes
+  except (AttributeError, ValueError):
+    return b''
+
+def id_to_string(id):
+  """Converts the 16 bytes of an ID to the text form of a UUID
+  """
+  return str(uuid.UUID(bytes=id))
+
 def products_from_arg_list(arg_list, spl=','):
   products = []
   _product = '' # Used if an exception occurs (so that the user knows the first product that failed)
@@ -479,7 +1285,7 @@ def products_from_arg_list(arg_list, spl=','):
       for __product in products:
         if __product.id == product[0] or __product.name == product[1]:
           continue
-      products.append(OrderProduct(id=product[0], name=product[1], amount=product[2]))
+      products.append(OrderLine(id=product[0], name=product[1], amount=product[2]))
   except:
     return None
   return products
@@ -545,9 +1351,10 @@ def get_products_to_update(products):
     if _product is None:
       _product = {'name':'', 'description':'', 'manufacturer':'', 'wholesale_cost':0.0, 'sale_cost':0.0, 'amount':0}
     else:
+      version = int(product[7]) if len(product) > 7 and product[7].isdigit() else 0
       _products.append(Product(id=product[0], name=_product['name'], description=_product['description'],
                                manufacturer=_product['manufacturer'], wholesale_cost=_product['wholesale_cost'],
-                               sale_cost=_product['sale_cost'], amount=_product['amount']))
+                               sale_cost=_product['sale_cost'], amount=_product['amount'], version=version))
   return _products
 
 def get_order_from_list(order):
@@ -0,0 +1,120 @@
+"""Allocates the stock of products to a batch of orders with NumPy arrays. The lines of the orders are passed as three
+arrays of the same length: the index of the order of each line (orders are numbered in the order they were received,
+so the array does not decrease), the index of the product of each line into the stock array, and the amount of the
+product requested by each line. Every policy returns an array with the amount allocated to each line.
+
+Author: Riley Kirkpatrick
+"""
+
+import numpy as np
+
+
+def group_cumsum(groups, values):
+  """Returns the running total of the values within each group, in the order the values were passed
+  """
+  order = np.argsort(groups, kind='stable')
+  sorted_groups, sorted_values = groups[order], values[order]
+  totals = np.cumsum(sorted_values)
+  # The total of the values before the first value of each group is subtracted from every value of the group
+  starts = np.ones(len(order), dtype=bool)
+  starts[1:] = sorted_groups[1:] != sorted_groups[:-1]
+  offsets = (totals - sorted_values)[starts]
+  cumsum = np.empty_like(totals)
+  cumsum[order] = totals - offsets[np.cumsum(starts) - 1]
+  return cumsum
+
+def product_totals(products, amounts, number_of_products):
+  """Returns the total amount requested of each product
+  """
+  totals = np.zeros(number_of_products, dtype=amounts.dtype)
+  np.add.at(totals, products, amounts)
+  return totals
+
+def allocate_fifo(stock, orders, products, amounts):
+  """Allocates every line of an order in the order the orders were received; an order that does not fit in the stock
+  left by the orders before it is not allocated anything, but the orders after it may still be allocated
+  """
+  # An order whose lines fit even if every order before it is allocated is allocated no matter which of those orders
+  # are rejected, so only the orders with a line past the stock of its product are checked one at a time
+  unsafe = np.zeros(orders[-1] + 1, dtype=bool)
+  unsafe[orders[group_cumsum(products, amounts) > stock[products]]] = True
+  allocated = np.where(unsafe[orders], 0, amounts)
+  lines = np.flatnonzero(unsafe[orders])
+  # The stock taken from the product of each of those lines by the orders before it that are always allocated
+  taken_before = (group_cumsum(products, allocated) - allocated)[lines].tolist()
+  line_orders, line_products = orders[lines].tolist(), products[lines].tolist()
+  line_amounts, stock_left = amounts[lines].tolist(), stock.tolist()
+  accepted = []
+  taken = {} # The stock taken from each product by the checked orders that were allocated
+  start = 0
+  while start < len(lines):
+    end, requested, fits = start, {}, True
+    while end < len(lines) and line_orders[end] == line_orders[start]:
+      product = line_products[end]
+      requested[product] = requested.get(product, 0) + line_amounts[end]
+      fits = fits and taken_before[end] + taken.get(product, 0) + requested[product] <= stock_left[product]
+      end += 1
+    if fits:
+      for product, amount in requested.items():
+        taken[product] = taken.get(product, 0) + amount
+      accepted.extend(range(start, end))
+    start = end
+  accepted = lines[accepted]
+  allocated[accepted] = amounts[accepted]
+  return allocated
+
+def allocate_all_or_nothing(stock, orders, products, amounts):
+  """Allocates every line of every order if there is enough stock for the whole batch and nothing otherwise
+  """
+  if (product_totals(products, amounts, len(stock)) <= stock).all():
+    return amounts.copy()
+  return np.zeros_like(amounts)
+
+def allocate_proportional(stock, orders, products, amounts):
+  """Allocates each line its share of the stock of its product in proportion to the amount it requested when more is
+  requested than what is in stock; the units left over from rounding the shares down go to the lines received first
+  """
+  demand = product_totals(products, amounts, len(stock))
+  supply = np.minimum(stock, demand)
+  # Products that are not requested are divided by one instead of zero since they have no lines
+  shares = amounts * supply[products]
+  divisor = np.maximum(demand, 1)[products]
+  allocated = shares // divisor
+  leftover = supply - product_totals(products, allocated, len(stock))
+  rounded_down = (shares % divisor != 0).astype(np.int64)
+  allocated += rounded_down * (group_cumsum(products, rounded_down) <= leftover[products])
+  return allocated
+
+def allocate_partial_fill(stock, orders, products, amounts):
+  """Allocates each line as much of what it requested as is left after the lines received before it, so the last
+  orders to receive a product that runs out get part of what they requested or none of it
+  """
+  requested_before = group_cumsum(products, amounts) - amounts
+  return np.clip(stock[products] - requested_before, 0, amounts)
+
+def integer_type(stock, amounts):
+  """Returns int64 if no total or proportional share of the amounts can overflow it and object otherwise, so the
+  policies work on Python integers, which are exact at any size, when the amounts are too large
+  """
+  # The total requested of a product is at most the total requested by the batch, and a share is an amount times the
+  # smaller of the stock of its product and the total requested of it
+  largest = max(amounts.max(), 1)
+  total = len(amounts) * largest
+  return np.int64 if max(total, largest * min(total, stock.max(initial=0))) < 2**63 else object
+
+POLICIES = {'fifo': allocate_fifo, 'all-or-nothing': allocate_all_or_nothing, 'proportional': allocate_proportional,
+            'partial-fill': allocate_partial_fill}
+DEFAULT_POLICY = 'fifo'
+
+def allocate(stock, orders, products, amounts, policy=DEFAULT_POLICY):
+  """Allocates the stock of products to the lines of a batch of orders with the given policy and returns the amount
+  allocated to each line; the arguments may be lists or arrays, and a line with no amount is allocated nothing
+  """
+  orders, products = np.asarray(orders, dtype=np.int64), np.asarray(products, dtype=np.int64)
+  # The amounts are read as Python integers first since requests are not bounded and a merged line may not fit int64
+  stock = np.maximum(np.asarray(stock, dtype=object), 0)
+  amounts = np.maximum(np.asarray(amounts, dtype=object), 0)
+  if len(amounts) == 0:
+    return amounts.astype(np.int64)
+  dtype = integer_type(stock, amounts)
+  return POLICIES[policy](stock.astype(dtype), orders, products, amounts.astype(dtype)).astype(np.int64)
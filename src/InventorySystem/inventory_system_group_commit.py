@@ -0,0 +1,125 @@
+"""Group commit for the writes of the inventory system. Writes are run one after another by a writer thread that has the
+only connection that writes to the database, and the writes that are waiting for it, or that arrive within a short
+window of each other, are run in a single transaction that is committed once, so they share one sync to disk.
+Every write runs in its own savepoint, so a write that fails is rolled back without the rest of its group and only its
+caller gets the error, and no caller gets its result before the group is committed.
+
+Author: Riley Kirkpatrick
+"""
+
+import inventory_system
+import queue
+import threading
+import time
+
+GROUP_COMMIT_WINDOW = 0.002 # How many seconds the writer waits for more writes after the first write of a group
+GROUP_COMMIT_SIZE = 256 # The most writes that are committed in one transaction
+
+
+class GroupWrite():
+  """A write waiting to be committed with its group, which holds the result of the write or the exception it raised
+  once the group is committed
+  """
+
+  def __init__(self, write):
+    self.write = write
+    self.result = None
+    self.error = None
+    self.done = threading.Event()
+
+
+class GroupCommitter():
+  """Runs writes in the session of a writer thread and commits the writes that arrive within window seconds of the
+  first write of a group together
+  """
+
+  def __init__(self, database_path, storage_profile=inventory_system.DEFAULT_STORAGE_PROFILE,
+               window=GROUP_COMMIT_WINDOW, size=GROUP_COMMIT_SIZE):
+    self.window = window
+    self.size = size
+    self.writes = queue.Queue()
+    self.writer = threading.Thread(target=self.write, args=(database_path, storage_profile), daemon=True)
+    self.writer.start()
+
+  def run(self, write):
+    """Runs a function that is passed the writer's database session and returns the result of the function once it
+    is committed, or raises the exception the function raised, in which case nothing it wrote is committed
+    """
+    return self.wait(self.submit(write))
+
+  def submit(self, write):
+    """Queues a function like run without waiting for it and returns its GroupWrite, so the caller can keep working
+    while it is written
+    """
+    group_write = GroupWrite(write)
+    self.writes.put(group_write)
+    return group_write
+
+  def wait(self, group_write):
+    """Waits for a write that was submitted to be committed and returns its result like run
+    """
+    group_write.done.wait()
+    if not group_write.error is None:
+      raise group_write.error
+    return group_write.result
+
+  def close(self):
+    """Commits every write that is queued and stops the writer thread
+    """
+    self.writes.put(None)
+    self.writer.join()
+
+  def next_group(self):
+    """Waits for a write and returns it along with the writes that are queued within the window after it
+    """
+    group = [self.writes.get()]
+    deadline = time.monotonic() + self.window
+    while len(group) < self.size and not None in group:
+      try:
+        group.append(self.writes.get(timeout=max(deadline - time.monotonic(), 0)))
+      except queue.Empty:
+        break
+    return group
+
+  def run_in_savepoint(self, database, group_write):
+    """Runs a write in a savepoint that is rolled back if the write fails, including what the write saved; while the
+    write runs, save_db and rollback_db save and roll back a savepoint inside it
+    """
+    savepoint = database.begin_nested()
+    database.info['savepoint'] = database.begin_nested()
+    try:
+      group_write.result, group_write.error = group_write.write(database), None
+      database.info['savepoint'].commit()
+      savepoint.commit()
+    except Exception as e:
+      savepoint.rollback()
+      group_write.result, group_write.error = None, e
+    finally:
+      del database.info['savepoint']
+
+  def write(self, database_path, storage_profile):
+    """Runs the queued writes in the order they were queued and commits each group of writes in one transaction
+    """
+    database = inventory_system.get_dbsession(database_path, storage_profile, writer=True)
+    stop = False
+    while not stop:
+      group = self.next_group()
+      stop = None in group
+      group = [group_write for group_write in group if not group_write is None]
+      try:
+        for group_write in group:
+          self.run_in_savepoint(database, group_write)
+        inventory_system.save_db(database)
+      except Exception:
+        database.rollback()
+        # The writes are run and committed one at a time so that only a write whose commit fails gets the error
+        for group_write in group:
+          try:
+            self.run_in_savepoint(database, group_write)
+            inventory_system.save_db(database)
+          except Exception as e:
+            database.rollback()
+            group_write.result, group_write.error = None, e
+      for group_write in group:
+        group_write.done.set()
+    database.close()
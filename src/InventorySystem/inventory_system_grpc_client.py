@@ -11,15 +11,18 @@ import inventory_system_pb2
 import inventory_system_pb2_grpc
 import sys
 
+IMPORT_CHUNK_SIZE = 500 # The most products or orders in each message the client streams when importing a file
+
 
 def to_inventory_system_products(products):
     """Converts a list of products to a list of inventory_system_pb2.Product objects.
     """
     _products = []
     for product in products:
-        _products.append(inventory_system_pb2.Product(id=product.id, name=product.name, description=product.description,
+        _products.append(inventory_system_pb2.Product(id=inventory_system.string_to_id(product.id), name=product.name, description=product.description,
                                                   manufacturer=product.manufacturer, wholesale_cost=product.wholesale_cost,
-                                                  sale_cost=product.sale_cost, amount=product.amount))
+                                                  sale_cost=product.sale_cost, amount=product.amount,
+                                                  version=product.version or 0))
     return _products
 
 def to_inventory_system_orders(orders):
@@ -28,12 +31,35 @@ def to_inventory_system_orders(orders):
     _orders = []
     for order in orders:
         if order.date == '':
-            order.date = inventory_system_pb2.Date(month=-1, day=-1, year=-1)
-        products = [inventory_system_pb2.Product(id=product.id, name=product.name, amount=product.amount) for product in order.products]
-        _orders.append(inventory_system_pb2.Order(id=order.id, destination=order.destination, date=order.date,
+            date = inventory_system_pb2.Date(month=-1, day=-1, year=-1)
+        else:
+            date = inventory_system_pb2.Date(month=order.date.month, day=order.date.day, year=order.date.year)
+        products = [inventory_system_pb2.Product(id=inventory_system.string_to_id(product.id), name=product.name,
+                                                 amount=product.amount) for product in order.products]
+        _orders.append(inventory_system_pb2.Order(id=inventory_system.string_to_id(order.id), destination=order.destination, date=date,
                                               is_paid=order.is_paid, is_shipped=order.is_shipped, products=products))
     return _orders
 
+def print_stream(messages, field, empty_message):
+    """Prints the products or orders (given by field) of each message of a streaming RPC as the messages arrive, or
+    empty_message if there are none.
+    """
+    printed = False
+    for message in messages:
+        for value in getattr(message, field):
+            print(value)
+            printed = True
+    if not printed:
+        print(empty_message)
+
+def read_import(path, parse, to_messages):
+    """Yields lists of up to IMPORT_CHUNK_SIZE messages from a file with a product or order on each line, which are
+    parsed with parse and converted with to_messages, so only one chunk of the file is held in memory at once.
+    """
+    with open(path) as file:
+        for lines in inventory_system.iterate_chunks((line for line in file if line.strip()), IMPORT_CHUNK_SIZE):
+            yield to_messages(parse(lines))
+
 def main():
     # Create an argument parser with a required ip argument and subparsers for each function that
     # interacts with the inventory system
@@ -52,14 +78,12 @@ def main():
         try:
             # Run the command that is passed as an argument to the program
             if args.command == 'get-products-in-stock':
-                products = stub.GetProductsInStock(inventory_system_pb2.Empty())
-                if len(products.products) > 0:
-                    for product in products.products:
-                        print(product)
-                else:
-                    print('There are no products in stock.')
+                print_stream(stub.StreamProductsInStock(inventory_system_pb2.Empty()), 'products',
+                             'There are no products in stock.')
+            elif args.command == 'get-products':
+                print_stream(stub.GetProducts(inventory_system_pb2.Empty()), 'products', 'There are no products.')
             elif args.command == 'get-products-by-id':
-                products = stub.GetProductsByID(inventory_system_pb2.IDs(ids=args.ids))
+                products = stub.GetProductsByID(inventory_system_pb2.IDs(ids=[inventory_system.string_to_id(id) for id in args.ids]))
                 if len(products.products) > 0:
                     for product in products.products:
                         print(product)
@@ -72,46 +96,93 @@ def main():
                 else:
                     print('There are no products of the given names.')
             elif args.command == 'get-products-by-manufacturer':
-                products = stub.GetProductsByManufacturer(inventory_system_pb2.Manufacturer(manufacturer=args.manufacturer))
-                if len(products.products) > 0:
-                    for product in products.products: print(product)
-                else:
-                    print('There are no products with the given manufacturer.')
+                print_stream(stub.StreamProductsByManufacturer(inventory_system_pb2.Manufacturer(manufacturer=args.manufacturer)),
+                             'products', 'There are no products with the given manufacturer.')
             elif args.command == 'get-orders-by-id':
-                orders = stub.GetOrdersByID(inventory_system_pb2.IDs(ids=args.ids))
+                orders = stub.GetOrdersByID(inventory_system_pb2.IDs(ids=[inventory_system.string_to_id(id) for id in args.ids]))
                 if len(orders.orders) > 0:
                     for order in orders.orders: print(order)
                 else:
                     print('There are no orders with the given IDs.')
             elif args.command == 'get-orders-by-status':
-                orders = stub.GetOrdersByStatus(inventory_system_pb2.OrderStatus(paid=args.paid, shipped=args.shipped))
-                if len(order.orders) > 0:
-                    for order in orders.orders: print(order)
-                else:
-                    print('There are no orders with the given status.')
+                print_stream(stub.StreamOrdersByStatus(inventory_system_pb2.OrderStatus(paid=args.paid, shipped=args.shipped)),
+                             'orders', 'There are no orders with the given status.')
+            elif args.command == 'get-orders':
+                print_stream(stub.GetOrders(inventory_system_pb2.Empty()), 'orders', 'There are no orders.')
+            elif args.command == 'get-orders-by-date-range':
+                start, end = inventory_system.string_to_date(args.start), inventory_system.string_to_date(args.end)
+                if start is None or end is None:
+                    print('Dates should be of the form (MM/DD/YYYY).')
+                    return
+                orders = stub.StreamOrdersByDateRange(inventory_system_pb2.DateRange(
+                    start=inventory_system_pb2.Date(year=start.year, month=start.month, day=start.day),
+                    end=inventory_system_pb2.Date(year=end.year, month=end.month, day=end.day)))
+                print_stream(orders, 'orders', 'There are no orders in the given date range.')
             elif args.command == 'add-products':
                 products = to_inventory_system_products(inventory_system.get_products_to_add(args.products))
                 ids = stub.AddProducts(inventory_system_pb2.Products(products=products))
-                if len(ids.ids) > 0:
+                if any(len(id) > 0 for id in ids.ids):
                     print('Product IDs:')
-                    for id in ids.ids: print(id)
+                    for product, id in zip(products, ids.ids):
+                        if len(id) > 0:
+                            print(product.name + ': ' + inventory_system.id_to_string(id))
+                        else:
+                            print(product.name + ': not added, a product with this name already exists')
                 else:
                     print('Product creation was not successful. It may already exist. Try the get-products-by-* commands.')
+            elif args.command == 'import-products':
+                names = []
+                def requests():
+                    for products in read_import(args.file, inventory_system.get_products_to_add,
+                                                to_inventory_system_products):
+                        names.extend(product.name for product in products)
+                        yield inventory_system_pb2.Products(products=products)
+                summary = stub.StreamAddProducts(requests())
+                for name, id in zip(names, summary.ids):
+                    if len(id) == 0:
+                        print(name + ': not added, a product with this name already exists')
+                print('Added %d products, %d were not added.' % (summary.added, summary.rejected))
             elif args.command == 'update-products':
                 products = to_inventory_system_products(inventory_system.get_products_to_update(args.products))
-                stub.UpdateProducts(inventory_system_pb2.Products(products=products))
+                ids = stub.UpdateProducts(inventory_system_pb2.Products(products=products,
+                                                                        check_version=args.check_version))
+                for product, id in zip(products, ids.ids):
+                    if len(id) == 0:
+                        print((inventory_system.id_to_string(product.id) if product.id else product.name) +
+                              ': not updated, the product was not found or it is not at the version that was passed')
             elif args.command == 'create-orders':
                 orders = to_inventory_system_orders(inventory_system.get_orders_to_create(args.orders))
-                ids = stub.CreateOrders(inventory_system_pb2.orders(orders=orders))
-                
-                if len(ids.ids) == 0:
-                    print('Order creation was not successful. They may already exist. Try the get-orders command.')
-                else:
-                    print('Order IDs:', ids.ids)
-                    for id in ids.ids: print(id)
+                policy = inventory_system_pb2.AllocationPolicy.Value(args.policy.upper().replace('-', '_'))
+                orders = stub.AllocateOrders(inventory_system_pb2.Orders(orders=orders, policy=policy)).orders
+                print('Order IDs:')
+                for i, order in enumerate(orders):
+                    if len(order.id) > 0:
+                        print(str(i) + ': ' + inventory_system.id_to_string(order.id) + ' (' +
+                              ', '.join(product.name + ': ' + str(product.amount) for product in order.products) + ')')
+                    else:
+                        print(str(i) + ': not created, there is not enough stock for its products')
+            elif args.command == 'import-orders':
+                policy = inventory_system_pb2.AllocationPolicy.Value(args.policy.upper().replace('-', '_'))
+                summary = stub.StreamCreateOrders(inventory_system_pb2.Orders(orders=orders, policy=policy) for orders in
+                                                  read_import(args.file, inventory_system.get_orders_to_create,
+                                                              to_inventory_system_orders))
+                for i, id in enumerate(summary.ids):
+                    if len(id) == 0:
+                        print(str(i) + ': not created, there is not enough stock for its products')
+                print('Created %d orders, %d were not created.' % (summary.added, summary.rejected))
+            elif args.command == 'set-order-status':
+                status = {name: value for name, value in (('is_paid', args.is_paid), ('is_shipped', args.is_shipped))
+                          if not value is None}
+                ids = stub.SetOrderStatus(inventory_system_pb2.OrderStatusChange(
+                    ids=[inventory_system.string_to_id(id) for id in args.ids], **status))
+                print('Changed ' + str(len(ids.ids)) + ' of ' + str(len(args.ids)) + ' orders')
             elif args.command == 'update-orders':
                 orders = to_inventory_system_orders(inventory_system.get_orders_to_update(args.orders))
-                stub.UpdateOrders(inventory_system_pb2.Orders(orders=orders))
+                ids = stub.UpdateOrders(inventory_system_pb2.Orders(orders=orders))
+                for order, id in zip(orders, ids.ids):
+                    if len(id) == 0:
+                        print(inventory_system.id_to_string(order.id) + ': not updated, the order was not found or '
+                              'there is not enough stock for its products')
         except grpc.RpcError as e:
             print(e.details())
 
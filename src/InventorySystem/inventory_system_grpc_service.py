@@ -5,34 +5,181 @@ Author: Riley Kirkpatrick
 """
 
 import argparse
+import asyncio
+import contextlib
+import functools
 import grpc
 import inventory_system
+import inventory_system_group_commit
+import inventory_system_ledger
 import inventory_system_pb2
 import inventory_system_pb2_grpc
+import itertools
+import multiprocessing
 import os
+import signal
 import sys
 import uuid
 from concurrent import futures
+from multiprocessing import connection
 from os import path
 
+WORKERS = 16 # The default number of requests that are served at a time, each of which may hold a read connection
+STREAM_CHUNK_SIZE = 500 # The most products or orders in each message of a streaming RPC
+MAX_PAGE_SIZE = 1000 # The most products or orders in a page of an RPC that is paginated
+INGEST_CHUNK_SIZE = 500 # The most products or orders of a client-streaming RPC that are written together
+
+
+def releases_session(rpc):
+  """Decorates an RPC of InventorySystem so that its database session is closed when the RPC returns, which releases
+  every object loaded during the RPC instead of keeping them for the life of the server
+  """
+  @functools.wraps(rpc)
+  def wrapper(self, request, context):
+    try:
+      return rpc(self, request, context)
+    finally:
+      self.database.remove()
+  return wrapper
+
+def streams_pages(read_page):
+  """Decorates a method of InventorySystem that reads a page of up to STREAM_CHUNK_SIZE products or orders after a page
+  token, as read_page(self, request, page_token), and returns a message and the page token of the next page; the
+  decorated method is a streaming RPC that sends a message for each page, and its session is closed once the last
+  message is sent. AsyncInventorySystem reads each page with read_page in its own session instead.
+  """
+  @functools.wraps(read_page)
+  def rpc(self, request, context):
+    self.wait_for_writes()
+    try:
+      page_token = b''
+      while True:
+        message, page_token = read_page(self, request, page_token)
+        # Only the first page is empty, when there is nothing to stream
+        if message.ByteSize() > 0:
+          yield message
+        if len(page_token) == 0:
+          return
+    finally:
+      self.database.remove()
+  rpc.read_page = read_page
+  return rpc
+
+def ingests(message_items, uses_ledger=False):
+  """Returns a decorator for a method of InventorySystem that writes a chunk of products or orders, as
+  write_chunk(self, database, chunk), and returns the ID of each item of the chunk; the decorated method is a
+  client-streaming RPC that writes the items of its messages, message_items(message), in chunks of up to
+  INGEST_CHUNK_SIZE items like write_chunks and returns an IngestSummary. AsyncInventorySystem receives the messages
+  on the event loop and writes each chunk with write_chunk instead.
+  """
+  def decorator(write_chunk):
+    @functools.wraps(write_chunk)
+    def rpc(self, request_iterator, context):
+      try:
+        items = (item for message in request_iterator for item in message_items(message))
+        return ingest_summary(self.write_chunks(context, items, functools.partial(write_chunk, self),
+                                                INGEST_CHUNK_SIZE, uses_ledger))
+      finally:
+        self.database.remove()
+    rpc.message_items, rpc.write_chunk, rpc.uses_ledger = message_items, write_chunk, uses_ledger
+    return rpc
+  return decorator
+
+def ingest_summary(ids):
+  """Returns the IngestSummary of a client-streaming RPC that wrote items with the given IDs
+  """
+  added = sum(len(id) > 0 for id in ids)
+  return inventory_system_pb2.IngestSummary(ids=ids, added=added, rejected=len(ids) - added)
+
+
+def prepare_database(database_path, storage_profile=inventory_system.DEFAULT_STORAGE_PROFILE):
+  """Creates the database if it does not exist, otherwise brings an older database up to the current schema
+  """
+  if not path.exists(database_path):
+    inventory_system.create_inventory_system_db(database_path, storage_profile)
+  else:
+    inventory_system.upgrade_inventory_system_db(database_path)
+
 
 class InventorySystem(inventory_system_pb2_grpc.InventorySystemServicer):
   """A service that allows you to keep track of an inventory of products and the orders for those products
   """
 
-  def __init__(self, database_path):
-    # Creates the database if it does not exist
-    if not path.exists(database_path):
-      inventory_system.create_inventory_system_db(database_path)
-    # Creates the connection to the database
-    self.database = inventory_system.get_dbsession(database_path)
+  def __init__(self, database_path, storage_profile=inventory_system.DEFAULT_STORAGE_PROFILE, stock_ledger=False,
+               group_commit_window=None, workers=WORKERS):
+    prepare_database(database_path, storage_profile)
+    # Creates a read only connection to the database for each worker; each RPC gets a new session with its own
+    # transaction that is closed when the RPC returns, so RPCs read at the same time without waiting for writes
+    self.database = inventory_system.get_scoped_dbsession(database_path, storage_profile, read_only=True,
+                                                          connections=workers)
+    # Orders reserve stock in memory and are written to the database by the ledger's writer thread
+    self.ledger = inventory_system_ledger.StockLedger(database_path, storage_profile) if stock_ledger else None
+    # Every other write is run by the writer thread, which has the only connection that writes to the database and
+    # commits the writes that arrive within the window of each other together
+    self.writer = inventory_system_group_commit.GroupCommitter(database_path, storage_profile,
+                                                               group_commit_window or 0)
+
+  def wait_for_writes(self):
+    """Waits for the writes queued by the stock ledger so that reads see every order that was placed
+    """
+    if not self.ledger is None:
+      self.ledger.flush()
+
+  def exclusive_stock(self):
+    """Returns a context manager for changes to the stock that do not go through the stock ledger
+    """
+    if self.ledger is None:
+      return contextlib.nullcontext()
+    return self.ledger.exclusive()
+
+  def write(self, context, write, uses_ledger=False):
+    """Runs a function that is passed a database session and writes to the database in the writer thread, and returns
+    its result; a failure only fails the current RPC. Writes that go through the stock ledger only read the database
+    and are written by the ledger's writer thread, so they are run with the current RPC's session.
+    """
+    if uses_ledger and not self.ledger is None:
+      return write(self.database)
+    return self.wait_for_write(context, self.writer.submit(write))
+
+  def wait_for_write(self, context, group_write):
+    """Waits for a write that was submitted to the writer thread to be committed and returns its result; a failure
+    only fails the current RPC
+    """
+    try:
+      return self.writer.wait(group_write)
+    except Exception as e:
+      context.abort(grpc.StatusCode.INTERNAL, 'The write failed: ' + str(e))
+
+  def write_chunks(self, context, items, write, chunk_size, uses_ledger=False):
+    """Writes items in chunks of up to chunk_size items with write(database, chunk), which returns the ID of each item
+    of the chunk, and returns the IDs. Each chunk is a write of its own that is committed before the next chunk is
+    written, so a large write does not hold the writer's transaction open, and the next chunk is read from items while
+    a chunk is written; the chunks that were committed stay committed if a later chunk fails.
+    """
+    ids, group_write = [], None
+    for chunk in inventory_system.iterate_chunks(items, chunk_size):
+      if uses_ledger and not self.ledger is None:
+        ids.extend(write(self.database, chunk))
+        continue
+      if not group_write is None:
+        ids.extend(self.wait_for_write(context, group_write))
+      group_write = self.writer.submit(lambda database, chunk=chunk: write(database, chunk))
+    if not group_write is None:
+      ids.extend(self.wait_for_write(context, group_write))
+    return ids
 
-  def to_inventory_system_product(self, product):
-    """Convert a product object to an inventory_system.Product object
+  def close(self):
+    """Writes everything queued by the stock ledger and the writer thread to the database
     """
-    return inventory_system_pb2.Product(id=product.id, name=product.name, description=product.description,
-                                    manufacturer=product.manufacturer, wholesale_cost=product.wholesale_cost,
-                                    sale_cost=product.sale_cost, amount=product.amount)
+    if not self.ledger is None:
+      self.ledger.close()
+    self.writer.close()
+
+  def to_inventory_system_product(self, row):
+    """Convert a row of the product table to an inventory_system.Product object; the columns of the table have the
+    same names as the fields of the message
+    """
+    return inventory_system_pb2.Product(**row._mapping)
   
   def to_inventory_system_order(self, order):
     date = inventory_system_pb2.Date(year=order.date.year, month=order.date.month, day=order.date.day)
@@ -40,105 +187,444 @@ class InventorySystem(inventory_system_pb2_grpc.InventorySystemServicer):
     return inventory_system_pb2.Order(id=order.id, destination=order.destination, date=date, is_paid=order.is_paid,
                                   is_shipped=order.is_shipped, products=products)
 
+  def to_allocation_policy(self, policy):
+    """Convert an inventory_system.AllocationPolicy value to the name of the policy in inventory_system_allocation
+    """
+    return inventory_system_pb2.AllocationPolicy.Name(policy).lower().replace('_', '-')
+
+  def products_page(self, rows, page_token):
+    """Returns the Products message of a page of product rows and the page token of the next page
+    """
+    return inventory_system_pb2.Products(products=[self.to_inventory_system_product(row) for row in rows]), page_token
+
+  def orders_page(self, orders, page_token):
+    """Returns the Orders message of a page of orders and the page token of the next page
+    """
+    return inventory_system_pb2.Orders(orders=[self.to_inventory_system_order(order) for order in orders]), page_token
+
+  def page_size(self, request, context):
+    """Returns the page size of a request capped at MAX_PAGE_SIZE, or 0 if the request is not paginated
+    """
+    if request.page_size < 0:
+      context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'The page size cannot be negative')
+    return min(request.page_size, MAX_PAGE_SIZE)
+
   def set_status_code_not_found(self, context, details=''):
     """Sets the status code if a product or order is not found
     """
     context.set_code(grpc.StatusCode.NOT_FOUND)
     context.set_details(details)
 
+  @releases_session
   def GetProductsByID(self, request, context):
     """Gets products by their IDs
     """
-    products = inventory_system.GetProductsByID(self.database, request.ids)
+    self.wait_for_writes()
+    products = [self.to_inventory_system_product(row)
+                for row in inventory_system.GetProductsByID(self.database, request.ids)]
     if len(products) == 0:
-      self.set_status_code_not_found(context, 'No products were found for the given IDs ' + str(request.ids))
-    return inventory_system_pb2.Products(products=[self.to_inventory_system_product(product) for product in products])
+      self.set_status_code_not_found(context, 'No products were found for the given IDs ' +
+                                     str([id.hex() for id in request.ids]))
+    return inventory_system_pb2.Products(products=products)
 
+  @releases_session
   def GetProductsByName(self, request, context):
     """Gets a product by its name 
     """
-    products = inventory_system.GetProductsByName(self.database, request.names)
+    self.wait_for_writes()
+    products = [self.to_inventory_system_product(row)
+                for row in inventory_system.GetProductsByName(self.database, request.names)]
     if len(products) == 0:
       self.set_status_code_not_found(context, 'No products were found for the given names ' + str(request.names))
-    return inventory_system_pb2.Products(products=[self.to_inventory_system_product(product) for product in products])
+    return inventory_system_pb2.Products(products=products)
 
+  @releases_session
   def GetProductsByManufacturer(self, request, context):
-    """Retrieves all products from a given manufacturer 
+    """Retrieves all products from a given manufacturer, or a page of them sorted by ID if page_size is set
     """
-    products = inventory_system.GetProductsByManufacturer(self.database, request.manufacturer)
+    self.wait_for_writes()
+    page_size, next_page_token = self.page_size(request, context), b''
+    if page_size > 0:
+      rows, next_page_token = inventory_system.GetProductsByManufacturerPage(self.database, request.manufacturer,
+                                                                             page_size, request.page_token)
+    else:
+      rows = inventory_system.GetProductsByManufacturer(self.database, request.manufacturer)
+    products = [self.to_inventory_system_product(row) for row in rows]
     if len(products) == 0:
       self.set_status_code_not_found(context, 'No products were found for the manufacturer ' + str(request.manufacturer))
-    return inventory_system_pb2.Products(products=[self.to_inventory_system_product(product) for product in products])
+    return inventory_system_pb2.Products(products=products, next_page_token=next_page_token)
+
+  @streams_pages
+  def StreamProductsByManufacturer(self, request, page_token):
+    """Streams the products from a given manufacturer like GetProductsByManufacturer, a chunk of products
+    per message
+    """
+    return self.products_page(*inventory_system.GetProductsByManufacturerPage(
+      self.database, request.manufacturer, STREAM_CHUNK_SIZE, page_token))
 
+  @releases_session
   def AddProducts(self, request, context):
     """Adds new products that do not have the same names as previous products and the IDs are
-    assigned by the server; returns the IDs of the products if they were added successfully
-    otherwise empty list 
+    assigned by the server; returns the ID of each product in the order they were sent, or empty
+    bytes for a product that was not added
+    """
+    return inventory_system_pb2.IDs(ids=self.write_chunks(context, request.products, inventory_system.AddProducts,
+                                                          inventory_system.INSERT_CHUNK_SIZE))
+
+  @ingests(lambda request: request.products)
+  def StreamAddProducts(self, database, products):
+    """Adds the products of a stream of messages like AddProducts, committing them in chunks as they
+    arrive; returns the ID of each product in the order they were sent, or empty bytes for a product
+    that was not added, once the stream ends
     """
-    return inventory_system_pb2.IDs(ids=inventory_system.AddProducts(self.database, request.products))
+    return inventory_system.AddProducts(database, products)
 
+  @releases_session
   def UpdateProducts(self, request, context):
-    """Updates products (name and ID cannot be updated)
+    """Updates products (name and ID cannot be updated); returns the ID of each product in the
+    order they were sent, or empty bytes for a product that was not found or, if check_version
+    is set, is not at the version that was sent. Every product that is updated gets a new version
     """
-    inventory_system.UpdateProducts(self.database, request.products)
-    return inventory_system_pb2.Empty()
+    with self.exclusive_stock():
+      ids = self.write(context, lambda database: inventory_system.UpdateProducts(database, request.products,
+                                                                                 request.check_version))
+    if ids is None:
+      context.abort(grpc.StatusCode.ABORTED, 'The products kept changing while they were being updated, so none of '
+                                             'them were updated')
+    return inventory_system_pb2.IDs(ids=ids)
 
+  @releases_session
   def GetProductsInStock(self, request, context):
-    """Retrieves all products that are in stock  
+    """Retrieves all products that are in stock, or a page of them sorted by ID if page_size is set
+    """
+    self.wait_for_writes()
+    page_size, next_page_token = self.page_size(request, context), b''
+    if page_size > 0:
+      rows, next_page_token = inventory_system.GetProductsInStockPage(self.database, page_size, request.page_token)
+    else:
+      rows = inventory_system.GetProductsInStock(self.database)
+    return inventory_system_pb2.Products(products=[self.to_inventory_system_product(row) for row in rows],
+                                         next_page_token=next_page_token)
+
+  @streams_pages
+  def GetProducts(self, request, page_token):
+    """Streams all products no matter the stock, a chunk of products per message
     """
-    return inventory_system_pb2.Products(products=[self.to_inventory_system_product(product)
-                                                   for product in inventory_system.GetProductsInStock(self.database)])
+    return self.products_page(*inventory_system.GetProductsPage(self.database, STREAM_CHUNK_SIZE, page_token))
 
+  @streams_pages
+  def StreamProductsInStock(self, request, page_token):
+    """Streams the products that are in stock like GetProductsInStock, a chunk of products per message
+    """
+    return self.products_page(*inventory_system.GetProductsInStockPage(self.database, STREAM_CHUNK_SIZE, page_token))
+
+  @releases_session
   def GetOrdersByID(self, request, context):
     """Gets an order by its ID 
     """
-    orders = inventory_system.GetOrdersByID(self.database, request.ids)
+    self.wait_for_writes()
+    orders = [self.to_inventory_system_order(order) for order in inventory_system.GetOrdersByID(self.database, request.ids)]
     if len(orders) == 0:
-      self.set_status_code_not_found(context, 'No orders were found for the ids ' + str(request.ids))
-    return inventory_system_pb2.Orders(orders=[self.to_inventory_system_order(order) for order in orders])
+      self.set_status_code_not_found(context, 'No orders were found for the ids ' + str([id.hex() for id in request.ids]))
+    return inventory_system_pb2.Orders(orders=orders)
 
+  @releases_session
   def CreateOrders(self, request, context):
     """Creates orders if there is enough product in stock with IDs assigned by the server;
-    returns the IDs of the orders if they were added successfully otherwise empty list
+    returns the ID of each order in the order they were sent, or empty bytes for an order
+    that was not created
     """
-    ids = inventory_system.CreateOrders(self.database, request.orders)
-    if len(ids) == 0:
-      self.set_status_code_not_found(context, 'Failed to create all orders.')
+    ids = self.write(context, lambda database: inventory_system.CreateOrders(
+                       database, request.orders, self.to_allocation_policy(request.policy), self.ledger),
+                     uses_ledger=True)
+    if not any(ids):
+      self.set_status_code_not_found(context, 'No orders were created, there is not enough stock for their products.')
     return inventory_system_pb2.IDs(ids=ids)
 
+  @ingests(lambda request: ((order, request.policy) for order in request.orders), uses_ledger=True)
+  def StreamCreateOrders(self, database, orders):
+    """Creates the orders of a stream of messages like CreateOrders, each with the policy of its message,
+    committing them in chunks as they arrive; returns the ID of each order in the order they were
+    sent, or empty bytes for an order that was not created, once the stream ends
+    """
+    # The orders of a chunk are (order, policy) tuples, and the orders with the same policy are created together
+    ids = []
+    for policy, policy_orders in itertools.groupby(orders, key=lambda order: order[1]):
+      ids.extend(inventory_system.CreateOrders(database, [order for order, _ in policy_orders],
+                                               self.to_allocation_policy(policy), self.ledger))
+    return ids
+
+  @releases_session
+  def AllocateOrders(self, request, context):
+    """Creates orders like CreateOrders; returns each order in the order they were sent with its ID
+    and the amount of each product allocated to it, or with an empty ID and no products for an
+    order that was not created
+    """
+    orders = []
+    allocations = self.write(context, lambda database: inventory_system.AllocateOrders(
+                               database, request.orders, self.to_allocation_policy(request.policy), self.ledger),
+                             uses_ledger=True)
+    for order, (id, products) in zip(request.orders, allocations):
+      products = [inventory_system_pb2.Product(id=product.id, name=product.name, amount=product.amount)
+                  for product in products.values()]
+      orders.append(inventory_system_pb2.Order(id=id, destination=order.destination, date=order.date,
+                                               is_paid=order.is_paid, is_shipped=order.is_shipped, products=products))
+    if not any(id for id, _ in allocations):
+      self.set_status_code_not_found(context, 'No orders were created, there is not enough stock for their products.')
+    return inventory_system_pb2.Orders(orders=orders, policy=request.policy)
+
+  @releases_session
   def UpdateOrders(self, request, context):
-    """Update orders (ID cannot be updated) and if there is not enough product the order is not updated
+    """Update orders (ID cannot be updated) and if there is not enough product the order is not updated;
+    returns the ID of each order in the order they were sent, or empty bytes for an order that
+    was not updated
     """
-    inventory_system.UpdateOrders(self.database, request.orders)
-    return inventory_system_pb2.Empty()
+    return inventory_system_pb2.IDs(ids=self.write(context, lambda database: inventory_system.UpdateOrders(
+                                                     database, request.orders, self.ledger), uses_ledger=True))
 
+  @releases_session
+  def SetOrderStatus(self, request, context):
+    """Sets whether orders are paid and whether they are shipped with one statement, leaving a status
+    that is not sent unchanged; returns the IDs of the orders that were changed
+    """
+    # Orders placed through the stock ledger are only in the database once their writes are
+    self.wait_for_writes()
+    is_paid = request.is_paid if request.HasField('is_paid') else None
+    is_shipped = request.is_shipped if request.HasField('is_shipped') else None
+    return inventory_system_pb2.IDs(ids=self.write(context, lambda database: inventory_system.SetOrderStatus(
+                                                     database, request.ids, is_paid, is_shipped)))
+
+  @releases_session
   def GetOrdersByStatus(self, request, context):
-    """Retrieves all orders that are unshipped, unpaid, or both  
+    """Retrieves all orders that are unshipped, unpaid, or both, or a page of them sorted by ID if page_size is set
     """
-    orders = inventory_system.GetOrdersByStatus(self.database, request)
+    self.wait_for_writes()
+    page_size, next_page_token = self.page_size(request, context), b''
+    if page_size > 0:
+      orders, next_page_token = inventory_system.GetOrdersByStatusPage(self.database, request, page_size,
+                                                                       request.page_token)
+    else:
+      orders = inventory_system.GetOrdersByStatus(self.database, request)
+    orders = [self.to_inventory_system_order(order) for order in orders]
     if len(orders) == 0:
       self.set_status_code_not_found(context, 'No orders were found satisfying is_paid=' + str(request.paid) +
                                          ' and/or is_shipped=' + str(request.shipped))
-    return inventory_system_pb2.Orders(orders=[self.to_inventory_system_order(order) for order in orders])
+    return inventory_system_pb2.Orders(orders=orders, next_page_token=next_page_token)
   
+  @streams_pages
+  def StreamOrdersByStatus(self, request, page_token):
+    """Streams the orders with a given status like GetOrdersByStatus, a chunk of orders per message
+    """
+    return self.orders_page(*inventory_system.GetOrdersByStatusPage(self.database, request, STREAM_CHUNK_SIZE,
+                                                                    page_token))
+
+  @releases_session
+  def GetOrdersByDateRange(self, request, context):
+    """Retrieves all orders placed from the start date to the end date (inclusive) sorted by date
+    """
+    self.wait_for_writes()
+    orders = [self.to_inventory_system_order(order)
+              for order in inventory_system.GetOrdersByDateRange(self.database, request.start, request.end)]
+    if len(orders) == 0:
+      self.set_status_code_not_found(context, 'No orders were found from %d/%d/%d to %d/%d/%d' %
+                                     (request.start.month, request.start.day, request.start.year,
+                                      request.end.month, request.end.day, request.end.year))
+    return inventory_system_pb2.Orders(orders=orders)
+
+  @streams_pages
+  def GetOrders(self, request, page_token):
+    """Streams all orders, a chunk of orders per message
+    """
+    return self.orders_page(*inventory_system.GetOrdersPage(self.database, STREAM_CHUNK_SIZE, page_token))
+
+  @streams_pages
+  def StreamOrdersByDateRange(self, request, page_token):
+    """Streams the orders placed in a date range like GetOrdersByDateRange, a chunk of orders per message
+    """
+    return self.orders_page(*inventory_system.GetOrdersByDateRangePage(self.database, request.start, request.end,
+                                                                       STREAM_CHUNK_SIZE, page_token))
+
+  @releases_session
   def ClearDatabase(self, request, context):
     """Clears inventory system database
     """
-    inventory_system.reset_db(self.database)
+    with self.exclusive_stock():
+      self.write(context, inventory_system.reset_db)
     return inventory_system_pb2.Empty()
 
 
-def main():
-  parser = argparse.ArgumentParser(prog='inventory_system_service',
-                                   description='Runs a server that allows clients to interact'
-                                               'with an inventory system')
-  parser.add_argument('-p', '--port', default='1337', help='The port the server runs on.')
-  parser.add_argument('-db', '--database_path', default='inventory_system.db', help='The file that the database is stored in.')
-  args = parser.parse_args()
+class RpcAborted(Exception):
+  """Raised by ExecutorContext.abort to end an RPC that runs in the executor of an AsyncInventorySystem
+  """
+
+  def __init__(self, code, details):
+    super().__init__(details)
+    self.code = code
+    self.details = details
+
+
+class ExecutorContext():
+  """Stands in for the context of an asyncio RPC while the RPC of InventorySystem runs in an executor thread, since
+  the context of an asyncio RPC belongs to the event loop; the status is copied to the real context when the RPC
+  returns
+  """
+
+  def __init__(self):
+    self.code = None
+    self.details = None
+
+  def set_code(self, code):
+    self.code = code
+
+  def set_details(self, details):
+    self.details = details
+
+  def abort(self, code, details=''):
+    raise RpcAborted(code, details)
+
+
+class AsyncInventorySystem(inventory_system_pb2_grpc.InventorySystemServicer):
+  """Serves the RPCs of an InventorySystem on an asyncio server; the event loop only holds the connections, and the
+  database work of each RPC runs in a bounded executor, so idle connections do not hold a thread
+  """
+
+  def __init__(self, inv_system, executor):
+    self.inv_system = inv_system
+    self.executor = executor
+
+  async def run_in_executor(self, name, request, context):
+    """Runs an RPC of the InventorySystem in the executor and copies its status to the context
+    """
+    executor_context = ExecutorContext()
+    rpc = functools.partial(getattr(self.inv_system, name), request, executor_context)
+    try:
+      response = await asyncio.get_running_loop().run_in_executor(self.executor, rpc)
+    except RpcAborted as e:
+      await context.abort(e.code, e.details)
+    if not executor_context.code is None:
+      context.set_code(executor_context.code)
+      context.set_details(executor_context.details)
+    return response
+
+  def read_page(self, name, request, page_token):
+    """Reads a page of a streaming RPC of the InventorySystem with a session that is closed once the page is read
+    """
+    try:
+      return getattr(type(self.inv_system), name).read_page(self.inv_system, request, page_token)
+    finally:
+      self.inv_system.database.remove()
+
+  async def stream_in_executor(self, name, request, context):
+    """Runs a streaming RPC of the InventorySystem and yields its messages; each page is read by its own call in the
+    executor with its own session, so no thread or connection is held while the client reads a message, and the next
+    page is only read once the last message is sent
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(self.executor, self.inv_system.wait_for_writes)
+    page_token = b''
+    while True:
+      message, page_token = await loop.run_in_executor(self.executor, self.read_page, name, request, page_token)
+      if message.ByteSize() > 0:
+        yield message
+      if len(page_token) == 0:
+        return
+
+  def write_chunk(self, name, chunk, context):
+    """Writes a chunk of a client-streaming RPC of the InventorySystem like write_chunks and returns the IDs; writes
+    that go through the stock ledger are run with a session that is closed once the chunk is written
+    """
+    rpc = getattr(type(self.inv_system), name)
+    try:
+      return self.inv_system.write_chunks(context, chunk, functools.partial(rpc.write_chunk, self.inv_system),
+                                          len(chunk), rpc.uses_ledger)
+    finally:
+      self.inv_system.database.remove()
+
+  async def ingest_in_executor(self, name, request_iterator, context):
+    """Runs a client-streaming RPC of the InventorySystem and returns its IngestSummary; the messages are received by
+    the event loop and each chunk of up to INGEST_CHUNK_SIZE items is written by its own call in the executor, so no
+    thread is held while the client sends the next message. Like write_chunks, a chunk is committed before the next
+    chunk is written, and the next chunk is received while a chunk is written.
+    """
+    loop = asyncio.get_running_loop()
+    executor_context = ExecutorContext()
+    message_items = getattr(type(self.inv_system), name).message_items
+    ids, items, pending = [], [], None
+    async def write(chunk):
+      nonlocal pending
+      if not pending is None:
+        ids.extend(await pending)
+      pending = loop.run_in_executor(self.executor, self.write_chunk, name, chunk, executor_context)
+    try:
+      async for message in request_iterator:
+        items.extend(message_items(message))
+        while len(items) >= INGEST_CHUNK_SIZE:
+          await write(items[:INGEST_CHUNK_SIZE])
+          items = items[INGEST_CHUNK_SIZE:]
+      if len(items) > 0:
+        await write(items)
+      if not pending is None:
+        ids.extend(await pending)
+    except RpcAborted as e:
+      await context.abort(e.code, e.details)
+    return ingest_summary(ids)
+
+def executor_rpc(method):
+  """Returns an asyncio RPC of AsyncInventorySystem that runs the RPC of InventorySystem with the passed method
+  descriptor
+  """
+  if method.server_streaming:
+    async def stream_rpc(self, request, context):
+      async for message in self.stream_in_executor(method.name, request, context):
+        yield message
+    stream_rpc.__name__ = method.name
+    return stream_rpc
+  if method.client_streaming:
+    async def ingest_rpc(self, request_iterator, context):
+      return await self.ingest_in_executor(method.name, request_iterator, context)
+    ingest_rpc.__name__ = method.name
+    return ingest_rpc
+  async def rpc(self, request, context):
+    return await self.run_in_executor(method.name, request, context)
+  rpc.__name__ = method.name
+  return rpc
+
+# AsyncInventorySystem has every RPC of the InventorySystem service in inventory_system.proto
+for method in inventory_system_pb2.DESCRIPTOR.services_by_name['InventorySystem'].methods:
+  setattr(AsyncInventorySystem, method.name, executor_rpc(method))
 
-  # Must be one worker since the database must be accessed within one thread
-  server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
-  inv_system = InventorySystem(args.database_path)
+async def serve_asyncio(inv_system, port, workers):
+  """Serves the inventory system on an asyncio server until it is interrupted
+  """
+  server = grpc.aio.server()
+  with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+    inventory_system_pb2_grpc.add_InventorySystemServicer_to_server(AsyncInventorySystem(inv_system, executor), server)
+    server.add_insecure_port('[::]:' + port)
+    await server.start()
+    try:
+      await server.wait_for_termination()
+    finally:
+      await server.stop(None)
+
+
+def serve(args):
+  """Serves the inventory system on the port until the process is interrupted
+  """
+  # Only the writer thread writes to the database, so requests are served by many threads that read with their own
+  # sessions
+  group_commit_window = None if args.group_commit_window is None else args.group_commit_window / 1000
+  inv_system = InventorySystem(args.database_path, args.storage_profile, args.stock_ledger, group_commit_window,
+                               args.workers)
+  if args.asyncio:
+    try:
+      asyncio.run(serve_asyncio(inv_system, args.port, args.workers))
+    except KeyboardInterrupt:
+      pass
+    finally:
+      inv_system.close()
+    return
+  # Servers in several processes may listen on the same port, and the connections are spread across them
+  server = grpc.server(futures.ThreadPoolExecutor(max_workers=args.workers), options=[('grpc.so_reuseport', 1)])
   inventory_system_pb2_grpc.add_InventorySystemServicer_to_server(inv_system, server)
   server.add_insecure_port('[::]:' + args.port)
   server.start()
@@ -148,6 +634,87 @@ def main():
     # No need to save or close the database since it is already handled
     # Pass so that the program terminates quietly
     pass
+  finally:
+    server.stop(None)
+    inv_system.close()
+
+def interrupt(signum, frame):
+  """Handles the signal a server process is stopped with like an interrupt, so that the server is stopped cleanly
+  """
+  raise KeyboardInterrupt
+
+def serve_process(args):
+  """Serves the inventory system in a server process started by serve_processes
+  """
+  # Only the parent process is interrupted from the terminal and it stops the server processes with SIGTERM
+  signal.signal(signal.SIGINT, signal.SIG_IGN)
+  signal.signal(signal.SIGTERM, interrupt)
+  try:
+    serve(args)
+  except KeyboardInterrupt:
+    pass
+
+def serve_processes(args):
+  """Serves the inventory system from args.processes server processes that share the port; the processes share the
+  database file, which SQLite locks for each write, and they are stopped when the parent is interrupted or terminated
+  or one of them exits
+  """
+  # The database is created or upgraded once before the server processes open it
+  prepare_database(args.database_path, args.storage_profile)
+  # gRPC does not support forking a process that uses it, so each server process is a new interpreter
+  context = multiprocessing.get_context('spawn')
+  processes = [context.Process(target=serve_process, args=(args,)) for _ in range(args.processes)]
+  # The parent is stopped with SIGTERM like an interrupt, so the server processes are not left serving without it
+  terminate = signal.signal(signal.SIGTERM, interrupt)
+  try:
+    for process in processes:
+      process.start()
+    connection.wait([process.sentinel for process in processes])
+  except KeyboardInterrupt:
+    pass
+  finally:
+    for process in processes:
+      if process.is_alive():
+        process.terminate()
+    for process in processes:
+      if not process.pid is None:
+        process.join()
+    signal.signal(signal.SIGTERM, terminate)
+
+def main():
+  parser = argparse.ArgumentParser(prog='inventory_system_service',
+                                   description='Runs a server that allows clients to interact'
+                                               'with an inventory system')
+  parser.add_argument('-p', '--port', default='1337', help='The port the server runs on.')
+  parser.add_argument('-db', '--database_path', default='inventory_system.db', help='The file that the database is stored in.')
+  parser.add_argument('-s', '--storage_profile', default=inventory_system.DEFAULT_STORAGE_PROFILE,
+                      choices=list(inventory_system.STORAGE_PROFILES),
+                      help='How the database trades durability for write throughput: durable syncs every commit to '
+                           'disk, balanced can lose the latest commits on a power loss, and throughput can corrupt '
+                           'the database on a power loss.')
+  parser.add_argument('-l', '--stock_ledger', action='store_true',
+                      help='Reserve stock for orders in memory and write orders to the database in the background; '
+                           'orders that were placed but not yet written are lost if the server crashes.')
+  parser.add_argument('-g', '--group_commit_window', type=float, default=None,
+                      help='Wait this many milliseconds for more writes after a write arrives and commit them in one '
+                           'transaction; by default only the writes that are already waiting are committed together.')
+  parser.add_argument('-w', '--workers', type=int, default=WORKERS,
+                      help='How many requests are served at a time, each with its own database session.')
+  parser.add_argument('-a', '--asyncio', action='store_true',
+                      help='Hold the connections on an asyncio server and only use a worker while a request uses the '
+                           'database, so many idle connections can be held open.')
+  parser.add_argument('-n', '--processes', type=int, default=1,
+                      help='Serve from this many processes that share the port, so requests are served on several '
+                           'cores; each process has its own workers and writer thread.')
+  args = parser.parse_args()
+  if args.processes > 1 and args.stock_ledger:
+    # Each process would keep its own stock in memory, so orders from different processes could take the same stock
+    parser.error('the stock ledger can only be used by one process')
+
+  if args.processes > 1:
+    serve_processes(args)
+  else:
+    serve(args)
 
 
 if __name__ == '__main__':
@@ -42,6 +42,15 @@ def prepare_database_for_timing(stub):
     
     return product_ids, stub.CreateOrders(inventory_system_pb2.Orders(orders=orders)).ids
 
+def get_orders_by_status(stub, paid, shipped):
+    # An order status that no order has is answered with NOT_FOUND, which is timed like any other lookup
+    try:
+        return stub.GetOrdersByStatus(inventory_system_pb2.OrderStatus(paid=paid, shipped=shipped)).orders
+    except grpc.RpcError as e:
+        if e.code() != grpc.StatusCode.NOT_FOUND:
+            raise
+        return []
+
 def run_timing(stub, number_of_run=None):
     # The number of the timing run
     run_number = ''
@@ -91,10 +100,10 @@ def run_timing(stub, number_of_run=None):
     # Timing for GetOrdersByStatus
     start_time = time.monotonic() # The start of the timing
 
-    orders = stub.GetOrdersByStatus(inventory_system_pb2.OrderStatus(paid=False, shipped=False)).orders
-    orders = stub.GetOrdersByStatus(inventory_system_pb2.OrderStatus(paid=False, shipped=True)).orders
-    orders = stub.GetOrdersByStatus(inventory_system_pb2.OrderStatus(paid=True, shipped=False)).orders
-    orders = stub.GetOrdersByStatus(inventory_system_pb2.OrderStatus(paid=True, shipped=True)).orders
+    orders = get_orders_by_status(stub, paid=False, shipped=False)
+    orders = get_orders_by_status(stub, paid=False, shipped=True)
+    orders = get_orders_by_status(stub, paid=True, shipped=False)
+    orders = get_orders_by_status(stub, paid=True, shipped=True)
 
     grpc_times.append(time.monotonic() - start_time)
     print('Finished timing GetOrdersByStatus%s...' % run_number)
@@ -103,7 +112,7 @@ def run_timing(stub, number_of_run=None):
     # Timing for GetProductsInStock
     start_time = time.monotonic() # The start of the timing
 
-    products = stub.GetProductsInStock(inventory_system_pb2.Empty()).products
+    products = stub.GetProductsInStock(inventory_system_pb2.PageRequest()).products
 
     grpc_times.append(time.monotonic() - start_time)
     print('Finished timing GetProductsInStock%s...' % run_number)
@@ -0,0 +1,272 @@
+"""An in-memory ledger of the stock of products that sits in front of the amount column of the product table. Stock is
+reserved in memory under a lock for each stripe of products, so orders for different products do not wait on each
+other, and the changes are written to the database in the order they were made by a writer thread. A product whose
+stripe is often waited on is made a hot product: its stock is split across several counters that orders take stock
+from without locking the stripe, while the database keeps the total.
+
+Author: Riley Kirkpatrick
+"""
+
+import contextlib
+import inventory_system
+import itertools
+import queue
+import threading
+
+LOCK_STRIPES = 64 # The number of locks the products are spread across
+WRITE_BATCH_SIZE = 1000 # The most queued writes that are committed in one transaction
+HOT_PRODUCT_CONTENTION = 16 # How many times a product's stripe is waited on before it is made a hot product
+HOT_PRODUCT_SHARDS = 8 # The number of counters the stock of a hot product is split across
+
+
+class StockShard():
+  """One of the counters that the stock of a hot product is split across
+  """
+
+  def __init__(self, amount):
+    self.amount = amount
+    self.lock = threading.Lock()
+
+
+class StockLedger():
+  """Keeps the stock of the products that have been ordered in memory. Every change to the stock of a product that is
+  in the ledger must be made while its stripe is locked and must go through the ledger, otherwise the ledger must be
+  locked with exclusive so that it loads the stock from the database again.
+  """
+
+  def __init__(self, database_path, storage_profile=inventory_system.DEFAULT_STORAGE_PROFILE, stripes=LOCK_STRIPES,
+               shards=HOT_PRODUCT_SHARDS):
+    self.stock = {}
+    self.locks = [threading.Lock() for _ in range(stripes)]
+    # The counters of hot products, and how many times each product's stripe was waited on
+    self.shards = {}
+    self.number_of_shards = shards
+    self.contention = {}
+    # The stock each thread took from hot products while it has them locked, and the index of each thread's counter;
+    # thread IDs are addresses that share their low bits, so threads are numbered as they first use the ledger instead
+    self.local = threading.local()
+    self.thread_numbers = itertools.count()
+    # exclusive waits for every lock to be released and keeps new ones from being taken
+    self.gate = threading.Condition()
+    self.active = 0
+    self.closed = False
+    # Products whose queued writes failed; their stock is loaded from the database the next time they are locked
+    self.stale = set()
+    self.stale_lock = threading.Lock()
+    self.writes = queue.Queue()
+    # How many writes were queued and how many of them the writer thread is done with, in the order they were queued
+    self.progress = threading.Condition()
+    self.submitted = 0
+    self.written = 0
+    self.writer = threading.Thread(target=self.write, args=(database_path, storage_profile), daemon=True)
+    self.writer.start()
+
+  def stripe(self, id):
+    """Returns the index of the lock of the stripe that a product or order ID belongs to
+    """
+    return hash(id) % len(self.locks)
+
+  @contextlib.contextmanager
+  def lock(self, database, demand, other_ids=()):
+    """Locks products given a dict of product IDs mapped to the most stock that may be taken from each product, along
+    with other IDs (such as order IDs), and yields a dict of the product IDs mapped to their stock. The stripe of
+    every product is locked and the stock of products that are not in the ledger is loaded from the database, except
+    for hot products, which instead take up to what is asked for from their counters; what is not taken by submit is
+    put back when the lock is released.
+    """
+    with self.gate:
+      while self.closed:
+        self.gate.wait()
+      self.active += 1
+    self.local.taken = {}
+    stripes = sorted({self.stripe(id) for id in demand if not id in self.shards} | {self.stripe(id) for id in other_ids})
+    contended = []
+    for stripe in stripes:
+      if not self.locks[stripe].acquire(blocking=False):
+        contended.append(stripe)
+        self.locks[stripe].acquire()
+    try:
+      # The stock is read in a new transaction so that every change written before the stripes were locked is seen
+      inventory_system.save_db(database)
+      with self.stale_lock:
+        # Hot products that are stale are loaded again when the ledger is locked with exclusive
+        stale = {id for id in self.stale & set(demand) if not id in self.shards}
+        self.stale -= stale
+      if len(stale) > 0:
+        # The stock in the database is only right once the writes queued after the failed write are in it
+        self.flush()
+        for id in stale:
+          self.stock.pop(id, None)
+      missing = [id for id in demand if not id in self.stock and not id in self.shards]
+      if len(missing) > 0:
+        self.stock.update(inventory_system.get_stock_db(database, missing))
+      self.promote(demand, contended)
+      stock = {}
+      for id, amount in demand.items():
+        if id in self.shards:
+          stock[id] = self.local.taken[id] = self.take(id, amount)
+        elif id in self.stock:
+          stock[id] = self.stock[id]
+      yield stock
+    finally:
+      for stripe in reversed(stripes):
+        self.locks[stripe].release()
+      for id, amount in self.local.taken.items():
+        self.put_back(id, amount)
+      with self.gate:
+        self.active -= 1
+        self.gate.notify_all()
+
+  def promote(self, demand, contended):
+    """Counts how many times the stripes of the passed products were waited on and makes the products whose stripes
+    were waited on HOT_PRODUCT_CONTENTION times hot products; the stripes must be locked
+    """
+    for id in demand:
+      if id in self.stock and self.stripe(id) in contended:
+        self.contention[id] = self.contention.get(id, 0) + 1
+        if self.contention[id] >= HOT_PRODUCT_CONTENTION:
+          amount = self.stock.pop(id)
+          del self.contention[id]
+          self.shards[id] = [StockShard(amount // self.number_of_shards + (i < amount % self.number_of_shards))
+                             for i in range(self.number_of_shards)]
+
+  def home_shard(self):
+    """Returns the index of the counter of hot products that the current thread starts from
+    """
+    if not hasattr(self.local, 'shard'):
+      self.local.shard = next(self.thread_numbers) % self.number_of_shards
+    return self.local.shard
+
+  def take(self, id, amount):
+    """Takes up to the passed amount from the counters of a hot product, starting with the current thread's counter,
+    and returns how much was taken
+    """
+    shards, taken = self.shards[id], 0
+    for i in range(len(shards)):
+      shard = shards[(self.home_shard() + i) % len(shards)]
+      with shard.lock:
+        amount_from_shard = min(shard.amount, amount - taken)
+        shard.amount -= amount_from_shard
+      taken += amount_from_shard
+      if taken == amount:
+        break
+    return taken
+
+  def put_back(self, id, amount):
+    """Adds an amount to the current thread's counter of a hot product
+    """
+    if amount > 0:
+      shard = self.shards[id][self.home_shard()]
+      with shard.lock:
+        shard.amount += amount
+
+  def amount(self, id):
+    """Returns the stock of a product in the ledger, adding up the counters of a hot product, or None if the product
+    is not in the ledger
+    """
+    if id in self.shards:
+      return sum(shard.amount for shard in self.shards[id])
+    return self.stock.get(id)
+
+  @contextlib.contextmanager
+  def exclusive(self):
+    """Waits for every lock to be released and for the queued writes, so that the stock can be changed without the
+    ledger, and forgets the stock of every product when released so that it is loaded from the database again
+    """
+    with self.gate:
+      while self.closed:
+        self.gate.wait()
+      self.closed = True
+      while self.active > 0:
+        self.gate.wait()
+    try:
+      self.flush()
+      yield
+    finally:
+      self.stock.clear()
+      self.shards.clear()
+      self.contention.clear()
+      with self.stale_lock:
+        self.stale.clear()
+      with self.gate:
+        self.closed = False
+        self.gate.notify_all()
+
+  def submit(self, changes, write=None):
+    """Changes the stock of products given a dict of product IDs mapped to the amount added to the stock of each
+    product, and queues the change to be written to the database along with a function that is passed the writer's
+    database session to write anything else that goes with the change; the products must be locked. Stock taken
+    from hot products that is not used is put back when they are unlocked, and stock added to hot products is only
+    put back once the change is queued, so the database never has less stock than the ledger.
+    """
+    added = {}
+    for id, change in changes.items():
+      if id in self.shards:
+        # The stock removed from a hot product was already taken from its counters
+        self.local.taken[id] += min(change, 0)
+        added[id] = max(change, 0)
+      else:
+        self.stock[id] += change
+    with self.progress:
+      self.submitted += 1
+      self.writes.put((changes, write))
+    for id, amount in added.items():
+      self.put_back(id, amount)
+
+  def flush(self):
+    """Waits until every write that was queued before the call is in the database; writes queued while waiting are
+    not waited for, so a steady stream of orders cannot keep the caller waiting
+    """
+    with self.progress:
+      submitted = self.submitted
+      while self.written < submitted:
+        self.progress.wait()
+
+  def close(self):
+    """Writes everything that is queued to the database and stops the writer thread
+    """
+    self.writes.put(None)
+    self.writer.join()
+
+  def write_changes(self, database, writes):
+    """Writes queued changes to the database; the stock of a product is only changed if it does not go below zero,
+    which never happens unless the stock in the ledger is wrong
+    """
+    if not inventory_system.reserve_stock_db(database, inventory_system.merge_stock_changes(
+                                                         changes for changes, _ in writes)):
+      raise ValueError('The stock in the database does not match the stock ledger')
+    for _, write in writes:
+      if not write is None:
+        write(database)
+
+  def write(self, database_path, storage_profile):
+    """Writes the queued changes to the database in the order they were queued, committing the writes that are queued
+    at the same time in one transaction
+    """
+    database = inventory_system.get_dbsession(database_path, storage_profile, writer=True)
+    stop = False
+    while not stop:
+      writes = [self.writes.get()]
+      while len(writes) < WRITE_BATCH_SIZE and not self.writes.empty():
+        writes.append(self.writes.get())
+      stop = None in writes
+      changes = [write for write in writes if not write is None]
+      try:
+        self.write_changes(database, changes)
+        inventory_system.save_db(database)
+      except Exception:
+        database.rollback()
+        # The writes are committed one at a time so that only the writes that fail are lost
+        for write in changes:
+          try:
+            self.write_changes(database, [write])
+            inventory_system.save_db(database)
+          except Exception as e:
+            database.rollback()
+            print('A stock ledger write failed: ' + str(e))
+            with self.stale_lock:
+              self.stale.update(write[0])
+      with self.progress:
+        self.written += len(changes)
+        self.progress.notify_all()
+    database.close()
@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
 # source: inventory_system.proto
-
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'inventory_system.proto'
+)
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -13,733 +24,49 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='inventory_system.proto',
-  package='InventorySystem',
-  syntax='proto3',
-  serialized_options=None,
-  serialized_pb=b'\n\x16inventory_system.proto\x12\x0fInventorySystem\"\x07\n\x05\x45mpty\"\x10\n\x02ID\x12\n\n\x02id\x18\x01 \x01(\t\"\x14\n\x04Name\x12\x0c\n\x04name\x18\x01 \x01(\t\"$\n\x0cManufacturer\x12\x14\n\x0cmanufacturer\x18\x01 \x01(\t\"\x12\n\x03IDs\x12\x0b\n\x03ids\x18\x01 \x03(\t\"\x16\n\x05Names\x12\r\n\x05names\x18\x01 \x03(\t\"&\n\rManufacturers\x12\x15\n\rmanufacturers\x18\x01 \x03(\t\"\x89\x01\n\x07Product\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x14\n\x0cmanufacturer\x18\x04 \x01(\t\x12\x16\n\x0ewholesale_cost\x18\x05 \x01(\x01\x12\x11\n\tsale_cost\x18\x06 \x01(\x01\x12\x0e\n\x06\x61mount\x18\x07 \x01(\x03\"6\n\x08Products\x12*\n\x08products\x18\x01 \x03(\x0b\x32\x18.InventorySystem.Product\",\n\x0bOrderStatus\x12\x0c\n\x04paid\x18\x01 \x01(\x08\x12\x0f\n\x07shipped\x18\x02 \x01(\x08\"0\n\x04\x44\x61te\x12\x0c\n\x04year\x18\x01 \x01(\x05\x12\r\n\x05month\x18\x02 \x01(\x05\x12\x0b\n\x03\x64\x61y\x18\x03 \x01(\x05\"\x9e\x01\n\x05Order\x12\n\n\x02id\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65stination\x18\x02 \x01(\t\x12#\n\x04\x64\x61te\x18\x03 \x01(\x0b\x32\x15.InventorySystem.Date\x12*\n\x08products\x18\x04 \x03(\x0b\x32\x18.InventorySystem.Product\x12\x0f\n\x07is_paid\x18\x05 \x01(\x08\x12\x12\n\nis_shipped\x18\x06 \x01(\x08\"0\n\x06Orders\x12&\n\x06orders\x18\x01 \x03(\x0b\x32\x16.InventorySystem.Order2\xa5\x06\n\x0fInventorySystem\x12\x44\n\x0fGetProductsByID\x12\x14.InventorySystem.IDs\x1a\x19.InventorySystem.Products\"\x00\x12H\n\x11GetProductsByName\x12\x16.InventorySystem.Names\x1a\x19.InventorySystem.Products\"\x00\x12W\n\x19GetProductsByManufacturer\x12\x1d.InventorySystem.Manufacturer\x1a\x19.InventorySystem.Products\"\x00\x12@\n\x0b\x41\x64\x64Products\x12\x19.InventorySystem.Products\x1a\x14.InventorySystem.IDs\"\x00\x12\x45\n\x0eUpdateProducts\x12\x19.InventorySystem.Products\x1a\x16.InventorySystem.Empty\"\x00\x12I\n\x12GetProductsInStock\x12\x16.InventorySystem.Empty\x1a\x19.InventorySystem.Products\"\x00\x12@\n\rGetOrdersByID\x12\x14.InventorySystem.IDs\x1a\x17.InventorySystem.Orders\"\x00\x12?\n\x0c\x43reateOrders\x12\x17.InventorySystem.Orders\x1a\x14.InventorySystem.IDs\"\x00\x12\x41\n\x0cUpdateOrders\x12\x17.InventorySystem.Orders\x1a\x16.InventorySystem.Empty\"\x00\x12L\n\x11GetOrdersByStatus\x12\x1c.InventorySystem.OrderStatus\x1a\x17.InventorySystem.Orders\"\x00\x12\x41\n\rClearDatabase\x12\x16.InventorySystem.Empty\x1a\x16.InventorySystem.Empty\"\x00\x62\x06proto3'
-)
-
-
-
-
-_EMPTY = _descriptor.Descriptor(
-  name='Empty',
-  full_name='InventorySystem.Empty',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=43,
-  serialized_end=50,
-)
-
-
-_ID = _descriptor.Descriptor(
-  name='ID',
-  full_name='InventorySystem.ID',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='id', full_name='InventorySystem.ID.id', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=52,
-  serialized_end=68,
-)
-
-
-_NAME = _descriptor.Descriptor(
-  name='Name',
-  full_name='InventorySystem.Name',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='name', full_name='InventorySystem.Name.name', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=70,
-  serialized_end=90,
-)
-
-
-_MANUFACTURER = _descriptor.Descriptor(
-  name='Manufacturer',
-  full_name='InventorySystem.Manufacturer',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='manufacturer', full_name='InventorySystem.Manufacturer.manufacturer', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=92,
-  serialized_end=128,
-)
-
-
-_IDS = _descriptor.Descriptor(
-  name='IDs',
-  full_name='InventorySystem.IDs',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='ids', full_name='InventorySystem.IDs.ids', index=0,
-      number=1, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=130,
-  serialized_end=148,
-)
-
-
-_NAMES = _descriptor.Descriptor(
-  name='Names',
-  full_name='InventorySystem.Names',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='names', full_name='InventorySystem.Names.names', index=0,
-      number=1, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=150,
-  serialized_end=172,
-)
-
-
-_MANUFACTURERS = _descriptor.Descriptor(
-  name='Manufacturers',
-  full_name='InventorySystem.Manufacturers',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='manufacturers', full_name='InventorySystem.Manufacturers.manufacturers', index=0,
-      number=1, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=174,
-  serialized_end=212,
-)
-
-
-_PRODUCT = _descriptor.Descriptor(
-  name='Product',
-  full_name='InventorySystem.Product',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='id', full_name='InventorySystem.Product.id', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='name', full_name='InventorySystem.Product.name', index=1,
-      number=2, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='description', full_name='InventorySystem.Product.description', index=2,
-      number=3, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='manufacturer', full_name='InventorySystem.Product.manufacturer', index=3,
-      number=4, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='wholesale_cost', full_name='InventorySystem.Product.wholesale_cost', index=4,
-      number=5, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='sale_cost', full_name='InventorySystem.Product.sale_cost', index=5,
-      number=6, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='amount', full_name='InventorySystem.Product.amount', index=6,
-      number=7, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=215,
-  serialized_end=352,
-)
-
-
-_PRODUCTS = _descriptor.Descriptor(
-  name='Products',
-  full_name='InventorySystem.Products',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='products', full_name='InventorySystem.Products.products', index=0,
-      number=1, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=354,
-  serialized_end=408,
-)
-
-
-_ORDERSTATUS = _descriptor.Descriptor(
-  name='OrderStatus',
-  full_name='InventorySystem.OrderStatus',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='paid', full_name='InventorySystem.OrderStatus.paid', index=0,
-      number=1, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='shipped', full_name='InventorySystem.OrderStatus.shipped', index=1,
-      number=2, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=410,
-  serialized_end=454,
-)
-
-
-_DATE = _descriptor.Descriptor(
-  name='Date',
-  full_name='InventorySystem.Date',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='year', full_name='InventorySystem.Date.year', index=0,
-      number=1, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='month', full_name='InventorySystem.Date.month', index=1,
-      number=2, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='day', full_name='InventorySystem.Date.day', index=2,
-      number=3, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=456,
-  serialized_end=504,
-)
-
-
-_ORDER = _descriptor.Descriptor(
-  name='Order',
-  full_name='InventorySystem.Order',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='id', full_name='InventorySystem.Order.id', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='destination', full_name='InventorySystem.Order.destination', index=1,
-      number=2, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='date', full_name='InventorySystem.Order.date', index=2,
-      number=3, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='products', full_name='InventorySystem.Order.products', index=3,
-      number=4, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='is_paid', full_name='InventorySystem.Order.is_paid', index=4,
-      number=5, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-    _descriptor.FieldDescriptor(
-      name='is_shipped', full_name='InventorySystem.Order.is_shipped', index=5,
-      number=6, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=507,
-  serialized_end=665,
-)
-
-
-_ORDERS = _descriptor.Descriptor(
-  name='Orders',
-  full_name='InventorySystem.Orders',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='orders', full_name='InventorySystem.Orders.orders', index=0,
-      number=1, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=667,
-  serialized_end=715,
-)
-
-_PRODUCTS.fields_by_name['products'].message_type = _PRODUCT
-_ORDER.fields_by_name['date'].message_type = _DATE
-_ORDER.fields_by_name['products'].message_type = _PRODUCT
-_ORDERS.fields_by_name['orders'].message_type = _ORDER
-DESCRIPTOR.message_types_by_name['Empty'] = _EMPTY
-DESCRIPTOR.message_types_by_name['ID'] = _ID
-DESCRIPTOR.message_types_by_name['Name'] = _NAME
-DESCRIPTOR.message_types_by_name['Manufacturer'] = _MANUFACTURER
-DESCRIPTOR.message_types_by_name['IDs'] = _IDS
-DESCRIPTOR.message_types_by_name['Names'] = _NAMES
-DESCRIPTOR.message_types_by_name['Manufacturers'] = _MANUFACTURERS
-DESCRIPTOR.message_types_by_name['Product'] = _PRODUCT
-DESCRIPTOR.message_types_by_name['Products'] = _PRODUCTS
-DESCRIPTOR.message_types_by_name['OrderStatus'] = _ORDERSTATUS
-DESCRIPTOR.message_types_by_name['Date'] = _DATE
-DESCRIPTOR.message_types_by_name['Order'] = _ORDER
-DESCRIPTOR.message_types_by_name['Orders'] = _ORDERS
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-Empty = _reflection.GeneratedProtocolMessageType('Empty', (_message.Message,), {
-  'DESCRIPTOR' : _EMPTY,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Empty)
-  })
-_sym_db.RegisterMessage(Empty)
-
-ID = _reflection.GeneratedProtocolMessageType('ID', (_message.Message,), {
-  'DESCRIPTOR' : _ID,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.ID)
-  })
-_sym_db.RegisterMessage(ID)
-
-Name = _reflection.GeneratedProtocolMessageType('Name', (_message.Message,), {
-  'DESCRIPTOR' : _NAME,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Name)
-  })
-_sym_db.RegisterMessage(Name)
-
-Manufacturer = _reflection.GeneratedProtocolMessageType('Manufacturer', (_message.Message,), {
-  'DESCRIPTOR' : _MANUFACTURER,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Manufacturer)
-  })
-_sym_db.RegisterMessage(Manufacturer)
-
-IDs = _reflection.GeneratedProtocolMessageType('IDs', (_message.Message,), {
-  'DESCRIPTOR' : _IDS,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.IDs)
-  })
-_sym_db.RegisterMessage(IDs)
-
-Names = _reflection.GeneratedProtocolMessageType('Names', (_message.Message,), {
-  'DESCRIPTOR' : _NAMES,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Names)
-  })
-_sym_db.RegisterMessage(Names)
-
-Manufacturers = _reflection.GeneratedProtocolMessageType('Manufacturers', (_message.Message,), {
-  'DESCRIPTOR' : _MANUFACTURERS,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Manufacturers)
-  })
-_sym_db.RegisterMessage(Manufacturers)
-
-Product = _reflection.GeneratedProtocolMessageType('Product', (_message.Message,), {
-  'DESCRIPTOR' : _PRODUCT,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Product)
-  })
-_sym_db.RegisterMessage(Product)
-
-Products = _reflection.GeneratedProtocolMessageType('Products', (_message.Message,), {
-  'DESCRIPTOR' : _PRODUCTS,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Products)
-  })
-_sym_db.RegisterMessage(Products)
-
-OrderStatus = _reflection.GeneratedProtocolMessageType('OrderStatus', (_message.Message,), {
-  'DESCRIPTOR' : _ORDERSTATUS,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.OrderStatus)
-  })
-_sym_db.RegisterMessage(OrderStatus)
-
-Date = _reflection.GeneratedProtocolMessageType('Date', (_message.Message,), {
-  'DESCRIPTOR' : _DATE,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Date)
-  })
-_sym_db.RegisterMessage(Date)
-
-Order = _reflection.GeneratedProtocolMessageType('Order', (_message.Message,), {
-  'DESCRIPTOR' : _ORDER,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Order)
-  })
-_sym_db.RegisterMessage(Order)
-
-Orders = _reflection.GeneratedProtocolMessageType('Orders', (_message.Message,), {
-  'DESCRIPTOR' : _ORDERS,
-  '__module__' : 'inventory_system_pb2'
-  # @@protoc_insertion_point(class_scope:InventorySystem.Orders)
-  })
-_sym_db.RegisterMessage(Orders)
-
-
-
-_INVENTORYSYSTEM = _descriptor.ServiceDescriptor(
-  name='InventorySystem',
-  full_name='InventorySystem.InventorySystem',
-  file=DESCRIPTOR,
-  index=0,
-  serialized_options=None,
-  serialized_start=718,
-  serialized_end=1523,
-  methods=[
-  _descriptor.MethodDescriptor(
-    name='GetProductsByID',
-    full_name='InventorySystem.InventorySystem.GetProductsByID',
-    index=0,
-    containing_service=None,
-    input_type=_IDS,
-    output_type=_PRODUCTS,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='GetProductsByName',
-    full_name='InventorySystem.InventorySystem.GetProductsByName',
-    index=1,
-    containing_service=None,
-    input_type=_NAMES,
-    output_type=_PRODUCTS,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='GetProductsByManufacturer',
-    full_name='InventorySystem.InventorySystem.GetProductsByManufacturer',
-    index=2,
-    containing_service=None,
-    input_type=_MANUFACTURER,
-    output_type=_PRODUCTS,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='AddProducts',
-    full_name='InventorySystem.InventorySystem.AddProducts',
-    index=3,
-    containing_service=None,
-    input_type=_PRODUCTS,
-    output_type=_IDS,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='UpdateProducts',
-    full_name='InventorySystem.InventorySystem.UpdateProducts',
-    index=4,
-    containing_service=None,
-    input_type=_PRODUCTS,
-    output_type=_EMPTY,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='GetProductsInStock',
-    full_name='InventorySystem.InventorySystem.GetProductsInStock',
-    index=5,
-    containing_service=None,
-    input_type=_EMPTY,
-    output_type=_PRODUCTS,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='GetOrdersByID',
-    full_name='InventorySystem.InventorySystem.GetOrdersByID',
-    index=6,
-    containing_service=None,
-    input_type=_IDS,
-    output_type=_ORDERS,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='CreateOrders',
-    full_name='InventorySystem.InventorySystem.CreateOrders',
-    index=7,
-    containing_service=None,
-    input_type=_ORDERS,
-    output_type=_IDS,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='UpdateOrders',
-    full_name='InventorySystem.InventorySystem.UpdateOrders',
-    index=8,
-    containing_service=None,
-    input_type=_ORDERS,
-    output_type=_EMPTY,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='GetOrdersByStatus',
-    full_name='InventorySystem.InventorySystem.GetOrdersByStatus',
-    index=9,
-    containing_service=None,
-    input_type=_ORDERSTATUS,
-    output_type=_ORDERS,
-    serialized_options=None,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ClearDatabase',
-    full_name='InventorySystem.InventorySystem.ClearDatabase',
-    index=10,
-    containing_service=None,
-    input_type=_EMPTY,
-    output_type=_EMPTY,
-    serialized_options=None,
-  ),
-])
-_sym_db.RegisterServiceDescriptor(_INVENTORYSYSTEM)
-
-DESCRIPTOR.services_by_name['InventorySystem'] = _INVENTORYSYSTEM
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16inventory_system.proto\x12\x0fInventorySystem\"\x07\n\x05\x45mpty\"4\n\x0bPageRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x12\n\npage_token\x18\x02 \x01(\x0c\"\x10\n\x02ID\x12\n\n\x02id\x18\x01 \x01(\x0c\"\x14\n\x04Name\x12\x0c\n\x04name\x18\x01 \x01(\t\"K\n\x0cManufacturer\x12\x14\n\x0cmanufacturer\x18\x01 \x01(\t\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x12\n\npage_token\x18\x03 \x01(\x0c\"\x12\n\x03IDs\x12\x0b\n\x03ids\x18\x01 \x03(\x0c\"=\n\rIngestSummary\x12\x0b\n\x03ids\x18\x01 \x03(\x0c\x12\r\n\x05\x61\x64\x64\x65\x64\x18\x02 \x01(\x05\x12\x10\n\x08rejected\x18\x03 \x01(\x05\"\x16\n\x05Names\x12\r\n\x05names\x18\x01 \x03(\t\"&\n\rManufacturers\x12\x15\n\rmanufacturers\x18\x01 \x03(\t\"\x9a\x01\n\x07Product\x12\n\n\x02id\x18\x01 \x01(\x0c\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x14\n\x0cmanufacturer\x18\x04 \x01(\t\x12\x16\n\x0ewholesale_cost\x18\x05 \x01(\x01\x12\x11\n\tsale_cost\x18\x06 \x01(\x01\x12\x0e\n\x06\x61mount\x18\x07 \x01(\x03\x12\x0f\n\x07version\x18\x08 \x01(\x03\"f\n\x08Products\x12*\n\x08products\x18\x01 \x03(\x0b\x32\x18.InventorySystem.Product\x12\x15\n\rcheck_version\x18\x02 \x01(\x08\x12\x17\n\x0fnext_page_token\x18\x03 \x01(\x0c\"S\n\x0bOrderStatus\x12\x0c\n\x04paid\x18\x01 \x01(\x08\x12\x0f\n\x07shipped\x18\x02 \x01(\x08\x12\x11\n\tpage_size\x18\x03 \x01(\x05\x12\x12\n\npage_token\x18\x04 \x01(\x0c\"j\n\x11OrderStatusChange\x12\x0b\n\x03ids\x18\x01 \x03(\x0c\x12\x14\n\x07is_paid\x18\x02 \x01(\x08H\x00\x88\x01\x01\x12\x17\n\nis_shipped\x18\x03 \x01(\x08H\x01\x88\x01\x01\x42\n\n\x08_is_paidB\r\n\x0b_is_shipped\"0\n\x04\x44\x61te\x12\x0c\n\x04year\x18\x01 \x01(\x05\x12\r\n\x05month\x18\x02 \x01(\x05\x12\x0b\n\x03\x64\x61y\x18\x03 \x01(\x05\"U\n\tDateRange\x12$\n\x05start\x18\x01 \x01(\x0b\x32\x15.InventorySystem.Date\x12\"\n\x03\x65nd\x18\x02 \x01(\x0b\x32\x15.InventorySystem.Date\"\x9e\x01\n\x05Order\x12\n\n\x02id\x18\x01 \x01(\x0c\x12\x13\n\x0b\x64\x65stination\x18\x02 \x01(\t\x12#\n\x04\x64\x61te\x18\x03 \x01(\x0b\x32\x15.InventorySystem.Date\x12*\n\x08products\x18\x04 \x03(\x0b\x32\x18.InventorySystem.Product\x12\x0f\n\x07is_paid\x18\x05 \x01(\x08\x12\x12\n\nis_shipped\x18\x06 \x01(\x08\"|\n\x06Orders\x12&\n\x06orders\x18\x01 \x03(\x0b\x32\x16.InventorySystem.Order\x12\x31\n\x06policy\x18\x02 \x01(\x0e\x32!.InventorySystem.AllocationPolicy\x12\x17\n\x0fnext_page_token\x18\x03 \x01(\x0c*T\n\x10\x41llocationPolicy\x12\x08\n\x04\x46IFO\x10\x00\x12\x12\n\x0e\x41LL_OR_NOTHING\x10\x01\x12\x10\n\x0cPROPORTIONAL\x10\x02\x12\x10\n\x0cPARTIAL_FILL\x10\x03\x32\x8e\r\n\x0fInventorySystem\x12\x44\n\x0fGetProductsByID\x12\x14.InventorySystem.IDs\x1a\x19.InventorySystem.Products\"\x00\x12H\n\x11GetProductsByName\x12\x16.InventorySystem.Names\x1a\x19.InventorySystem.Products\"\x00\x12W\n\x19GetProductsByManufacturer\x12\x1d.InventorySystem.Manufacturer\x1a\x19.InventorySystem.Products\"\x00\x12@\n\x0b\x41\x64\x64Products\x12\x19.InventorySystem.Products\x1a\x14.InventorySystem.IDs\"\x00\x12R\n\x11StreamAddProducts\x12\x19.InventorySystem.Products\x1a\x1e.InventorySystem.IngestSummary\"\x00(\x01\x12\x43\n\x0eUpdateProducts\x12\x19.InventorySystem.Products\x1a\x14.InventorySystem.IDs\"\x00\x12O\n\x12GetProductsInStock\x12\x1c.InventorySystem.PageRequest\x1a\x19.InventorySystem.Products\"\x00\x12\x44\n\x0bGetProducts\x12\x16.InventorySystem.Empty\x1a\x19.InventorySystem.Products\"\x00\x30\x01\x12N\n\x15StreamProductsInStock\x12\x16.InventorySystem.Empty\x1a\x19.InventorySystem.Products\"\x00\x30\x01\x12\\\n\x1cStreamProductsByManufacturer\x12\x1d.InventorySystem.Manufacturer\x1a\x19.InventorySystem.Products\"\x00\x30\x01\x12@\n\rGetOrdersByID\x12\x14.InventorySystem.IDs\x1a\x17.InventorySystem.Orders\"\x00\x12?\n\x0c\x43reateOrders\x12\x17.InventorySystem.Orders\x1a\x14.InventorySystem.IDs\"\x00\x12Q\n\x12StreamCreateOrders\x12\x17.InventorySystem.Orders\x1a\x1e.InventorySystem.IngestSummary\"\x00(\x01\x12\x44\n\x0e\x41llocateOrders\x12\x17.InventorySystem.Orders\x1a\x17.InventorySystem.Orders\"\x00\x12?\n\x0cUpdateOrders\x12\x17.InventorySystem.Orders\x1a\x14.InventorySystem.IDs\"\x00\x12L\n\x0eSetOrderStatus\x12\".InventorySystem.OrderStatusChange\x1a\x14.InventorySystem.IDs\"\x00\x12L\n\x11GetOrdersByStatus\x12\x1c.InventorySystem.OrderStatus\x1a\x17.InventorySystem.Orders\"\x00\x12M\n\x14GetOrdersByDateRange\x12\x1a.InventorySystem.DateRange\x1a\x17.InventorySystem.Orders\"\x00\x12@\n\tGetOrders\x12\x16.InventorySystem.Empty\x1a\x17.InventorySystem.Orders\"\x00\x30\x01\x12Q\n\x14StreamOrdersByStatus\x12\x1c.InventorySystem.OrderStatus\x1a\x17.InventorySystem.Orders\"\x00\x30\x01\x12R\n\x17StreamOrdersByDateRange\x12\x1a.InventorySystem.DateRange\x1a\x17.InventorySystem.Orders\"\x00\x30\x01\x12\x41\n\rClearDatabase\x12\x16.InventorySystem.Empty\x1a\x16.InventorySystem.Empty\"\x00\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'inventory_system_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_ALLOCATIONPOLICY']._serialized_start=1248
+  _globals['_ALLOCATIONPOLICY']._serialized_end=1332
+  _globals['_EMPTY']._serialized_start=43
+  _globals['_EMPTY']._serialized_end=50
+  _globals['_PAGEREQUEST']._serialized_start=52
+  _globals['_PAGEREQUEST']._serialized_end=104
+  _globals['_ID']._serialized_start=106
+  _globals['_ID']._serialized_end=122
+  _globals['_NAME']._serialized_start=124
+  _globals['_NAME']._serialized_end=144
+  _globals['_MANUFACTURER']._serialized_start=146
+  _globals['_MANUFACTURER']._serialized_end=221
+  _globals['_IDS']._serialized_start=223
+  _globals['_IDS']._serialized_end=241
+  _globals['_INGESTSUMMARY']._serialized_start=243
+  _globals['_INGESTSUMMARY']._serialized_end=304
+  _globals['_NAMES']._serialized_start=306
+  _globals['_NAMES']._serialized_end=328
+  _globals['_MANUFACTURERS']._serialized_start=330
+  _globals['_MANUFACTURERS']._serialized_end=368
+  _globals['_PRODUCT']._serialized_start=371
+  _globals['_PRODUCT']._serialized_end=525
+  _globals['_PRODUCTS']._serialized_start=527
+  _globals['_PRODUCTS']._serialized_end=629
+  _globals['_ORDERSTATUS']._serialized_start=631
+  _globals['_ORDERSTATUS']._serialized_end=714
+  _globals['_ORDERSTATUSCHANGE']._serialized_start=716
+  _globals['_ORDERSTATUSCHANGE']._serialized_end=822
+  _globals['_DATE']._serialized_start=824
+  _globals['_DATE']._serialized_end=872
+  _globals['_DATERANGE']._serialized_start=874
+  _globals['_DATERANGE']._serialized_end=959
+  _globals['_ORDER']._serialized_start=962
+  _globals['_ORDER']._serialized_end=1120
+  _globals['_ORDERS']._serialized_start=1122
+  _globals['_ORDERS']._serialized_end=1246
+  _globals['_INVENTORYSYSTEM']._serialized_start=1335
+  _globals['_INVENTORYSYSTEM']._serialized_end=3013
 # @@protoc_insertion_point(module_scope)
@@ -1,224 +1,1042 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
 import grpc
+import warnings
+
 import inventory_system_pb2 as inventory__system__pb2
 
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
 
-class InventorySystemStub(object):
-  """A service that allows you to keep track of an inventory of products and the orders for those products 
-  """
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
 
-  def __init__(self, channel):
-    """Constructor.
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in inventory_system_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
 
-    Args:
-      channel: A grpc.Channel.
-    """
-    self.GetProductsByID = channel.unary_unary(
-        '/InventorySystem.InventorySystem/GetProductsByID',
-        request_serializer=inventory__system__pb2.IDs.SerializeToString,
-        response_deserializer=inventory__system__pb2.Products.FromString,
-        )
-    self.GetProductsByName = channel.unary_unary(
-        '/InventorySystem.InventorySystem/GetProductsByName',
-        request_serializer=inventory__system__pb2.Names.SerializeToString,
-        response_deserializer=inventory__system__pb2.Products.FromString,
-        )
-    self.GetProductsByManufacturer = channel.unary_unary(
-        '/InventorySystem.InventorySystem/GetProductsByManufacturer',
-        request_serializer=inventory__system__pb2.Manufacturer.SerializeToString,
-        response_deserializer=inventory__system__pb2.Products.FromString,
-        )
-    self.AddProducts = channel.unary_unary(
-        '/InventorySystem.InventorySystem/AddProducts',
-        request_serializer=inventory__system__pb2.Products.SerializeToString,
-        response_deserializer=inventory__system__pb2.IDs.FromString,
-        )
-    self.UpdateProducts = channel.unary_unary(
-        '/InventorySystem.InventorySystem/UpdateProducts',
-        request_serializer=inventory__system__pb2.Products.SerializeToString,
-        response_deserializer=inventory__system__pb2.Empty.FromString,
-        )
-    self.GetProductsInStock = channel.unary_unary(
-        '/InventorySystem.InventorySystem/GetProductsInStock',
-        request_serializer=inventory__system__pb2.Empty.SerializeToString,
-        response_deserializer=inventory__system__pb2.Products.FromString,
-        )
-    self.GetOrdersByID = channel.unary_unary(
-        '/InventorySystem.InventorySystem/GetOrdersByID',
-        request_serializer=inventory__system__pb2.IDs.SerializeToString,
-        response_deserializer=inventory__system__pb2.Orders.FromString,
-        )
-    self.CreateOrders = channel.unary_unary(
-        '/InventorySystem.InventorySystem/CreateOrders',
-        request_serializer=inventory__system__pb2.Orders.SerializeToString,
-        response_deserializer=inventory__system__pb2.IDs.FromString,
-        )
-    self.UpdateOrders = channel.unary_unary(
-        '/InventorySystem.InventorySystem/UpdateOrders',
-        request_serializer=inventory__system__pb2.Orders.SerializeToString,
-        response_deserializer=inventory__system__pb2.Empty.FromString,
-        )
-    self.GetOrdersByStatus = channel.unary_unary(
-        '/InventorySystem.InventorySystem/GetOrdersByStatus',
-        request_serializer=inventory__system__pb2.OrderStatus.SerializeToString,
-        response_deserializer=inventory__system__pb2.Orders.FromString,
-        )
-    self.ClearDatabase = channel.unary_unary(
-        '/InventorySystem.InventorySystem/ClearDatabase',
-        request_serializer=inventory__system__pb2.Empty.SerializeToString,
-        response_deserializer=inventory__system__pb2.Empty.FromString,
-        )
-
-
-class InventorySystemServicer(object):
-  """A service that allows you to keep track of an inventory of products and the orders for those products 
-  """
-
-  def GetProductsByID(self, request, context):
-    """Gets products by their IDs 
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
 
-  def GetProductsByName(self, request, context):
-    """Gets products by their names 
+class InventorySystemStub:
+    """A service that allows you to keep track of an inventory of products and the orders for those products 
     """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
 
-  def GetProductsByManufacturer(self, request, context):
-    """Retrieves all products from a given manufacturer 
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def AddProducts(self, request, context):
-    """Adds new products that do not have the same names as previous products and the IDs are
-    assigned by the server; returns the IDs of the products if they were added successfully
-    otherwise empty list of IDs 
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetProductsByID = channel.unary_unary(
+                '/InventorySystem.InventorySystem/GetProductsByID',
+                request_serializer=inventory__system__pb2.IDs.SerializeToString,
+                response_deserializer=inventory__system__pb2.Products.FromString,
+                _registered_method=True)
+        self.GetProductsByName = channel.unary_unary(
+                '/InventorySystem.InventorySystem/GetProductsByName',
+                request_serializer=inventory__system__pb2.Names.SerializeToString,
+                response_deserializer=inventory__system__pb2.Products.FromString,
+                _registered_method=True)
+        self.GetProductsByManufacturer = channel.unary_unary(
+                '/InventorySystem.InventorySystem/GetProductsByManufacturer',
+                request_serializer=inventory__system__pb2.Manufacturer.SerializeToString,
+                response_deserializer=inventory__system__pb2.Products.FromString,
+                _registered_method=True)
+        self.AddProducts = channel.unary_unary(
+                '/InventorySystem.InventorySystem/AddProducts',
+                request_serializer=inventory__system__pb2.Products.SerializeToString,
+                response_deserializer=inventory__system__pb2.IDs.FromString,
+                _registered_method=True)
+        self.StreamAddProducts = channel.stream_unary(
+                '/InventorySystem.InventorySystem/StreamAddProducts',
+                request_serializer=inventory__system__pb2.Products.SerializeToString,
+                response_deserializer=inventory__system__pb2.IngestSummary.FromString,
+                _registered_method=True)
+        self.UpdateProducts = channel.unary_unary(
+                '/InventorySystem.InventorySystem/UpdateProducts',
+                request_serializer=inventory__system__pb2.Products.SerializeToString,
+                response_deserializer=inventory__system__pb2.IDs.FromString,
+                _registered_method=True)
+        self.GetProductsInStock = channel.unary_unary(
+                '/InventorySystem.InventorySystem/GetProductsInStock',
+                request_serializer=inventory__system__pb2.PageRequest.SerializeToString,
+                response_deserializer=inventory__system__pb2.Products.FromString,
+                _registered_method=True)
+        self.GetProducts = channel.unary_stream(
+                '/InventorySystem.InventorySystem/GetProducts',
+                request_serializer=inventory__system__pb2.Empty.SerializeToString,
+                response_deserializer=inventory__system__pb2.Products.FromString,
+                _registered_method=True)
+        self.StreamProductsInStock = channel.unary_stream(
+                '/InventorySystem.InventorySystem/StreamProductsInStock',
+                request_serializer=inventory__system__pb2.Empty.SerializeToString,
+                response_deserializer=inventory__system__pb2.Products.FromString,
+                _registered_method=True)
+        self.StreamProductsByManufacturer = channel.unary_stream(
+                '/InventorySystem.InventorySystem/StreamProductsByManufacturer',
+                request_serializer=inventory__system__pb2.Manufacturer.SerializeToString,
+                response_deserializer=inventory__system__pb2.Products.FromString,
+                _registered_method=True)
+        self.GetOrdersByID = channel.unary_unary(
+                '/InventorySystem.InventorySystem/GetOrdersByID',
+                request_serializer=inventory__system__pb2.IDs.SerializeToString,
+                response_deserializer=inventory__system__pb2.Orders.FromString,
+                _registered_method=True)
+        self.CreateOrders = channel.unary_unary(
+                '/InventorySystem.InventorySystem/CreateOrders',
+                request_serializer=inventory__system__pb2.Orders.SerializeToString,
+                response_deserializer=inventory__system__pb2.IDs.FromString,
+                _registered_method=True)
+        self.StreamCreateOrders = channel.stream_unary(
+                '/InventorySystem.InventorySystem/StreamCreateOrders',
+                request_serializer=inventory__system__pb2.Orders.SerializeToString,
+                response_deserializer=inventory__system__pb2.IngestSummary.FromString,
+                _registered_method=True)
+        self.AllocateOrders = channel.unary_unary(
+                '/InventorySystem.InventorySystem/AllocateOrders',
+                request_serializer=inventory__system__pb2.Orders.SerializeToString,
+                response_deserializer=inventory__system__pb2.Orders.FromString,
+                _registered_method=True)
+        self.UpdateOrders = channel.unary_unary(
+                '/InventorySystem.InventorySystem/UpdateOrders',
+                request_serializer=inventory__system__pb2.Orders.SerializeToString,
+                response_deserializer=inventory__system__pb2.IDs.FromString,
+                _registered_method=True)
+        self.SetOrderStatus = channel.unary_unary(
+                '/InventorySystem.InventorySystem/SetOrderStatus',
+                request_serializer=inventory__system__pb2.OrderStatusChange.SerializeToString,
+                response_deserializer=inventory__system__pb2.IDs.FromString,
+                _registered_method=True)
+        self.GetOrdersByStatus = channel.unary_unary(
+                '/InventorySystem.InventorySystem/GetOrdersByStatus',
+                request_serializer=inventory__system__pb2.OrderStatus.SerializeToString,
+                response_deserializer=inventory__system__pb2.Orders.FromString,
+                _registered_method=True)
+        self.GetOrdersByDateRange = channel.unary_unary(
+                '/InventorySystem.InventorySystem/GetOrdersByDateRange',
+                request_serializer=inventory__system__pb2.DateRange.SerializeToString,
+                response_deserializer=inventory__system__pb2.Orders.FromString,
+                _registered_method=True)
+        self.GetOrders = channel.unary_stream(
+                '/InventorySystem.InventorySystem/GetOrders',
+                request_serializer=inventory__system__pb2.Empty.SerializeToString,
+                response_deserializer=inventory__system__pb2.Orders.FromString,
+                _registered_method=True)
+        self.StreamOrdersByStatus = channel.unary_stream(
+                '/InventorySystem.InventorySystem/StreamOrdersByStatus',
+                request_serializer=inventory__system__pb2.OrderStatus.SerializeToString,
+                response_deserializer=inventory__system__pb2.Orders.FromString,
+                _registered_method=True)
+        self.StreamOrdersByDateRange = channel.unary_stream(
+                '/InventorySystem.InventorySystem/StreamOrdersByDateRange',
+                request_serializer=inventory__system__pb2.DateRange.SerializeToString,
+                response_deserializer=inventory__system__pb2.Orders.FromString,
+                _registered_method=True)
+        self.ClearDatabase = channel.unary_unary(
+                '/InventorySystem.InventorySystem/ClearDatabase',
+                request_serializer=inventory__system__pb2.Empty.SerializeToString,
+                response_deserializer=inventory__system__pb2.Empty.FromString,
+                _registered_method=True)
 
-  def UpdateProducts(self, request, context):
-    """Updates products (name and ID cannot be updated) 
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
 
-  def GetProductsInStock(self, request, context):
-    """Retrieves all products that are in stock  
+class InventorySystemServicer:
+    """A service that allows you to keep track of an inventory of products and the orders for those products 
     """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
 
-  def GetOrdersByID(self, request, context):
-    """Future work: Create function to get all products no matter the stock
-    rpc GetProducts (Empty) returns (Products) {}
+    def GetProductsByID(self, request, context):
+        """Gets products by their IDs 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
 
-    Gets orders by their ID 
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
+    def GetProductsByName(self, request, context):
+        """Gets products by their names 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
 
-  def CreateOrders(self, request, context):
-    """Creates orders if there is enough product in stock with IDs assigned by the server;
-    returns the IDs of the orders if they were added successfully otherwise empty list 
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
+    def GetProductsByManufacturer(self, request, context):
+        """Retrieves all products from a given manufacturer, or a page of them sorted by ID if page_size is set 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
 
-  def UpdateOrders(self, request, context):
-    """Update orders (ID cannot be updated) and if there is not enough product the order is not updated 
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
+    def AddProducts(self, request, context):
+        """Adds new products that do not have the same names as previous products and the IDs are
+        assigned by the server; returns the ID of each product in the order they were sent, or empty
+        bytes for a product that was not added 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
 
-  def GetOrdersByStatus(self, request, context):
-    """Retrieves all orders that are unshipped, unpaid, or both  
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
+    def StreamAddProducts(self, request_iterator, context):
+        """Adds the products of a stream of messages like AddProducts, committing them in chunks as they
+        arrive; returns the ID of each product in the order they were sent, or empty bytes for a product
+        that was not added, once the stream ends 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
 
-  def ClearDatabase(self, request, context):
-    """Future work: create GetOrders that returns all orders
-    rpc GetOrders (Empty) returns (Orders) {}
+    def UpdateProducts(self, request, context):
+        """Updates products (name and ID cannot be updated); returns the ID of each product in the
+        order they were sent, or empty bytes for a product that was not found or, if check_version
+        is set, is not at the version that was sent. Every product that is updated gets a new version 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
 
-    Clears inventory system database 
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
+    def GetProductsInStock(self, request, context):
+        """Retrieves all products that are in stock, or a page of them sorted by ID if page_size is set 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetProducts(self, request, context):
+        """Streams all products no matter the stock, a chunk of products per message 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamProductsInStock(self, request, context):
+        """Streams the products that are in stock like GetProductsInStock, a chunk of products per message 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamProductsByManufacturer(self, request, context):
+        """Streams the products from a given manufacturer like GetProductsByManufacturer, a chunk of products
+        per message 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetOrdersByID(self, request, context):
+        """Gets orders by their ID 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CreateOrders(self, request, context):
+        """Creates orders if there is enough product in stock with IDs assigned by the server;
+        returns the ID of each order in the order they were sent, or empty bytes for an order
+        that was not created 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamCreateOrders(self, request_iterator, context):
+        """Creates the orders of a stream of messages like CreateOrders, each with the policy of its message,
+        committing them in chunks as they arrive; returns the ID of each order in the order they were
+        sent, or empty bytes for an order that was not created, once the stream ends 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AllocateOrders(self, request, context):
+        """Creates orders like CreateOrders; returns each order in the order they were sent with its ID
+        and the amount of each product allocated to it, or with an empty ID and no products for an
+        order that was not created 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdateOrders(self, request, context):
+        """Update orders (ID cannot be updated) and if there is not enough product the order is not updated;
+        returns the ID of each order in the order they were sent, or empty bytes for an order that
+        was not updated 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetOrderStatus(self, request, context):
+        """Sets whether orders are paid and whether they are shipped with one statement, leaving a status
+        that is not sent unchanged; returns the IDs of the orders that were changed 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetOrdersByStatus(self, request, context):
+        """Retrieves all orders that are unshipped, unpaid, or both, or a page of them sorted by ID if page_size
+        is set 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetOrdersByDateRange(self, request, context):
+        """Retrieves all orders placed from the start date to the end date (inclusive) sorted by date 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetOrders(self, request, context):
+        """Streams all orders, a chunk of orders per message 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamOrdersByStatus(self, request, context):
+        """Streams the orders with a given status like GetOrdersByStatus, a chunk of orders per message 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamOrdersByDateRange(self, request, context):
+        """Streams the orders placed in a date range like GetOrdersByDateRange, a chunk of orders per message 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ClearDatabase(self, request, context):
+        """Clears inventory system database 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
 
 
 def add_InventorySystemServicer_to_server(servicer, server):
-  rpc_method_handlers = {
-      'GetProductsByID': grpc.unary_unary_rpc_method_handler(
-          servicer.GetProductsByID,
-          request_deserializer=inventory__system__pb2.IDs.FromString,
-          response_serializer=inventory__system__pb2.Products.SerializeToString,
-      ),
-      'GetProductsByName': grpc.unary_unary_rpc_method_handler(
-          servicer.GetProductsByName,
-          request_deserializer=inventory__system__pb2.Names.FromString,
-          response_serializer=inventory__system__pb2.Products.SerializeToString,
-      ),
-      'GetProductsByManufacturer': grpc.unary_unary_rpc_method_handler(
-          servicer.GetProductsByManufacturer,
-          request_deserializer=inventory__system__pb2.Manufacturer.FromString,
-          response_serializer=inventory__system__pb2.Products.SerializeToString,
-      ),
-      'AddProducts': grpc.unary_unary_rpc_method_handler(
-          servicer.AddProducts,
-          request_deserializer=inventory__system__pb2.Products.FromString,
-          response_serializer=inventory__system__pb2.IDs.SerializeToString,
-      ),
-      'UpdateProducts': grpc.unary_unary_rpc_method_handler(
-          servicer.UpdateProducts,
-          request_deserializer=inventory__system__pb2.Products.FromString,
-          response_serializer=inventory__system__pb2.Empty.SerializeToString,
-      ),
-      'GetProductsInStock': grpc.unary_unary_rpc_method_handler(
-          servicer.GetProductsInStock,
-          request_deserializer=inventory__system__pb2.Empty.FromString,
-          response_serializer=inventory__system__pb2.Products.SerializeToString,
-      ),
-      'GetOrdersByID': grpc.unary_unary_rpc_method_handler(
-          servicer.GetOrdersByID,
-          request_deserializer=inventory__system__pb2.IDs.FromString,
-          response_serializer=inventory__system__pb2.Orders.SerializeToString,
-      ),
-      'CreateOrders': grpc.unary_unary_rpc_method_handler(
-          servicer.CreateOrders,
-          request_deserializer=inventory__system__pb2.Orders.FromString,
-          response_serializer=inventory__system__pb2.IDs.SerializeToString,
-      ),
-      'UpdateOrders': grpc.unary_unary_rpc_method_handler(
-          servicer.UpdateOrders,
-          request_deserializer=inventory__system__pb2.Orders.FromString,
-          response_serializer=inventory__system__pb2.Empty.SerializeToString,
-      ),
-      'GetOrdersByStatus': grpc.unary_unary_rpc_method_handler(
-          servicer.GetOrdersByStatus,
-          request_deserializer=inventory__system__pb2.OrderStatus.FromString,
-          response_serializer=inventory__system__pb2.Orders.SerializeToString,
-      ),
-      'ClearDatabase': grpc.unary_unary_rpc_method_handler(
-          servicer.ClearDatabase,
-          request_deserializer=inventory__system__pb2.Empty.FromString,
-          response_serializer=inventory__system__pb2.Empty.SerializeToString,
-      ),
-  }
-  generic_handler = grpc.method_handlers_generic_handler(
-      'InventorySystem.InventorySystem', rpc_method_handlers)
-  server.add_generic_rpc_handlers((generic_handler,))
+    rpc_method_handlers = {
+            'GetProductsByID': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetProductsByID,
+                    request_deserializer=inventory__system__pb2.IDs.FromString,
+                    response_serializer=inventory__system__pb2.Products.SerializeToString,
+            ),
+            'GetProductsByName': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetProductsByName,
+                    request_deserializer=inventory__system__pb2.Names.FromString,
+                    response_serializer=inventory__system__pb2.Products.SerializeToString,
+            ),
+            'GetProductsByManufacturer': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetProductsByManufacturer,
+                    request_deserializer=inventory__system__pb2.Manufacturer.FromString,
+                    response_serializer=inventory__system__pb2.Products.SerializeToString,
+            ),
+            'AddProducts': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddProducts,
+                    request_deserializer=inventory__system__pb2.Products.FromString,
+                    response_serializer=inventory__system__pb2.IDs.SerializeToString,
+            ),
+            'StreamAddProducts': grpc.stream_unary_rpc_method_handler(
+                    servicer.StreamAddProducts,
+                    request_deserializer=inventory__system__pb2.Products.FromString,
+                    response_serializer=inventory__system__pb2.IngestSummary.SerializeToString,
+            ),
+            'UpdateProducts': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateProducts,
+                    request_deserializer=inventory__system__pb2.Products.FromString,
+                    response_serializer=inventory__system__pb2.IDs.SerializeToString,
+            ),
+            'GetProductsInStock': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetProductsInStock,
+                    request_deserializer=inventory__system__pb2.PageRequest.FromString,
+                    response_serializer=inventory__system__pb2.Products.SerializeToString,
+            ),
+            'GetProducts': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetProducts,
+                    request_deserializer=inventory__system__pb2.Empty.FromString,
+                    response_serializer=inventory__system__pb2.Products.SerializeToString,
+            ),
+            'StreamProductsInStock': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamProductsInStock,
+                    request_deserializer=inventory__system__pb2.Empty.FromString,
+                    response_serializer=inventory__system__pb2.Products.SerializeToString,
+            ),
+            'StreamProductsByManufacturer': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamProductsByManufacturer,
+                    request_deserializer=inventory__system__pb2.Manufacturer.FromString,
+                    response_serializer=inventory__system__pb2.Products.SerializeToString,
+            ),
+            'GetOrdersByID': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetOrdersByID,
+                    request_deserializer=inventory__system__pb2.IDs.FromString,
+                    response_serializer=inventory__system__pb2.Orders.SerializeToString,
+            ),
+            'CreateOrders': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateOrders,
+                    request_deserializer=inventory__system__pb2.Orders.FromString,
+                    response_serializer=inventory__system__pb2.IDs.SerializeToString,
+            ),
+            'StreamCreateOrders': grpc.stream_unary_rpc_method_handler(
+                    servicer.StreamCreateOrders,
+                    request_deserializer=inventory__system__pb2.Orders.FromString,
+                    response_serializer=inventory__system__pb2.IngestSummary.SerializeToString,
+            ),
+            'AllocateOrders': grpc.unary_unary_rpc_method_handler(
+                    servicer.AllocateOrders,
+                    request_deserializer=inventory__system__pb2.Orders.FromString,
+                    response_serializer=inventory__system__pb2.Orders.SerializeToString,
+            ),
+            'UpdateOrders': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateOrders,
+                    request_deserializer=inventory__system__pb2.Orders.FromString,
+                    response_serializer=inventory__system__pb2.IDs.SerializeToString,
+            ),
+            'SetOrderStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetOrderStatus,
+                    request_deserializer=inventory__system__pb2.OrderStatusChange.FromString,
+                    response_serializer=inventory__system__pb2.IDs.SerializeToString,
+            ),
+            'GetOrdersByStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetOrdersByStatus,
+                    request_deserializer=inventory__system__pb2.OrderStatus.FromString,
+                    response_serializer=inventory__system__pb2.Orders.SerializeToString,
+            ),
+            'GetOrdersByDateRange': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetOrdersByDateRange,
+                    request_deserializer=inventory__system__pb2.DateRange.FromString,
+                    response_serializer=inventory__system__pb2.Orders.SerializeToString,
+            ),
+            'GetOrders': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetOrders,
+                    request_deserializer=inventory__system__pb2.Empty.FromString,
+                    response_serializer=inventory__system__pb2.Orders.SerializeToString,
+            ),
+            'StreamOrdersByStatus': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamOrdersByStatus,
+                    request_deserializer=inventory__system__pb2.OrderStatus.FromString,
+                    response_serializer=inventory__system__pb2.Orders.SerializeToString,
+            ),
+            'StreamOrdersByDateRange': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamOrdersByDateRange,
+                    request_deserializer=inventory__system__pb2.DateRange.FromString,
+                    response_serializer=inventory__system__pb2.Orders.SerializeToString,
+            ),
+            'ClearDatabase': grpc.unary_unary_rpc_method_handler(
+                    servicer.ClearDatabase,
+                    request_deserializer=inventory__system__pb2.Empty.FromString,
+                    response_serializer=inventory__system__pb2.Empty.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'InventorySystem.InventorySystem', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('InventorySystem.InventorySystem', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class InventorySystem:
+    """A service that allows you to keep track of an inventory of products and the orders for those products 
+    """
+
+    @staticmethod
+    def GetProductsByID(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/GetProductsByID',
+            inventory__system__pb2.IDs.SerializeToString,
+            inventory__system__pb2.Products.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetProductsByName(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/GetProductsByName',
+            inventory__system__pb2.Names.SerializeToString,
+            inventory__system__pb2.Products.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetProductsByManufacturer(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/GetProductsByManufacturer',
+            inventory__system__pb2.Manufacturer.SerializeToString,
+            inventory__system__pb2.Products.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AddProducts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/AddProducts',
+            inventory__system__pb2.Products.SerializeToString,
+            inventory__system__pb2.IDs.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamAddProducts(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/InventorySystem.InventorySystem/StreamAddProducts',
+            inventory__system__pb2.Products.SerializeToString,
+            inventory__system__pb2.IngestSummary.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UpdateProducts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/UpdateProducts',
+            inventory__system__pb2.Products.SerializeToString,
+            inventory__system__pb2.IDs.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetProductsInStock(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/GetProductsInStock',
+            inventory__system__pb2.PageRequest.SerializeToString,
+            inventory__system__pb2.Products.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetProducts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/GetProducts',
+            inventory__system__pb2.Empty.SerializeToString,
+            inventory__system__pb2.Products.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamProductsInStock(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/StreamProductsInStock',
+            inventory__system__pb2.Empty.SerializeToString,
+            inventory__system__pb2.Products.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamProductsByManufacturer(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/StreamProductsByManufacturer',
+            inventory__system__pb2.Manufacturer.SerializeToString,
+            inventory__system__pb2.Products.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetOrdersByID(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/GetOrdersByID',
+            inventory__system__pb2.IDs.SerializeToString,
+            inventory__system__pb2.Orders.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CreateOrders(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/CreateOrders',
+            inventory__system__pb2.Orders.SerializeToString,
+            inventory__system__pb2.IDs.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamCreateOrders(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/InventorySystem.InventorySystem/StreamCreateOrders',
+            inventory__system__pb2.Orders.SerializeToString,
+            inventory__system__pb2.IngestSummary.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AllocateOrders(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/AllocateOrders',
+            inventory__system__pb2.Orders.SerializeToString,
+            inventory__system__pb2.Orders.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UpdateOrders(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/UpdateOrders',
+            inventory__system__pb2.Orders.SerializeToString,
+            inventory__system__pb2.IDs.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetOrderStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/SetOrderStatus',
+            inventory__system__pb2.OrderStatusChange.SerializeToString,
+            inventory__system__pb2.IDs.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetOrdersByStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/GetOrdersByStatus',
+            inventory__system__pb2.OrderStatus.SerializeToString,
+            inventory__system__pb2.Orders.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetOrdersByDateRange(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/GetOrdersByDateRange',
+            inventory__system__pb2.DateRange.SerializeToString,
+            inventory__system__pb2.Orders.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetOrders(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/GetOrders',
+            inventory__system__pb2.Empty.SerializeToString,
+            inventory__system__pb2.Orders.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamOrdersByStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/StreamOrdersByStatus',
+            inventory__system__pb2.OrderStatus.SerializeToString,
+            inventory__system__pb2.Orders.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamOrdersByDateRange(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/StreamOrdersByDateRange',
+            inventory__system__pb2.DateRange.SerializeToString,
+            inventory__system__pb2.Orders.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ClearDatabase(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/InventorySystem.InventorySystem/ClearDatabase',
+            inventory__system__pb2.Empty.SerializeToString,
+            inventory__system__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
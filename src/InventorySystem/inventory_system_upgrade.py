@@ -0,0 +1,30 @@
+"""Upgrades an inventory system database created by an older version of the service to the current schema.
+The service also upgrades its database when it starts, but this allows a large database to be upgraded ahead of time.
+
+Author: Riley Kirkpatrick
+"""
+
+import argparse
+import inventory_system
+import sys
+from os import path
+
+
+def main():
+  parser = argparse.ArgumentParser(prog='inventory_system_upgrade',
+                                   description='Upgrades an inventory system database to the current schema')
+  parser.add_argument('-db', '--database_path', default='inventory_system.db', help='The file that the database is stored in.')
+  args = parser.parse_args()
+
+  if not path.exists(args.database_path):
+    print('There is no database at ' + args.database_path, file=sys.stderr)
+    sys.exit(1)
+  old_version, new_version = inventory_system.upgrade_inventory_system_db(args.database_path)
+  if old_version == new_version:
+    print('The database is already at schema version %d.' % new_version)
+  else:
+    print('Upgraded the database from schema version %d to %d.' % (old_version, new_version))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,97 @@
+"""Test the inventory system allocation policies.
+
+Author: Riley Kirkpatrick
+"""
+
+
+import inventory_system_allocation
+import numpy as np
+
+
+def allocate(policy, stock=[5, 5]):
+    # Order 0 fits, order 1 does not fit after order 0, order 2 fits in what is left, and order 3 gets nothing
+    # orders:   0     0     1     2     2     3
+    # products: 0     1     0     0     1     1
+    return inventory_system_allocation.allocate(stock, [0, 0, 1, 2, 2, 3], [0, 1, 0, 0, 1, 1], [3, 1, 3, 2, 4, 1],
+                                                policy).tolist()
+
+def test_policies():
+    assert(allocate('fifo') == [3, 1, 0, 2, 4, 0])
+    assert(allocate('all-or-nothing') == [0] * 6)
+    assert(allocate('all-or-nothing', [8, 6]) == [3, 1, 3, 2, 4, 1])
+    # Product 0 is split 15/8, 15/8, and 10/8 and product 1 is split 5/6, 20/6, and 5/6 before rounding
+    assert(allocate('proportional') == [2, 1, 2, 1, 4, 0])
+    assert(allocate('partial-fill') == [3, 1, 2, 0, 4, 0])
+    # Nothing is taken from a product that has enough stock for every order
+    for policy in inventory_system_allocation.POLICIES:
+        assert(allocate(policy, [100, 100]) == [3, 1, 3, 2, 4, 1])
+        assert(allocate(policy, [0, 0]) == [0] * 6)
+        assert(inventory_system_allocation.allocate([1], [], [], [], policy).tolist() == [])
+
+def test_large_batch():
+    # Every policy allocates at most the stock of each product and at most what each line requested
+    random = np.random.default_rng(0)
+    stock = random.integers(0, 1000, 500)
+    orders = np.repeat(np.arange(10000), 5)
+    products, amounts = random.integers(0, 500, len(orders)), random.integers(1, 10, len(orders))
+    for policy in inventory_system_allocation.POLICIES:
+        allocated = inventory_system_allocation.allocate(stock, orders, products, amounts, policy)
+        assert((allocated >= 0).all() and (allocated <= amounts).all())
+        assert((np.bincount(products, weights=allocated, minlength=len(stock)) <= stock).all())
+    # Whole orders are allocated by fifo
+    allocated = inventory_system_allocation.allocate(stock, orders, products, amounts, 'fifo')
+    filled = np.bincount(orders, weights=allocated == amounts)
+    assert(((filled == 0) | (filled == 5)).all())
+
+def test_large_amounts():
+    # Totals and shares of amounts that overflow int64 are exact, and lines that request nothing are allocated nothing
+    for policy, expected in [('fifo', [0, 0, 10, 0, 0]), ('all-or-nothing', [0] * 5),
+                             ('proportional', [5, 5, 0, 10, 0]), ('partial-fill', [10, 0, 0, 10, 0])]:
+        assert(inventory_system_allocation.allocate([10, 10], [0, 1, 2, 3, 4], [0, 0, 0, 1, 1],
+                                                    [2**62, 2**62, 10, 2**63, -1], policy).tolist() == expected)
+    assert(inventory_system_allocation.allocate([2**63 - 1], [0, 1], [0, 0], [2**62, 2**62], 'fifo').tolist() ==
+           [2**62, 0])
+    assert(inventory_system_allocation.allocate([10, 10], [0, 1], [0, 1], [2**62, 1], 'proportional').tolist() ==
+           [10, 1])
+
+def fifo(stock, orders, products, amounts):
+    # Allocates the orders one at a time in the order they were received
+    stock, allocated = list(stock), [0] * len(amounts)
+    for order in sorted(set(orders)):
+        lines = [i for i in range(len(orders)) if orders[i] == order]
+        requested = {}
+        for i in lines:
+            requested[products[i]] = requested.get(products[i], 0) + amounts[i]
+        if all(amount <= stock[product] for product, amount in requested.items()):
+            for product, amount in requested.items():
+                stock[product] -= amount
+            for i in lines:
+                allocated[i] = amounts[i]
+    return allocated
+
+def test_fifo():
+    # fifo allocates the same as allocating the orders one at a time, including orders with a product twice
+    random = np.random.default_rng(1)
+    for _ in range(50):
+        stock = random.integers(0, 20, 8)
+        orders = np.sort(random.integers(0, 40, 120))
+        products, amounts = random.integers(0, 8, len(orders)), random.integers(1, 6, len(orders))
+        assert(inventory_system_allocation.allocate(stock, orders, products, amounts, 'fifo').tolist() ==
+               fifo(stock.tolist(), orders.tolist(), products.tolist(), amounts.tolist()))
+
+def test_fifo_scale():
+    # Each product has 20 in stock and its orders alternate between one unit and all of what is left, so every other
+    # order is rejected only after the order before it is allocated
+    products = np.repeat(np.arange(1000), 40)
+    amounts = np.tile(np.stack([np.ones(20, dtype=np.int64), np.arange(20, 0, -1)], axis=1).ravel(), 1000)
+    orders, stock = np.arange(len(products)), np.full(1000, 20)
+    allocated = inventory_system_allocation.allocate(stock, orders, products, amounts, 'fifo')
+    assert(allocated.tolist() == [1, 0] * 20000)
+
+
+if __name__ == '__main__':
+    test_policies()
+    test_large_batch()
+    test_large_amounts()
+    test_fifo()
+    test_fifo_scale()
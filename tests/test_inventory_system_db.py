@@ -0,0 +1,442 @@
+"""Test the inventory system database functions.
+
+Author: Riley Kirkpatrick
+"""
+
+
+import datetime
+import inventory_system
+import inventory_system_pb2
+import pickle
+import sqlite3
+import tempfile
+import uuid
+from os import path
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from types import SimpleNamespace
+
+
+def new_database(directory, name='inventory_system.db'):
+    database_path = path.join(str(directory), name)
+    inventory_system.create_inventory_system_db(database_path)
+    return inventory_system.get_dbsession(database_path)
+
+def add_products(database, products):
+    return inventory_system.AddProducts(database, inventory_system.get_products_to_add(products))
+
+def date(month, day, year):
+    return inventory_system_pb2.Date(month=month, day=day, year=year)
+
+def new_order(products, date=date(-1, -1, -1), id=b'', is_paid=False, is_shipped=False):
+    # Products are (name, amount) tuples
+    return inventory_system_pb2.Order(id=id, destination='dest', date=date, is_paid=is_paid, is_shipped=is_shipped,
+                                      products=[inventory_system_pb2.Product(name=name, amount=amount)
+                                                for name, amount in products])
+
+def create_orders(database, *orders):
+    return inventory_system.CreateOrders(database, orders)
+
+def test_orders(tmp_path):
+    database = new_database(tmp_path)
+    ids = add_products(database, ['prod0,,,,,10', 'prod1,,,,,10', 'prod2,,,,,10'])
+    assert(len(ids) == 3)
+
+    # Products listed twice in an order are merged into one line
+    order_ids = create_orders(database, new_order([('prod0', 2), ('prod1', 3), ('prod0', 1)], date(1, 1, 2020)))
+    assert(len(order_ids) == 1)
+    order, = inventory_system.GetOrdersByID(database, order_ids)
+    assert({(product.name, product.amount) for product in order.products} == {('prod0', 3), ('prod1', 3)})
+    assert({product.name: product.amount for product in inventory_system.GetProductsInStock(database)} ==
+           {'prod0': 7, 'prod1': 7, 'prod2': 10})
+
+    # Orders for more than what is in stock are not created
+    assert(create_orders(database, new_order([('prod2', 11)])) == [b''])
+
+    # Updating an order only rewrites its changed lines and returns products dropped from the order to stock
+    assert(inventory_system.UpdateOrders(database, [new_order([('prod0', 1), ('prod2', 4)], date(1, 3, 2020), order_ids[0], True),
+                                                    new_order([('prod0', 1)], id=uuid.uuid4().bytes)]) == [order_ids[0], b''])
+    order, = inventory_system.GetOrdersByID(database, order_ids)
+    assert({(product.name, product.amount) for product in order.products} == {('prod0', 1), ('prod2', 4)})
+    assert(order.is_paid)
+    assert({product.name: product.amount for product in inventory_system.GetProductsInStock(database)} ==
+           {'prod0': 9, 'prod1': 10, 'prod2': 6})
+
+    # Orders are filtered and sorted by their dates in the database
+    later_ids = create_orders(database, new_order([('prod1', 1)], date(2, 1, 2020)), new_order([('prod1', 1)], date(1, 15, 2020)))
+    orders = list(inventory_system.GetOrdersByDateRange(database, date(1, 3, 2020), date(1, 31, 2020)))
+    assert([order.id for order in orders] == [order_ids[0], later_ids[1]])
+    assert(orders[0].date == datetime.date(2020, 1, 3))
+    assert(list(inventory_system.GetOrdersByDateRange(database, date(2, 30, 2020), date(3, 1, 2020))) == [])
+
+    # Rows read a chunk at a time still have their order lines loaded
+    orders = list(inventory_system.iterate_db(database, inventory_system.Order, chunk_size=2))
+    assert(sorted(sum(product.amount for product in order.products) for order in orders) == [1, 1, 5])
+
+    inventory_system.reset_db(database)
+    assert(list(inventory_system.GetOrdersByID(database, order_ids)) == [])
+    assert(database.query(inventory_system.OrderLine).count() == 0)
+    database.close()
+
+def test_create_orders_batch(tmp_path):
+    database = new_database(tmp_path, 'batch.db')
+    add_products(database, ['prod0,,,,,5', 'prod1,,,,,5'])
+    # Stock is checked in the order the orders were sent, so a later order cannot take stock reserved by an earlier one
+    order_ids = create_orders(database, new_order([('prod0', 3), ('prod1', 1)]), new_order([('prod0', 3)]),
+                              new_order([('prod0', 2), ('prod1', 4)]), new_order([('prod2', 1)]))
+    assert([len(id) for id in order_ids] == [16, 0, 16, 0])
+    orders = {order.id: order for order in inventory_system.GetOrdersByID(database, order_ids)}
+    assert([{(product.name, product.amount) for product in orders[id].products} for id in order_ids[::2]] ==
+           [{('prod0', 3), ('prod1', 1)}, {('prod0', 2), ('prod1', 4)}])
+    assert({product.name: product.amount for product in inventory_system.GetProductsByName(database, ['prod0', 'prod1'])} ==
+           {'prod0': 0, 'prod1': 0})
+    database.close()
+
+def test_create_orders_stock_changed(tmp_path):
+    database = new_database(tmp_path, 'changed.db')
+    add_products(database, ['prod0,,,,,5', 'prod1,,,,,5'])
+    # Another writer takes stock after the products are read, so only the orders that still fit are created
+    get_product_rows_db = inventory_system.get_product_rows_db
+    def get_product_rows_then_sell(database, products):
+        rows = get_product_rows_db(database, products)
+        database.execute(text('UPDATE product SET amount = 1 WHERE name = \'prod0\''))
+        return rows
+    inventory_system.get_product_rows_db = get_product_rows_then_sell
+    try:
+        order_ids = create_orders(database, new_order([('prod0', 1), ('prod1', 1)]),
+                                  new_order([('prod0', 1), ('prod1', 1)]), new_order([('prod1', 2)]))
+    finally:
+        inventory_system.get_product_rows_db = get_product_rows_db
+    assert([len(id) for id in order_ids] == [16, 0, 16])
+    assert({product.name: product.amount for product in inventory_system.GetProductsByName(database, ['prod0', 'prod1'])} ==
+           {'prod0': 0, 'prod1': 2})
+    assert(len(list(inventory_system.GetOrdersByID(database, order_ids))) == 2)
+
+    # Stock is never taken below zero, even when the order being updated was read before the stock changed
+    assert(inventory_system.UpdateOrders(database, [new_order([('prod0', 2)], id=order_ids[0])]) == [b''])
+    order, = inventory_system.GetOrdersByID(database, order_ids[:1])
+    assert({(product.name, product.amount) for product in order.products} == {('prod0', 1), ('prod1', 1)})
+    database.close()
+
+def test_allocate_orders(tmp_path):
+    database = new_database(tmp_path, 'allocate.db')
+    add_products(database, ['prod0,,,,,5', 'prod1,,,,,5'])
+    orders = [new_order([('prod0', 4), ('prod1', 1)]), new_order([('prod0', 4)]), new_order([('prod1', 1), ('prod2', 1)])]
+    # Stock left after earlier orders is given to later orders in part and unknown products are left out
+    allocations = inventory_system.AllocateOrders(database, orders, 'partial-fill')
+    assert([len(id) for id, _ in allocations] == [16, 16, 16])
+    assert([{(product.name, product.amount) for product in products.values()} for _, products in allocations] ==
+           [{('prod0', 4), ('prod1', 1)}, {('prod0', 1)}, {('prod1', 1)}])
+    order, = inventory_system.GetOrdersByID(database, [allocations[1][0]])
+    assert({(product.name, product.amount) for product in order.products} == {('prod0', 1)})
+    # No orders are created unless all of them fit
+    assert(inventory_system.CreateOrders(database, orders[2:] + orders[:1], 'all-or-nothing') == [b''] * 2)
+    assert({product.name: product.amount for product in inventory_system.GetProductsByName(database, ['prod0', 'prod1'])} ==
+           {'prod0': 0, 'prod1': 3})
+    # Amounts too large for int64 totals are allocated exactly, so stock is never added back by a negative line
+    add_products(database, ['prod2,,,,,10'])
+    large = [new_order([('prod2', 2**62)]), new_order([('prod2', 2**62), ('prod2', 2**62)]), new_order([('prod2', 1)])]
+    allocations = inventory_system.AllocateOrders(database, large, 'proportional')
+    assert([[product.amount for product in products.values()] for _, products in allocations] == [[4], [6], []])
+    assert([product.amount for product in inventory_system.GetProductsByName(database, ['prod2'])] == [0])
+    database.close()
+
+def test_update_orders_batch(tmp_path):
+    database = new_database(tmp_path, 'update_orders.db')
+    add_products(database, ['prod0,,,,,6', 'prod1,,,,,6'])
+    order_ids = create_orders(database, new_order([('prod0', 2)]), new_order([('prod0', 2), ('prod1', 2)]))
+    # Stock returned by an earlier order in the request can be used by a later one, and an order listed twice is
+    # changed from the lines it was given the first time
+    ids = inventory_system.UpdateOrders(database, [
+        new_order([('prod1', 3)], id=order_ids[0]), new_order([('prod0', 4)], id=order_ids[1], is_shipped=True),
+        new_order([('prod1', 7)], id=order_ids[0]), new_order([('prod1', 2)], id=order_ids[0])])
+    assert(ids == [order_ids[0], order_ids[1], b'', order_ids[0]])
+    orders = {order.id: order for order in inventory_system.GetOrdersByID(database, order_ids)}
+    assert({(product.name, product.amount) for product in orders[order_ids[0]].products} == {('prod1', 2)})
+    assert({(product.name, product.amount) for product in orders[order_ids[1]].products} == {('prod0', 4)})
+    assert([orders[id].is_shipped for id in order_ids] == [False, True])
+    assert({product.name: product.amount for product in inventory_system.GetProductsByName(database, ['prod0', 'prod1'])} ==
+           {'prod0': 2, 'prod1': 4})
+    database.close()
+
+def test_set_order_status(tmp_path):
+    database = new_database(tmp_path, 'status.db')
+    add_products(database, ['prod0,,,,,10'])
+    ids = create_orders(database, *[new_order([('prod0', 1)], is_paid=i == 0) for i in range(3)])
+    # Only orders that are found and have another status are changed, and each is listed once
+    unknown = uuid.uuid4().bytes
+    assert(inventory_system.SetOrderStatus(database, ids + [ids[1], unknown], is_paid=True) == ids[1:])
+    assert(inventory_system.SetOrderStatus(database, ids, is_paid=True) == [])
+    assert(inventory_system.SetOrderStatus(database, ids[:2], is_shipped=True) == ids[:2])
+    assert(inventory_system.SetOrderStatus(database, ids) == [])
+    orders = {order.id: (order.is_paid, order.is_shipped) for order in inventory_system.GetOrdersByID(database, ids)}
+    assert(orders == {ids[0]: (True, True), ids[1]: (True, True), ids[2]: (True, False)})
+    chunk_size = inventory_system.QUERY_CHUNK_SIZE
+    inventory_system.QUERY_CHUNK_SIZE = 2
+    try:
+        assert(inventory_system.SetOrderStatus(database, ids, is_paid=False, is_shipped=False) == ids)
+    finally:
+        inventory_system.QUERY_CHUNK_SIZE = chunk_size
+    assert(list(inventory_system.GetOrdersByStatus(database, inventory_system_pb2.OrderStatus(paid=True))) == [])
+    database.close()
+
+def test_get_products_and_orders(tmp_path):
+    database = new_database(tmp_path, 'all.db')
+    add_products(database, ['prod0,,,,,5', 'prod1,,,,,0', 'prod2,,,,,1'])
+    ids = create_orders(database, new_order([('prod0', 1)]), new_order([('prod2', 1)]))
+    # Products are returned no matter the stock
+    assert({product.name: product.amount for product in inventory_system.GetProducts(database)} ==
+           {'prod0': 4, 'prod1': 0, 'prod2': 0})
+    assert({order.id for order in inventory_system.GetOrders(database)} == set(ids))
+    chunks = list(inventory_system.iterate_chunks(inventory_system.GetProducts(database), 2))
+    assert([len(chunk) for chunk in chunks] == [2, 1])
+    assert(list(inventory_system.iterate_chunks(iter([]))) == [])
+    database.close()
+
+def test_add_products(tmp_path):
+    database = new_database(tmp_path, 'products.db')
+    ids = add_products(database, ['prod0,,,,,1', 'prod1,,,,,1'])
+    assert(all(len(id) == 16 for id in ids))
+
+    # Products with names that are already used, in the database or earlier in the request, are not added
+    chunk_size = inventory_system.INSERT_CHUNK_SIZE
+    inventory_system.INSERT_CHUNK_SIZE = 2
+    try:
+        new_ids = add_products(database, ['prod1,,,,,5', 'prod2,,,,,5', 'prod3,,,,,5', 'prod2,,,,,7', 'prod4,,,,,5'])
+    finally:
+        inventory_system.INSERT_CHUNK_SIZE = chunk_size
+    assert([len(id) for id in new_ids] == [0, 16, 16, 0, 16])
+    assert({product.name: product.amount for product in inventory_system.GetProductsInStock(database)} ==
+           {'prod0': 1, 'prod1': 1, 'prod2': 5, 'prod3': 5, 'prod4': 5})
+    assert({product.name for product in inventory_system.GetProductsByID(database, new_ids[1:3])} == {'prod2', 'prod3'})
+    database.close()
+
+def test_update_products(tmp_path):
+    database = new_database(tmp_path, 'update.db')
+    ids = add_products(database, ['prod0,,m,1,2,3', 'prod1,,m,1,2,3', 'prod2,,m,1,2,3'])
+    # Products are matched by ID or by name and negative numbers or empty strings leave a value unchanged
+    assert(inventory_system.UpdateProducts(database, [
+        inventory_system_pb2.Product(id=ids[0], description='d', wholesale_cost=-1, sale_cost=5, amount=-1),
+        inventory_system_pb2.Product(name='prod1', wholesale_cost=-1, sale_cost=6, amount=-1),
+        inventory_system_pb2.Product(name='prod2', manufacturer='n', wholesale_cost=7, sale_cost=-1, amount=0),
+        inventory_system_pb2.Product(name='prod3', wholesale_cost=-1, sale_cost=-1, amount=-1)]) == ids + [b''])
+    products = {product.name: product for product in inventory_system.GetProductsByID(database, ids)}
+    assert([products['prod0'].description, products['prod0'].sale_cost, products['prod0'].amount] == ['d', 5, 3])
+    assert([products['prod1'].description, products['prod1'].sale_cost, products['prod1'].amount] == ['', 6, 3])
+    assert([products['prod2'].manufacturer, products['prod2'].wholesale_cost, products['prod2'].amount] == ['n', 7, 0])
+    assert({product.version for product in products.values()} == {2})
+
+    # With check_version a product is only updated if it is still at the version that was passed
+    assert(inventory_system.UpdateProducts(database, [
+        inventory_system_pb2.Product(id=ids[0], wholesale_cost=-1, sale_cost=-1, amount=10, version=2),
+        inventory_system_pb2.Product(id=ids[1], wholesale_cost=-1, sale_cost=-1, amount=10, version=1)],
+        check_version=True) == [ids[0], b''])
+    products = {product.name: product for product in inventory_system.GetProductsByID(database, ids)}
+    assert([products['prod0'].amount, products['prod0'].version] == [10, 3])
+    assert([products['prod1'].amount, products['prod1'].version] == [3, 2])
+    # Products that keep changing while they are updated are read again a limited number of times
+    update_products, attempts = inventory_system.update_products, []
+    inventory_system.update_products = lambda *args: attempts.append(args)
+    try:
+        assert(inventory_system.UpdateProducts(database, [inventory_system_pb2.Product(id=ids[0], amount=1)]) is None)
+    finally:
+        inventory_system.update_products = update_products
+    assert(len(attempts) == inventory_system.UPDATE_PRODUCTS_ATTEMPTS)
+    # Orders change the version along with the stock, so the stock read before an order is not written back over it
+    create_orders(database, new_order([('prod0', 1)]))
+    product, = inventory_system.GetProductsByID(database, ids[:1])
+    assert([product.amount, product.version] == [9, 4])
+    assert(inventory_system.UpdateProducts(database, [inventory_system_pb2.Product(
+        id=ids[0], wholesale_cost=-1, sale_cost=-1, amount=10, version=3)], check_version=True) == [b''])
+    product, = inventory_system.GetProductsByID(database, ids[:1])
+    assert([product.amount, product.version] == [9, 4])
+    database.close()
+
+def query_plan(database_path, query):
+    connection = sqlite3.connect(database_path)
+    plan = ' '.join(row[-1] for row in connection.execute('EXPLAIN QUERY PLAN ' + query))
+    connection.close()
+    return plan
+
+def test_secondary_indexes(tmp_path):
+    database_path = path.join(str(tmp_path), 'indexes.db')
+    inventory_system.create_inventory_system_db(database_path)
+    assert('ix_product_manufacturer' in query_plan(database_path, 'SELECT * FROM product WHERE manufacturer = \'m\''))
+    assert('ix_product_in_stock' in query_plan(database_path, 'SELECT * FROM product WHERE amount > 0'))
+    assert('ix_order_status' in query_plan(database_path, 'SELECT * FROM "order" WHERE is_paid = 1 AND is_shipped = 0'))
+
+    database = inventory_system.get_dbsession(database_path)
+    add_products(database, ['prod0,,,,,10'])
+    order_ids = create_orders(database, new_order([('prod0', 1)], is_paid=True),
+                              new_order([('prod0', 1)], is_paid=True, is_shipped=True), new_order([('prod0', 1)]))
+    orders_by_status = lambda paid, shipped: [order.id for order in inventory_system.GetOrdersByStatus(
+        database, SimpleNamespace(paid=paid, shipped=shipped))]
+    assert(orders_by_status(True, True) == [order_ids[1]])
+    assert(set(orders_by_status(True, False)) == set(order_ids[:2]))
+    assert(orders_by_status(False, False) == [order_ids[2]])
+    database.close()
+
+def read_pages(read_page, page_size):
+    # Reads every page with read_page(page_size, page_token) and returns the pages
+    pages, page_token = [], b''
+    while True:
+        page, page_token = read_page(page_size, page_token)
+        pages.append(page)
+        if len(page_token) == 0:
+            return pages
+
+def test_keyset_pages(tmp_path):
+    database_path = path.join(str(tmp_path), 'pages.db')
+    inventory_system.create_inventory_system_db(database_path)
+    # Pages are read from the indexes sorted by ID after the rows before them instead of skipping those rows
+    assert('ix_product_manufacturer' in query_plan(database_path, 'SELECT * FROM product WHERE manufacturer = \'m\' '
+                                                                  'AND id > x\'00\' ORDER BY id LIMIT 3'))
+    assert('ix_product_in_stock' in query_plan(database_path, 'SELECT * FROM product WHERE amount > 0 '
+                                                              'AND id > x\'00\' ORDER BY id LIMIT 3'))
+    assert('ix_order_status' in query_plan(database_path, 'SELECT * FROM "order" WHERE is_paid = 1 AND is_shipped = 0 '
+                                                          'AND id > x\'00\' ORDER BY id LIMIT 3'))
+    # Orders looked up by one status flag are paged from the index of that flag without sorting the rest of the orders
+    for column, index in [('is_paid', 'ix_order_paid'), ('is_shipped', 'ix_order_shipped')]:
+        plan = query_plan(database_path, 'SELECT * FROM "order" WHERE ' + column + ' = 1 AND id > x\'00\' '
+                                         'ORDER BY id LIMIT 3')
+        assert(index + ' (' + column + '=? AND id>?)' in plan and not 'TEMP B-TREE' in plan)
+
+    database = inventory_system.get_dbsession(database_path)
+    ids = add_products(database, ['prod' + str(i) + ',,m,,,' + str(i % 4) for i in range(10)])
+    in_stock = sorted(id for i, id in enumerate(ids) if i % 4 > 0)
+    pages = read_pages(lambda size, token: inventory_system.GetProductsInStockPage(database, size, token), 3)
+    assert([len(page) for page in pages] == [3, 3, 1])
+    assert([row.id for page in pages for row in page] == in_stock)
+    pages = read_pages(lambda size, token: inventory_system.GetProductsByManufacturerPage(database, 'm', size, token), 5)
+    assert([row.id for page in pages for row in page] == sorted(ids))
+    assert(inventory_system.GetProductsByManufacturerPage(database, 'none', 5) == ([], b''))
+
+    # A product added between pages is read in a later page if it sorts after the pages read and none are read twice
+    page, page_token = inventory_system.GetProductsInStockPage(database, 3)
+    id, = add_products(database, ['prod10,,m,,,100'])
+    pages = [page] + read_pages(lambda size, _: inventory_system.GetProductsInStockPage(database, size, page_token), 100)
+    read = [row.id for page in pages for row in page]
+    assert(read == [row.id for row in page] + sorted(product_id for product_id in in_stock + [id]
+                                                     if product_id > page_token))
+
+    order_ids = create_orders(database, *[new_order([('prod10', 1)], is_paid=i % 2 == 0) for i in range(7)])
+    pages = read_pages(lambda size, token: inventory_system.GetOrdersByStatusPage(
+        database, SimpleNamespace(paid=True, shipped=False), size, token), 2)
+    assert([len(page) for page in pages] == [2, 2])
+    assert([order.id for page in pages for order in page] == sorted(order_ids[::2]))
+
+    # Every product and every order are paged by ID, and the orders in a date range by date and then ID
+    pages = read_pages(lambda size, token: inventory_system.GetProductsPage(database, size, token), 4)
+    assert([row.id for page in pages for row in page] == sorted(ids + [id]))
+    pages = read_pages(lambda size, token: inventory_system.GetOrdersPage(database, size, token), 3)
+    assert([order.id for page in pages for order in page] == sorted(order_ids))
+    dated_ids = create_orders(database, *[new_order([('prod10', 1)], date(1, 1 + i % 3, 2021)) for i in range(9)])
+    pages = read_pages(lambda size, token: inventory_system.GetOrdersByDateRangePage(
+        database, date(1, 2, 2021), date(1, 3, 2021), size, token), 4)
+    assert([(order.date.day, order.id) for page in pages for order in page] ==
+           sorted((1 + i % 3, id) for i, id in enumerate(dated_ids) if i % 3 > 0))
+    assert('ix_order_date' in query_plan(database_path, 'SELECT * FROM "order" WHERE date BETWEEN 1 AND 2 '
+                                                        'AND (date, id) > (1, x\'00\') ORDER BY date, id LIMIT 3'))
+    database.close()
+
+def test_storage_profiles(tmp_path):
+    database_path = path.join(str(tmp_path), 'profiles.db')
+    inventory_system.create_inventory_system_db(database_path)
+    # synchronous is 0 for OFF, 1 for NORMAL, and 2 for FULL
+    for profile, synchronous in [('durable', 2), ('balanced', 1), ('throughput', 0)]:
+        database = inventory_system.get_dbsession(database_path, profile)
+        assert(database.execute(text('PRAGMA journal_mode')).scalar() == 'wal')
+        assert(database.execute(text('PRAGMA synchronous')).scalar() == synchronous)
+        assert(database.execute(text('PRAGMA cache_size')).scalar() ==
+               inventory_system.STORAGE_PROFILES[profile]['cache_size'])
+        assert(database.execute(text('PRAGMA foreign_keys')).scalar() == 1)
+        database.close()
+
+def test_read_only_sessions(tmp_path):
+    database_path = path.join(str(tmp_path), 'read_only.db')
+    inventory_system.create_inventory_system_db(database_path)
+    database = inventory_system.get_dbsession(database_path)
+    ids = add_products(database, ['prod0,,,,,5'])
+    readers = inventory_system.get_scoped_dbsession(database_path, read_only=True, connections=2)
+    # A reader keeps reading the database as it was when its transaction began and does not block the writer
+    assert([product.name for product in inventory_system.GetProductsByID(readers, ids)] == ['prod0'])
+    writer = inventory_system.get_dbsession(database_path, writer=True)
+    inventory_system.UpdateProducts(writer, [inventory_system_pb2.Product(id=ids[0], wholesale_cost=-1, sale_cost=-1,
+                                                                          amount=7)])
+    writer.close()
+    assert(readers.execute(text('SELECT amount FROM product')).scalar() == 5)
+    readers.remove()
+    assert(readers.execute(text('SELECT amount FROM product')).scalar() == 7)
+    try:
+        inventory_system.update_product_db(readers, {ids[0]: {'amount': 1}})
+        assert(False)
+    except OperationalError as e:
+        assert('readonly' in str(e))
+    readers.remove()
+    database.close()
+
+def test_upgrade_order_products(tmp_path):
+    # Build a database with the schema from before the order_line table existed
+    database_path = path.join(str(tmp_path), 'legacy.db')
+    connection = sqlite3.connect(database_path)
+    connection.execute('CREATE TABLE product (id VARCHAR(36) NOT NULL, name VARCHAR(50) NOT NULL, description '
+                       'VARCHAR(250), manufacturer VARCHAR(50), wholesale_cost FLOAT, sale_cost FLOAT, amount INTEGER, '
+                       'PRIMARY KEY (id, name))')
+    connection.execute('CREATE TABLE "order" (id VARCHAR(36) NOT NULL, destination VARCHAR(50) NOT NULL, date BLOB '
+                       'NOT NULL, is_paid BOOLEAN, is_shipped BOOLEAN, products BLOB NOT NULL, PRIMARY KEY (id))')
+    product_ids = [str(uuid.uuid4()) for i in range(3)]
+    order_id = str(uuid.uuid4())
+    # The third product has the same name as the second, so it is merged into the second when the names become unique
+    connection.executemany('INSERT INTO product VALUES (?, ?, \'\', \'\', 0, 0, ?)',
+                           [(product_ids[0], 'prod0', 5), (product_ids[1], 'prod1', 5), (product_ids[2], 'prod1', 2)])
+    order_date = pickle.dumps(inventory_system.OrderDate(month=4, day=20, year=2020))
+    # The second product was added by name only, which older versions stored with an empty ID
+    products = pickle.dumps([inventory_system.OrderProduct(id=product_ids[0], name='prod0', amount=1),
+                             inventory_system.OrderProduct(id='', name='prod1', amount=2),
+                             inventory_system.OrderProduct(id=product_ids[2], name='prod1', amount=1)])
+    connection.execute('INSERT INTO "order" VALUES (?, \'dest\', ?, 0, 0, ?)', (order_id, order_date, products))
+    connection.commit()
+    connection.close()
+
+    assert(inventory_system.upgrade_inventory_system_db(database_path) == (0, len(inventory_system.MIGRATIONS)))
+    # Upgrading an upgraded database does nothing
+    assert(inventory_system.upgrade_inventory_system_db(database_path) == (len(inventory_system.MIGRATIONS),) * 2)
+    assert('ix_product_in_stock' in query_plan(database_path, 'SELECT * FROM product WHERE amount > 0'))
+    assert('ix_order_date' in query_plan(database_path, 'SELECT * FROM "order" WHERE date > \'2020-01-01\''))
+    assert('ix_order_shipped' in query_plan(database_path, 'SELECT * FROM "order" WHERE is_shipped = 1 ORDER BY id'))
+    connection = sqlite3.connect(database_path)
+    assert(connection.execute('PRAGMA foreign_key_check').fetchall() == [])
+    connection.close()
+
+    database = inventory_system.get_dbsession(database_path)
+    product_ids = [uuid.UUID(id).bytes for id in product_ids]
+    assert({(product.id, product.name, product.amount, product.version)
+            for product in inventory_system.GetProductsInStock(database)} ==
+           {(product_ids[0], 'prod0', 5, 1), (product_ids[1], 'prod1', 7, 1)})
+    order, = inventory_system.GetOrdersByID(database, [uuid.UUID(order_id).bytes])
+    assert(order.destination == 'dest')
+    assert(order.date == datetime.date(2020, 4, 20))
+    assert({(product.id, product.name, product.amount) for product in order.products} ==
+           {(product_ids[0], 'prod0', 1), (product_ids[1], 'prod1', 3)})
+    database.close()
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        test_orders(directory)
+        test_create_orders_batch(directory)
+        test_create_orders_stock_changed(directory)
+        test_allocate_orders(directory)
+        test_update_orders_batch(directory)
+        test_set_order_status(directory)
+        test_get_products_and_orders(directory)
+        test_add_products(directory)
+        test_update_products(directory)
+        test_secondary_indexes(directory)
+        test_keyset_pages(directory)
+        test_storage_profiles(directory)
+        test_read_only_sessions(directory)
+        test_upgrade_order_products(directory)
+
+
+if __name__ == '__main__':
+    main()
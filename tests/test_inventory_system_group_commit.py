@@ -0,0 +1,74 @@
+"""Test the inventory system group commit.
+
+Author: Riley Kirkpatrick
+"""
+
+
+import inventory_system
+import inventory_system_group_commit
+import inventory_system_pb2
+import tempfile
+import threading
+from os import path
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def product_names(database):
+    return {product.name for product in inventory_system.GetProductsInStock(database)}
+
+def test_group_commit(tmp_path):
+    database_path = path.join(str(tmp_path), 'group.db')
+    inventory_system.create_inventory_system_db(database_path)
+    database = inventory_system.get_scoped_dbsession(database_path)
+    group_commit = inventory_system_group_commit.GroupCommitter(database_path, window=0.2)
+    commits = []
+    count_commit = lambda connection: commits.append(connection)
+    event.listen(Engine, 'commit', count_commit)
+
+    # Writes that arrive within the window share one commit and each caller gets its own result or error
+    def add_product(name):
+        return lambda database: inventory_system.AddProducts(database, [inventory_system_pb2.Product(name=name,
+                                                                                                     amount=1)])
+    def fail(database):
+        add_product('failed')(database)
+        raise ValueError('failed')
+    results = {}
+    def run(name, write):
+        try:
+            results[name] = group_commit.run(write)
+        except ValueError as e:
+            results[name] = e
+    writes = [('prod' + str(i), add_product('prod' + str(i))) for i in range(8)] + [('failed', fail)]
+    threads = [threading.Thread(target=run, args=write) for write in writes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    event.remove(Engine, 'commit', count_commit)
+    assert(len(commits) == 1)
+    assert(all(len(results['prod' + str(i)][0]) == 16 for i in range(8)))
+    assert(isinstance(results['failed'], ValueError))
+    assert(product_names(database) == {'prod' + str(i) for i in range(8)})
+
+    # A write that is rolled back with rollback_db only loses what it wrote since it was last saved
+    def rollback(database):
+        id, = add_product('saved')(database)
+        inventory_system.update_product_db(database, {id: {'amount': 5}})
+        inventory_system.rollback_db(database)
+        return id
+    id = group_commit.run(rollback)
+
+    # A write that is submitted is written while its caller keeps working and its result is waited for later
+    group_write = group_commit.submit(add_product('submitted'))
+    assert(len(group_commit.wait(group_write)[0]) == 16)
+    group_commit.close()
+    product, = inventory_system.GetProductsByID(database, [id])
+    assert([product.name, product.amount, product.version] == ['saved', 1, 1])
+    assert('submitted' in product_names(database))
+    database.remove()
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        test_group_commit(directory)
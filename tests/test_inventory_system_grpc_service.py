@@ -0,0 +1,203 @@
+"""Test the inventory system gRPC service.
+
+Author: Riley Kirkpatrick
+"""
+
+
+import grpc
+import inventory_system
+import inventory_system_grpc_service
+import inventory_system_pb2
+import inventory_system_pb2_grpc
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent import futures
+from os import path
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return str(s.getsockname()[1])
+
+def start_server(database_path, port, *flags):
+    # Starts the service in a new process and waits until it answers
+    server = subprocess.Popen([sys.executable, inventory_system_grpc_service.__file__, '-p', port, '-db', database_path]
+                              + list(flags))
+    channel = grpc.insecure_channel('localhost:' + port)
+    grpc.channel_ready_future(channel).result(timeout=30)
+    return server, inventory_system_pb2_grpc.InventorySystemStub(channel)
+
+def serve_in_process(inv_system):
+    # Serves an InventorySystem from a server in this process
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    inventory_system_pb2_grpc.add_InventorySystemServicer_to_server(inv_system, server)
+    port = str(server.add_insecure_port('localhost:0'))
+    server.start()
+    return server, inventory_system_pb2_grpc.InventorySystemStub(grpc.insecure_channel('localhost:' + port))
+
+def serving(port):
+    channel = grpc.insecure_channel('localhost:' + port)
+    try:
+        grpc.channel_ready_future(channel).result(timeout=2)
+        return True
+    except grpc.FutureTimeoutError:
+        return False
+    finally:
+        channel.close()
+
+def test_processes(tmp_path):
+    port = free_port()
+    server, stub = start_server(path.join(str(tmp_path), 'processes.db'), port, '-n', '2')
+    try:
+        stub.AddProducts(inventory_system_pb2.Products(products=[inventory_system_pb2.Product(name='prod0', amount=1)]))
+        assert([product.name for product in stub.GetProductsInStock(inventory_system_pb2.PageRequest()).products] ==
+               ['prod0'])
+        # Terminating the parent stops the server processes too
+        server.send_signal(signal.SIGTERM)
+        assert(server.wait(timeout=30) == 0)
+        assert(not serving(port))
+    finally:
+        server.kill()
+
+def test_asyncio(tmp_path):
+    port = free_port()
+    server, stub = start_server(path.join(str(tmp_path), 'asyncio.db'), port, '-a', '-w', '2')
+    try:
+        names = ['prod' + str(i) for i in range(1200)]
+        stub.AddProducts(inventory_system_pb2.Products(products=[inventory_system_pb2.Product(name=name, amount=i % 2)
+                                                                 for i, name in enumerate(names)]))
+        # Unary and streaming RPCs are served at the same time from the two workers
+        results = []
+        def read_products():
+            results.append(sorted(product.name for message in stub.GetProducts(inventory_system_pb2.Empty())
+                                  for product in message.products))
+            results.append(len(stub.GetProductsInStock(inventory_system_pb2.PageRequest()).products))
+        threads = [threading.Thread(target=read_products) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert(results.count(sorted(names)) == 8 and results.count(600) == 8)
+
+        # Client streams that are waiting for their next message do not hold the workers
+        release = threading.Event()
+        def idle_messages(name):
+            yield inventory_system_pb2.Products(products=[inventory_system_pb2.Product(name=name)])
+            release.wait(timeout=30)
+            yield inventory_system_pb2.Products(products=[inventory_system_pb2.Product(name='prod0')])
+        ingests = [stub.StreamAddProducts.future(idle_messages('idle' + str(i)), timeout=60) for i in range(2)]
+        time.sleep(1)
+        assert(stub.GetProductsByName(inventory_system_pb2.Names(names=['prod1']), timeout=5).products[0].amount == 1)
+        release.set()
+        assert([(future.result().added, future.result().rejected) for future in ingests] == [(1, 1), (1, 1)])
+
+        # Streams whose clients read slowly do not hold the workers between messages, even once the messages the
+        # clients have not read fill the connection's flow control window
+        description = 'd' * 1000
+        stub.StreamAddProducts(inventory_system_pb2.Products(products=[
+            inventory_system_pb2.Product(name='large' + str(i), description=description, amount=1)
+            for i in range(start, start + 500)]) for start in range(0, 20000, 500))
+        streams = [stub.StreamProductsInStock(inventory_system_pb2.Empty(), timeout=60) for i in range(4)]
+        assert(all(len(next(stream).products) == inventory_system_grpc_service.STREAM_CHUNK_SIZE
+                   for stream in streams))
+        time.sleep(1)
+        assert(stub.GetProductsByName(inventory_system_pb2.Names(names=['prod1']), timeout=5).products[0].amount == 1)
+        assert(all(sum(len(message.products) for message in stream) == 20100 for stream in streams))
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=30)
+        finally:
+            server.kill()
+
+def test_add_products_in_chunks(tmp_path):
+    inv_system = inventory_system_grpc_service.InventorySystem(path.join(str(tmp_path), 'chunks.db'))
+    chunk_size = inventory_system.INSERT_CHUNK_SIZE
+    commits = []
+    count_commit = lambda connection: commits.append(connection)
+    inventory_system.INSERT_CHUNK_SIZE = 10
+    event.listen(Engine, 'commit', count_commit)
+    try:
+        # Each chunk of the products is committed on its own instead of in one long transaction
+        products = [inventory_system_pb2.Product(name='prod' + str(i), amount=1) for i in range(35)] + \
+                   [inventory_system_pb2.Product(name='prod0')]
+        ids = inv_system.AddProducts(inventory_system_pb2.Products(products=products),
+                                     inventory_system_grpc_service.ExecutorContext()).ids
+    finally:
+        event.remove(Engine, 'commit', count_commit)
+        inventory_system.INSERT_CHUNK_SIZE = chunk_size
+    inv_system.close()
+    assert(len(commits) == 4)
+    assert(sum(len(id) == 16 for id in ids[:35]) == 35 and ids[35] == b'')
+
+def product_messages(names, size):
+    # Yields Products messages of up to size products with the passed names
+    for start in range(0, len(names), size):
+        yield inventory_system_pb2.Products(products=[inventory_system_pb2.Product(name=name, amount=2)
+                                                      for name in names[start:start + size]])
+
+def test_stream_ingest(tmp_path):
+    inv_system = inventory_system_grpc_service.InventorySystem(path.join(str(tmp_path), 'ingest.db'))
+    server, stub = serve_in_process(inv_system)
+    chunk_size, add_products = inventory_system_grpc_service.INGEST_CHUNK_SIZE, inventory_system.AddProducts
+    chunks = []
+    def add_chunk(database, products):
+        chunks.append(len(products))
+        return add_products(database, products)
+    inventory_system_grpc_service.INGEST_CHUNK_SIZE = 4
+    inventory_system.AddProducts = add_chunk
+    try:
+        # The products of every message are written in chunks and the summary has the ID of each product in order
+        names = ['prod' + str(i) for i in range(10)] + ['prod0']
+        summary = stub.StreamAddProducts(product_messages(names, 3))
+        assert(chunks == [4, 4, 3])
+        assert([len(id) for id in summary.ids] == [16] * 10 + [0])
+        assert([summary.added, summary.rejected] == [10, 1])
+        assert(stub.StreamAddProducts(iter([])) == inventory_system_pb2.IngestSummary())
+
+        # A chunk that fails ends the RPC, and the chunks before it stay committed
+        def fail_second_chunk(database, products):
+            if len(chunks) == 4:
+                raise ValueError('failed')
+            return add_chunk(database, products)
+        inventory_system.AddProducts = fail_second_chunk
+        try:
+            stub.StreamAddProducts(product_messages(['new' + str(i) for i in range(10)], 5))
+            assert(False)
+        except grpc.RpcError as e:
+            assert(e.code() == grpc.StatusCode.INTERNAL)
+        in_stock = {product.name for product in stub.GetProductsInStock(inventory_system_pb2.PageRequest()).products}
+        assert({'new' + str(i) for i in range(4)} <= in_stock and not 'new4' in in_stock)
+    finally:
+        inventory_system_grpc_service.INGEST_CHUNK_SIZE = chunk_size
+        inventory_system.AddProducts = add_products
+
+    # Orders are created with the policy of their message and those there is not enough stock for are rejected
+    def order_messages():
+        for policy in (inventory_system_pb2.FIFO, inventory_system_pb2.ALL_OR_NOTHING):
+            orders = [inventory_system_pb2.Order(destination='dest', date=inventory_system_pb2.Date(month=1, day=1,
+                                                                                                   year=2020),
+                                                 products=[inventory_system_pb2.Product(name=name, amount=1)])
+                      for name in ('prod0', 'prod0', 'prod0', 'prod1')]
+            yield inventory_system_pb2.Orders(orders=orders, policy=policy)
+    summary = stub.StreamCreateOrders(order_messages())
+    assert([len(id) > 0 for id in summary.ids] == [True, True, False, True] + [False] * 4)
+    assert([summary.added, summary.rejected] == [3, 5])
+    server.stop(None)
+    inv_system.close()
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        test_processes(directory)
+        test_asyncio(directory)
+        test_add_products_in_chunks(directory)
+        test_stream_ingest(directory)
@@ -0,0 +1,164 @@
+"""Test the inventory system stock ledger.
+
+Author: Riley Kirkpatrick
+"""
+
+
+import inventory_system
+import inventory_system_ledger
+import inventory_system_pb2
+import tempfile
+import threading
+import time
+from os import path
+
+
+def new_order(products, id=b''):
+    # Products are (name, amount) tuples
+    return inventory_system_pb2.Order(id=id, destination='dest', date=inventory_system_pb2.Date(month=-1, day=-1, year=-1),
+                                      products=[inventory_system_pb2.Product(name=name, amount=amount)
+                                                for name, amount in products])
+
+def stock(database, names):
+    return {product.name: product.amount for product in inventory_system.GetProductsByName(database, names)}
+
+def test_ledger(tmp_path):
+    database_path = path.join(str(tmp_path), 'ledger.db')
+    inventory_system.create_inventory_system_db(database_path)
+    database = inventory_system.get_scoped_dbsession(database_path)
+    names = ['prod' + str(i) for i in range(4)]
+    inventory_system.AddProducts(database, [inventory_system_pb2.Product(name=name, amount=100) for name in names])
+    ledger = inventory_system_ledger.StockLedger(database_path, stripes=2)
+
+    # Orders placed from several threads never take more than what is in stock
+    order_ids = []
+    def place_orders(name):
+        for i in range(30):
+            order_ids.extend(inventory_system.CreateOrders(database, [new_order([(name, 2), ('prod3', 1)])], ledger=ledger))
+        database.remove()
+    threads = [threading.Thread(target=place_orders, args=(name,)) for name in names[:3]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ledger.flush()
+    assert(sum(len(id) > 0 for id in order_ids) == 90)
+    assert(stock(database, names) == {'prod0': 40, 'prod1': 40, 'prod2': 40, 'prod3': 10})
+    assert(inventory_system.CreateOrders(database, [new_order([('prod3', 11)])], ledger=ledger) == [b''])
+
+    # Updates go through the ledger and the lines of an order are read after the writes queued for it
+    order_id, = inventory_system.CreateOrders(database, [new_order([('prod0', 2)])], ledger=ledger)
+    assert(inventory_system.UpdateOrders(database, [new_order([('prod3', 5)], order_id)], ledger=ledger) == [order_id])
+    assert(inventory_system.UpdateOrders(database, [new_order([('prod3', 16)], order_id)], ledger=ledger) == [b''])
+    assert(inventory_system.UpdateOrders(database, [new_order([('prod0', 1)], order_id)], ledger=ledger) == [order_id])
+    ledger.flush()
+    order, = inventory_system.GetOrdersByID(database, [order_id])
+    assert({(product.name, product.amount) for product in order.products} == {('prod0', 1)})
+    assert(stock(database, names) == {'prod0': 39, 'prod1': 40, 'prod2': 40, 'prod3': 10})
+
+    # Stock changed without the ledger is loaded again after the ledger is locked with exclusive
+    with ledger.exclusive():
+        inventory_system.UpdateProducts(database, [inventory_system_pb2.Product(name='prod3', wholesale_cost=-1,
+                                                                                sale_cost=-1, amount=20)])
+    assert(inventory_system.CreateOrders(database, [new_order([('prod3', 20)])], ledger=ledger) != [b''])
+    ledger.close()
+    assert(stock(database, ['prod3']) == {'prod3': 0})
+    database.remove()
+
+
+def test_hot_product(tmp_path):
+    database_path = path.join(str(tmp_path), 'hot.db')
+    inventory_system.create_inventory_system_db(database_path)
+    database = inventory_system.get_scoped_dbsession(database_path)
+    product_id, = inventory_system.AddProducts(database, [inventory_system_pb2.Product(name='hot', amount=100)])
+    ledger = inventory_system_ledger.StockLedger(database_path, stripes=1, shards=4)
+    contention = inventory_system_ledger.HOT_PRODUCT_CONTENTION
+    inventory_system_ledger.HOT_PRODUCT_CONTENTION = 1
+
+    try:
+        # An order that waits on the stripe of its product makes the product a hot product
+        ledger.locks[0].acquire()
+        thread = threading.Thread(target=inventory_system.CreateOrders, args=(database, [new_order([('hot', 10)])]),
+                                  kwargs={'ledger': ledger})
+        thread.start()
+        time.sleep(0.5)
+        ledger.locks[0].release()
+        thread.join()
+    finally:
+        inventory_system_ledger.HOT_PRODUCT_CONTENTION = contention
+    assert(product_id in ledger.shards)
+    assert(ledger.amount(product_id) == 90)
+
+    # Threads start from different counters of a hot product
+    home_shards = set()
+    threads = [threading.Thread(target=lambda: home_shards.add(ledger.home_shard())) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert(len(home_shards) == 4)
+
+    # Orders for a hot product never take more than the total of its counters
+    order_ids = []
+    def place_orders():
+        for i in range(20):
+            order_ids.extend(inventory_system.CreateOrders(database, [new_order([('hot', 1)])], ledger=ledger))
+        database.remove()
+    threads = [threading.Thread(target=place_orders) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert(sum(len(id) > 0 for id in order_ids) == 90)
+    assert(ledger.amount(product_id) == 0)
+    ledger.flush()
+    assert(stock(database, ['hot']) == {'hot': 0})
+
+    # Stock returned by an order goes back to the counters after it is queued
+    order_id = next(id for id in order_ids if id)
+    assert(inventory_system.UpdateOrders(database, [new_order([('hot', 0)], order_id)], ledger=ledger) == [order_id])
+    assert(ledger.amount(product_id) == 1)
+    ledger.close()
+    assert(stock(database, ['hot']) == {'hot': 1})
+    database.remove()
+
+def test_flush(tmp_path):
+    database_path = path.join(str(tmp_path), 'flush.db')
+    inventory_system.create_inventory_system_db(database_path)
+    ledger = inventory_system_ledger.StockLedger(database_path)
+    # Each write waits for its gate, so the writer is held on the first write until the second one is queued
+    gates, started = [threading.Event(), threading.Event()], threading.Event()
+    write_changes = ledger.write_changes
+    def gated_write_changes(database, writes):
+        started.set()
+        gates[ledger.written].wait(timeout=30)
+        write_changes(database, writes)
+    ledger.write_changes = gated_write_changes
+    waiting, wait = threading.Event(), ledger.progress.wait
+    def signalled_wait():
+        waiting.set()
+        wait()
+    ledger.progress.wait = signalled_wait
+    def queue_second_write():
+        waiting.wait(timeout=30)
+        ledger.submit({})
+        gates[0].set()
+    ledger.submit({})
+    started.wait(timeout=30)
+    thread = threading.Thread(target=queue_second_write)
+    thread.start()
+
+    # A flush only waits for the writes queued before it, not for the writes queued while it waits
+    ledger.flush()
+    thread.join()
+    assert(ledger.written == 1)
+    gates[1].set()
+    ledger.flush()
+    assert(ledger.written == 2)
+    ledger.close()
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        test_ledger(directory)
+        test_hot_product(directory)
+        test_flush(directory)